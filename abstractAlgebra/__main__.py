@@ -0,0 +1,191 @@
+"""
+Command-line tool for bulk ElGamal jobs:
+    python -m abstractAlgebra keygen --bits 127 --public pub.json --private key.json [--encoding map] [--search --jobs 4]
+    python -m abstractAlgebra encrypt --key pub.json messages.txt ciphertexts.txt --jobs 4
+    python -m abstractAlgebra decrypt --key key.json ciphertexts.txt messages.txt --jobs 4
+
+Messages are non-negative integers, one per line. Ciphertexts are lines of 4 integers: c1.x c1.y c2.x c2.y.
+Files are processed in batches of records, so memory usage doesn't depend on the input size.
+Messages are embedded into curve points with the key's encoding, keys without one use the legacy "increment".
+Throughput statistics are printed to stderr at the end.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.elgamal import *
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_PARAMETER = 256  # must exceed ELGAMAL_MAX_I_ITERATIONS, so messages are recovered with floor division
+MERSENNE_EXPONENTS = (61, 89, 107, 127, 521)  # primes 2^e - 1 available to keygen
+
+_worker_key = None  # key of the current worker process, see _init_worker
+
+
+def _load_key(key: dict) -> dict:
+    """Turns the json key description into curve points"""
+    curve = EllipticCurve(key["a"], key["b"], key["p"])
+    return dict(key, curve=curve, alpha=curve(*key["alpha"]), beta=curve(*key["beta"]),
+                encoding=key.get("encoding", "increment"))
+
+
+def _init_worker(key: dict) -> None:
+    global _worker_key
+    _worker_key = _load_key(key)
+
+
+def _encrypt_batch(records: list[tuple[int, str]]) -> list[str]:
+    key = _worker_key
+    field = key["curve"].field
+    limit = key["p"] // key["parameter"] - 1  # the largest message whose embedding fits the field
+    ans = []
+    for number, line in records:
+        try:
+            message = int(line)
+        except ValueError:
+            raise ValueError(f"line {number}: {line!r} is not an integer message")
+        if not 0 <= message <= limit:
+            raise ValueError(f"line {number}: message {message} is out of range [0, {limit}]")
+        c1, c2 = elgamal_encrypt(field(message), key["alpha"], key["beta"], key["parameter"], key["encoding"])
+        ans.append(f"{c1.x.value} {c1.y.value} {c2.x.value} {c2.y.value}")
+    return ans
+
+
+def _decrypt_batch(records: list[tuple[int, str]]) -> list[str]:
+    key = _worker_key
+    curve = key["curve"]
+    ans = []
+    for number, line in records:
+        try:
+            x1, y1, x2, y2 = map(int, line.split())
+            c1, c2 = curve(x1, y1), curve(x2, y2)
+        except (ValueError, AttributeError, AssertionError):
+            raise ValueError(f"line {number}: {line!r} is not a ciphertext of 2 curve points")
+        message = elgamal_decrypt(c1, c2, key["parameter"], key["pk"], key["encoding"])
+        ans.append(str(message.value))
+    return ans
+
+
+def _records(file) -> Iterable[tuple[int, str]]:
+    """Non-empty lines of the file together with their numbers"""
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if line:
+            yield number, line
+
+
+def _process(function, key: dict, source, destination, jobs: int, batch_size: int) -> int:
+    """
+    Applies the batch function to records of the source writing the results in the same order.
+    With more than 1 job batches are processed by a pool of processes, at most 2 * jobs batches are in flight.
+    Returns the number of processed records.
+    """
+    records = _records(source)
+    count = 0
+    if jobs <= 1:
+        _init_worker(key)
+        while batch := list(islice(records, batch_size)):
+            destination.writelines(line + "\n" for line in function(batch))
+            count += len(batch)
+        return count
+
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(key,)) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * jobs and (batch := list(islice(records, batch_size))):
+                pending.append(executor.submit(function, batch))
+            if not pending:
+                return count
+            results = pending.popleft().result()
+            destination.writelines(line + "\n" for line in results)
+            count += len(results)
+
+
+def _keygen(args) -> None:
+    if args.parameter <= ELGAMAL_MAX_I_ITERATIONS:
+        raise ValueError(f"parameter must be greater than {ELGAMAL_MAX_I_ITERATIONS} "
+                         f"for messages to be recovered from the embedded points")
+    p = 2 ** args.bits - 1
+    alpha, beta, pk = elgamal_genkey(p, args.search, args.jobs)
+    curve = alpha.curve
+    public = {
+        "p": p, "a": curve.a.value, "b": curve.b.value,
+        "alpha": [alpha.x.value, alpha.y.value], "beta": [beta.x.value, beta.y.value],
+        "parameter": args.parameter, "encoding": args.encoding
+    }
+    with open(args.public, "w") as file:
+        json.dump(public, file)
+    with open(args.private, "w") as file:
+        json.dump(dict(public, pk=pk), file)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m abstractAlgebra", description="Bulk elliptic curve ElGamal tool")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    keygen = commands.add_parser("keygen", help="generate a key pair")
+    keygen.add_argument("--bits", type=int, choices=MERSENNE_EXPONENTS, default=127,
+                        help="curve is built over F_p with p = 2^bits - 1")
+    keygen.add_argument("--parameter", type=int, default=DEFAULT_PARAMETER, help="message embedding parameter")
+    keygen.add_argument("--encoding", choices=ELGAMAL_ENCODINGS, default="increment",
+                        help="how messages are embedded into curve points")
+    keygen.add_argument("--search", action="store_true",
+                        help="search for a curve of prime order (takes a while for big fields) instead of a random one")
+    keygen.add_argument("--jobs", type=int, default=1, help="number of worker processes of the curve search")
+    keygen.add_argument("--public", required=True, help="output file of the public key")
+    keygen.add_argument("--private", required=True, help="output file of the private key")
+
+    for name, help_text in (("encrypt", "encrypt messages with the public key"),
+                            ("decrypt", "decrypt ciphertexts with the private key")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--key", required=True, help="key file created by keygen")
+        command.add_argument("input", nargs="?", type=argparse.FileType("r"), default=sys.stdin)
+        command.add_argument("output", nargs="?", type=argparse.FileType("w"), default=sys.stdout)
+        command.add_argument("--jobs", type=int, default=1, help="number of worker processes")
+        command.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="records per task")
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "keygen":
+        try:
+            _keygen(args)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+        return 0
+
+    with open(args.key) as file:
+        key = json.load(file)
+    if args.command == "decrypt" and "pk" not in key:
+        print("decryption requires the private key", file=sys.stderr)
+        return 1
+    function = _encrypt_batch if args.command == "encrypt" else _decrypt_batch
+
+    start = time.perf_counter()
+    try:
+        count = _process(function, key, args.input, args.output, args.jobs, max(1, args.batch_size))
+    except ValueError as error:
+        print(f"{args.command} failed: {error}", file=sys.stderr)
+        return 1
+    finally:
+        for file in (args.input, args.output):
+            if file not in (sys.stdin, sys.stdout):
+                file.close()
+    elapsed = time.perf_counter() - start
+    print(f"{args.command}ed {count} records in {elapsed:.3f} s "
+          f"({count / elapsed if elapsed else 0:.1f} records/s, {args.jobs} jobs)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
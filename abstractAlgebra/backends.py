@@ -0,0 +1,251 @@
+"""
+Arithmetic backends of Fp - the integer arithmetic modulo p beneath the element layer.
+
+Every backend implements scalar operations on already reduced integers and bulk operations on sequences of them:
+    - PythonBackend - reference implementation with built-in ints, the default one;
+    - NumpyBackend - bulk operations vectorized with int64 arrays for p < 2^31, Python ints otherwise;
+    - Gmpy2Backend - GMP arithmetic, available only if gmpy2 is installed, pays off for big moduli;
+    - CrossCheckBackend - runs any backend alongside the reference one and reports every mismatch.
+
+Backend is chosen per field: Fp(p, backend="numpy"), Fp(p, backend=CrossCheckBackend("gmpy2")).
+"""
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+try:
+    import gmpy2
+except ImportError:  # optional dependency
+    gmpy2 = None
+
+NUMPY_MAX_P = 2 ** 31  # products of reduced values must fit into int64
+
+
+class ArithmeticBackend(metaclass=ABCMeta):
+    """
+    Integer arithmetic modulo p. Arguments are reduced non-negative integers, results are reduced Python ints.
+    Bulk operations work element-wise on equally long sequences and return lists.
+    """
+    name = "abstract"
+    inline = False  # True if the operations are plain Python int arithmetic, so elements may compute them inline
+
+    @abstractmethod
+    def add(self, a: int, b: int, p: int) -> int:
+        """(a + b) mod p"""
+
+    @abstractmethod
+    def sub(self, a: int, b: int, p: int) -> int:
+        """(a - b) mod p"""
+
+    @abstractmethod
+    def mul(self, a: int, b: int, p: int) -> int:
+        """a * b mod p"""
+
+    @abstractmethod
+    def power(self, a: int, e: int, p: int) -> int:
+        """a^e mod p for a non-negative e"""
+
+    @abstractmethod
+    def inverse(self, a: int, p: int) -> int | None:
+        """a^-1 mod p or None for a = 0"""
+
+    def neg(self, a: int, p: int) -> int:
+        return self.sub(0, a, p)
+
+    def add_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        return [self.add(x, y, p) for x, y in zip(a, b)]
+
+    def sub_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        return [self.sub(x, y, p) for x, y in zip(a, b)]
+
+    def mul_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        return [self.mul(x, y, p) for x, y in zip(a, b)]
+
+    def power_many(self, a: Sequence[int], e: Sequence[int], p: int) -> list[int]:
+        return [self.power(x, k, p) for x, k in zip(a, e)]
+
+    def inverse_many(self, a: Sequence[int], p: int) -> list[int | None]:
+        """Inverses of all values with a single inversion (Montgomery's trick), zeros have no inverse"""
+        nonzero = [x for x in a if x]
+        prefix = [1]
+        for x in nonzero:
+            prefix.append(self.mul(prefix[-1], x, p))
+        inv = self.inverse(prefix[-1], p)
+        inverses = [0] * len(nonzero)
+        for i in range(len(nonzero) - 1, -1, -1):
+            inverses[i] = self.mul(inv, prefix[i], p)
+            inv = self.mul(inv, nonzero[i], p)
+        inverses = iter(inverses)
+        return [next(inverses) if x else None for x in a]
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}>"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class PythonBackend(ArithmeticBackend):
+    name = "python"
+    inline = True
+
+    def add(self, a: int, b: int, p: int) -> int:
+        return (a + b) % p
+
+    def sub(self, a: int, b: int, p: int) -> int:
+        return (a - b) % p
+
+    def mul(self, a: int, b: int, p: int) -> int:
+        return a * b % p
+
+    def power(self, a: int, e: int, p: int) -> int:
+        return pow(a, e, p)
+
+    def inverse(self, a: int, p: int) -> int | None:
+        return pow(a, -1, p) if a else None
+
+
+class NumpyBackend(PythonBackend):
+    """
+    Bulk operations for p < NUMPY_MAX_P are vectorized over int64 arrays (every product fits 62 bits),
+    scalar operations and bigger moduli use Python ints since numpy scalars are slower than them.
+    Bulk inversion stays with Montgomery's trick - its prefix products are sequential, and it still beats
+    vectorized Fermat inversions which need about 1.5 * log(p) multiplications per element.
+    """
+    name = "numpy"
+
+    def add_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        if p >= NUMPY_MAX_P:
+            return super().add_many(a, b, p)
+        return ((np.asarray(a, dtype=np.int64) + np.asarray(b, dtype=np.int64)) % p).tolist()
+
+    def sub_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        if p >= NUMPY_MAX_P:
+            return super().sub_many(a, b, p)
+        return ((np.asarray(a, dtype=np.int64) - np.asarray(b, dtype=np.int64)) % p).tolist()
+
+    def mul_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        if p >= NUMPY_MAX_P:
+            return super().mul_many(a, b, p)
+        return (np.asarray(a, dtype=np.int64) * np.asarray(b, dtype=np.int64) % p).tolist()
+
+    def power_many(self, a: Sequence[int], e: Sequence[int], p: int) -> list[int]:
+        if p >= NUMPY_MAX_P or not len(a):
+            return super().power_many(a, e, p)
+
+        # exponents are reduced modulo p - 1 (Fermat's little theorem) keeping positive ones positive because of 0^0
+        e = np.array([k % (p - 1) or (p - 1 if k else 0) for k in e], dtype=np.int64)
+        base = np.asarray(a, dtype=np.int64)
+        ans = np.ones_like(base)
+        for bit in range(int(e.max()).bit_length()):  # right-to-left binary exponentiation of all the bases at once
+            ans = np.where(e >> bit & 1, ans * base % p, ans)
+            base = base * base % p
+        return ans.tolist()
+
+
+class Gmpy2Backend(ArithmeticBackend):
+    """GMP arithmetic, the results are converted back to Python ints"""
+    name = "gmpy2"
+
+    def __init__(self):
+        if gmpy2 is None:
+            raise RuntimeError("gmpy2 backend requires the gmpy2 package to be installed")
+
+    def add(self, a: int, b: int, p: int) -> int:
+        return int((gmpy2.mpz(a) + b) % p)
+
+    def sub(self, a: int, b: int, p: int) -> int:
+        return int((gmpy2.mpz(a) - b) % p)
+
+    def mul(self, a: int, b: int, p: int) -> int:
+        return int(gmpy2.mpz(a) * b % p)
+
+    def power(self, a: int, e: int, p: int) -> int:
+        return int(gmpy2.powmod(a, e, p))
+
+    def inverse(self, a: int, p: int) -> int | None:
+        return int(gmpy2.invert(a, p)) if a else None
+
+
+BACKENDS = {backend.name: backend for backend in (PythonBackend, NumpyBackend, Gmpy2Backend)}
+REFERENCE_BACKEND = PythonBackend()
+
+
+def available_backends() -> list[str]:
+    """Names of the backends that can be used in this environment"""
+    return [name for name in BACKENDS if name != Gmpy2Backend.name or gmpy2 is not None]
+
+
+def get_backend(backend: str | ArithmeticBackend | None) -> ArithmeticBackend:
+    """Returns the backend instance by its name, None stands for the reference one"""
+    if backend is None:
+        return REFERENCE_BACKEND
+    if isinstance(backend, ArithmeticBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise AttributeError(f"unknown arithmetic backend: {backend}, expected one of {list(BACKENDS)}")
+    return REFERENCE_BACKEND if backend == PythonBackend.name else BACKENDS[backend]()
+
+
+class CrossCheckBackend(ArithmeticBackend):
+    """
+    Safety net for optimized backends: every operation is also computed by the reference backend
+    and results are compared. Mismatches are collected in the mismatches list and,
+    if the backend is strict, RuntimeError is raised (reference result is returned otherwise).
+    """
+    name = "crosscheck"
+
+    def __init__(self, backend: str | ArithmeticBackend, reference: str | ArithmeticBackend = None, strict: bool = True):
+        self.backend = get_backend(backend)
+        self.reference = get_backend(reference)
+        self.strict = strict
+        self.mismatches = []
+
+    def __check__(self, operation: str, args: tuple, p: int):
+        expected = getattr(self.reference, operation)(*args, p)
+        result = getattr(self.backend, operation)(*args, p)
+        if result != expected:
+            self.mismatches.append((operation, args, p, result, expected))
+            if self.strict:
+                raise RuntimeError(f"{self.backend.name} backend returned {result} instead of {expected} "
+                                   f"for {operation}{args} mod {p}")
+        return expected
+
+    def add(self, a: int, b: int, p: int) -> int:
+        return self.__check__("add", (a, b), p)
+
+    def sub(self, a: int, b: int, p: int) -> int:
+        return self.__check__("sub", (a, b), p)
+
+    def mul(self, a: int, b: int, p: int) -> int:
+        return self.__check__("mul", (a, b), p)
+
+    def neg(self, a: int, p: int) -> int:
+        return self.__check__("neg", (a,), p)
+
+    def power(self, a: int, e: int, p: int) -> int:
+        return self.__check__("power", (a, e), p)
+
+    def inverse(self, a: int, p: int) -> int | None:
+        return self.__check__("inverse", (a,), p)
+
+    def add_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        return self.__check__("add_many", (a, b), p)
+
+    def sub_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        return self.__check__("sub_many", (a, b), p)
+
+    def mul_many(self, a: Sequence[int], b: Sequence[int], p: int) -> list[int]:
+        return self.__check__("mul_many", (a, b), p)
+
+    def power_many(self, a: Sequence[int], e: Sequence[int], p: int) -> list[int]:
+        return self.__check__("power_many", (a, e), p)
+
+    def inverse_many(self, a: Sequence[int], p: int) -> list[int | None]:
+        return self.__check__("inverse_many", (a,), p)
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}: {self.backend.name} vs {self.reference.name}>"
@@ -0,0 +1,271 @@
+"""
+Persistent on-disk cache of precomputed domain parameters of fields and elliptic curves.
+
+Every structure is identified by its (a, b, p) parameters (fields have no a and b, groups Zn are identified by n)
+and gets its own directory containing a small json metadata file and any number of memory-mappable integer tables:
+factorizations of Zn and its unit groups, baby steps of discrete log tables of curve points.
+Cache is shared between processes, so writes are atomic and readers never see a partially written file.
+
+Usage:
+    enable("/var/cache/abstractAlgebra")  # every Fp and EllipticCurve now loads and stores its constants there
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from math import prod
+from pathlib import Path
+
+import numpy as np
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.number_theory import is_probable_prime
+
+CACHE_VERSION = 1  # must be increased whenever the format or meaning of cached values changes
+METADATA_FILE = "metadata.json"
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Writes the file through a temporary file in the same directory which then replaces the target"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def _valid_sqrt_constants(p: int, constants: Any, nonresidue: int | None) -> bool:
+    """
+    Checks Tonelli-Shanks constants (q, s, c): p - 1 = q*2^s with q odd and c = z^q for a non-residue z,
+    which holds iff c has the order 2^s exactly. If the non-residue is known, c must be derived from it.
+    """
+    if not (isinstance(constants, list) and len(constants) == 3 and all(isinstance(x, int) for x in constants)):
+        return False
+    q, s, c = constants
+    if not (q % 2 and s > 0 and q << s == p - 1 and 0 < c < p):
+        return False
+    if nonresidue is not None:
+        return pow(nonresidue, q, p) == c
+    return pow(c, 1 << (s - 1), p) == p - 1
+
+
+def _valid_factorization(n: int, factorization: dict[int, int]) -> bool:
+    """Checks that the factors are primes in increasing order with positive exponents and their product is n"""
+    return (list(factorization) == sorted(factorization) and all(e > 0 and is_probable_prime(q) for q, e in factorization.items())
+            and prod(q ** e for q, e in factorization.items()) == n)
+
+
+class IntTable:
+    """
+    Read-only table of non-negative integers backed by a memory-mapped array of fixed-width little-endian rows.
+    """
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+
+    def __len__(self):
+        return self.array.shape[0]
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return int.from_bytes(self.array[index].tobytes(), "little")
+
+    def __iter__(self) -> Iterable[int]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @staticmethod
+    def encode(values: Iterable[int]) -> np.ndarray:
+        values = list(values)
+        assert all(isinstance(value, int) and value >= 0 for value in values), "only non-negative integers are supported"
+        width = max([(value.bit_length() + 7) // 8 for value in values] + [1])
+        data = b"".join(value.to_bytes(width, "little") for value in values)
+        return np.frombuffer(data, dtype=np.uint8).reshape(len(values), width)
+
+
+class PrecomputationCache:
+    """
+    Directory with precomputed constants of fields and curves.
+    Metadata read from the disk is also kept in memory, so repeated constructions of equal structures are cheap.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.__metadata__ = {}
+        self.__lock__ = threading.RLock()
+
+    def structure_path(self, structure: AbstractStructure) -> Path:
+        """Returns a directory of the given field or curve"""
+        if isinstance(structure, EllipticCurve):
+            key = f"curve:{structure.a.value}:{structure.b.value}:{structure.p}"
+        elif isinstance(structure, Fp):
+            key = f"field:{structure.p}"
+        elif isinstance(structure, Zn):
+            key = f"group:{structure.n}"
+        else:
+            raise AttributeError(f"{structure} cannot be cached")
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.directory / f"v{CACHE_VERSION}" / digest
+
+    def metadata(self, structure: AbstractStructure) -> dict:
+        """Returns stored metadata of the structure (empty dictionary if there's nothing)"""
+        path = self.structure_path(structure)
+        with self.__lock__:
+            if path not in self.__metadata__:
+                try:
+                    metadata = json.loads((path / METADATA_FILE).read_text())
+                except (OSError, ValueError):
+                    metadata = {}
+                if metadata.get("version") != CACHE_VERSION:
+                    metadata = {}
+                self.__metadata__[path] = metadata
+            return self.__metadata__[path]
+
+    def update_metadata(self, structure: AbstractStructure, **values) -> None:
+        """Merges given values into the stored metadata"""
+        path = self.structure_path(structure)
+        with self.__lock__:
+            self.__metadata__.pop(path, None)  # reading the latest version written by other processes
+            metadata = dict(self.metadata(structure), **values, version=CACHE_VERSION)
+            if isinstance(structure, EllipticCurve):
+                metadata.update(a=structure.a.value, b=structure.b.value)
+            metadata.update(p=structure.p)
+            _atomic_write(path / METADATA_FILE, lambda file: file.write(json.dumps(metadata).encode()))
+            self.__metadata__[path] = metadata
+
+    def load_field(self, field: Fp) -> bool:
+        """
+        Fills the quadratic non-residue and sqrt constants of the field, returns False if nothing valid was cached.
+        Values are checked before they are used, stale or corrupted ones are ignored, so they get recomputed.
+        """
+        metadata = self.metadata(field)
+        p = field.p
+        nonresidue = metadata.get("nonresidue")
+        if not (isinstance(nonresidue, int) and 0 < nonresidue < p and field.legendre_symbol(nonresidue) == -1):
+            nonresidue = None
+        constants = metadata.get("sqrt_constants")
+        if not _valid_sqrt_constants(p, constants, nonresidue):
+            constants = None
+
+        if nonresidue is not None:
+            field.__nonresidue__ = field(nonresidue)
+        if constants is not None:
+            field.__sqrt_constants__ = tuple(constants)
+        return nonresidue is not None or constants is not None
+
+    def store_field(self, field: Fp) -> None:
+        values = {}
+        if field.__nonresidue__ is not None:
+            values["nonresidue"] = field.__nonresidue__.value
+        if field.__sqrt_constants__ is not None:
+            values["sqrt_constants"] = list(field.__sqrt_constants__)
+        self.update_metadata(field, **values)
+
+    def load_curve(self, curve: EllipticCurve) -> bool:
+        """Fills GLV parameters (and hence the order) of the curve, returns False if nothing was cached"""
+        metadata = self.metadata(curve)
+        if "glv" not in metadata:
+            return False
+        if metadata["glv"] is None:
+            if curve.has_efficient_endomorphism:
+                return False
+            curve.__glv__ = ()
+            return True
+
+        try:
+            c1, c0, mu, constant = metadata["glv"]
+            constant = curve.field(constant)
+        except (TypeError, ValueError, AssertionError):
+            return False
+        # the constant must define the endomorphism: a primitive cube root of unity for a = 0 or i for b = 0
+        valid = constant ** 3 == 1 and constant != 1 if curve.a == 0 else constant ** 2 == -1
+        if not (curve.has_efficient_endomorphism and valid and len(mu) == 2):
+            return False
+        curve.__glv__ = (c1, c0, tuple(mu), constant)
+        return True
+
+    def store_curve(self, curve: EllipticCurve) -> None:
+        if curve.__glv__ is None:
+            return
+        glv = None
+        if curve.__glv__:
+            c1, c0, mu, constant = curve.__glv__
+            glv = [c1, c0, list(mu), constant.value]
+        self.update_metadata(curve, glv=glv)
+
+    def load_order(self, curve: EllipticCurve) -> int | None:
+        """Returns the cached number of points of the curve if it's within the Hasse bound and annihilates a random point"""
+        order = self.metadata(curve).get("order")
+        if not (isinstance(order, int) and (order - curve.p - 1) ** 2 <= 4 * curve.p):
+            return None
+        return order if curve.multiply(curve.get_random_point(), order).is_identity else None
+
+    def store_order(self, curve: EllipticCurve, order: int) -> None:
+        self.update_metadata(curve, order=order)
+
+    def load_group(self, group: Zn) -> bool:
+        """
+        Fills the factorization of n and of the orders of unit groups modulo its prime power factors,
+        returns False if nothing valid was cached. Factors must be primes multiplying up to the factored numbers.
+        """
+        table = self.load_table(group, "factorization")
+        if table is None or len(table) % 2:
+            return False
+        factorization = dict(zip(table[0::2], table[1::2]))
+        if not _valid_factorization(group.n, factorization):
+            return False
+        group.__factorization__ = factorization
+
+        table = self.load_table(group, "unit_factorizations")
+        if table is not None and len(table) % 3 == 0:
+            rows = [table[i:i + 3] for i in range(0, len(table), 3)]
+            orders = []
+            for index, (q, e) in enumerate(factorization.items()):
+                factors = {r: f for i, r, f in rows if i == index}
+                order = q ** (e - 1) * (q - 1)
+                if not _valid_factorization(order, factors):
+                    break
+                orders.append((order, factors))
+            else:
+                group.__unit_orders_cache__ = orders
+        return True
+
+    def store_group(self, group: Zn) -> None:
+        if group.__factorization__ is not None:
+            self.store_table(group, "factorization", [x for item in group.__factorization__.items() for x in item])
+        if group.__unit_orders_cache__ is not None:
+            self.store_table(group, "unit_factorizations", [x for index, (_, factors) in enumerate(group.__unit_orders_cache__)
+                                                            for r, f in factors.items() for x in (index, r, f)])
+
+    def store_table(self, structure: AbstractStructure, name: str, values: Iterable[int]) -> None:
+        """Stores a table of non-negative integers which can be later memory-mapped by any process"""
+        assert name.isidentifier(), "table name must be a valid identifier"
+        array = IntTable.encode(values)
+        _atomic_write(self.structure_path(structure) / f"{name}.npy", lambda file: np.save(file, array))
+
+    def load_table(self, structure: AbstractStructure, name: str) -> IntTable | None:
+        """Returns a memory-mapped table or None if it wasn't stored"""
+        try:
+            return IntTable(np.load(self.structure_path(structure) / f"{name}.npy", mmap_mode="r"))
+        except (OSError, ValueError):
+            return None
+
+
+def enable(directory: str | os.PathLike) -> PrecomputationCache:
+    """Makes every field and curve use the cache in the given directory"""
+    cache = PrecomputationCache(directory)
+    AbstractStructure.precomputation_cache = cache
+    return cache
+
+
+def disable() -> None:
+    AbstractStructure.precomputation_cache = None
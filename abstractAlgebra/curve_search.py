@@ -0,0 +1,476 @@
+"""
+Search for elliptic curves suitable for cryptography: the group order is a prime times a small cofactor,
+the curve is not anomalous (order != p) and has a large embedding degree (MOV and Frey-Ruck attacks don't apply).
+
+Points are counted by Schoof's algorithm for small primes l, giving the trace t = p + 1 - #E modulo their product M,
+and the remaining t = T + kM in the Hasse interval is found by the baby-step giant-step algorithm.
+Candidates are rejected as soon as a prime l above the allowed cofactor divides the order, so most of them
+cost only a few cheap small l steps. Polynomials over Fp are lists of coefficients (lowest first),
+their products are computed by Kronecker substitution with Python integers.
+
+Pure Python counting is practical up to ~128-bit fields (a full count of a 127-bit curve takes tens of seconds),
+bigger fields need Elkies' improvements (SEA) to be searched in reasonable time.
+
+Usage:
+    curve, order = find_curves(2 ** 89 - 1, max_workers=4)[0]
+"""
+from __future__ import annotations
+
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from math import isqrt
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.number_theory import is_probable_prime
+
+CURVE_BSGS_RANGE = 1 << 34  # Schoof's algorithm runs until at most that many traces are left for BSGS
+CURVE_ORDER_POINTS = 4  # number of random points BSGS is run on before more primes l are used
+CURVE_MIN_EMBEDDING_DEGREE = 20  # curves with p^k = 1 modulo the prime subgroup order for smaller k are rejected
+CURVE_SEARCH_MAX_CANDIDATES = 100000
+CURVE_EARLY_ABORT_BOUND = 13  # candidates are always checked for prime factors l <= this bound of their orders first
+POLY_POW_WINDOW = 4  # window width (in bits) of the exponentiation in quotient rings
+POLY_SCHOOLBOOK_LENGTH = 12  # shorter polynomials are multiplied directly rather than by Kronecker substitution
+
+
+def _pack(a: list[int], width: int) -> int:
+    return int.from_bytes(b"".join(c.to_bytes(width, "little") for c in a), "little")
+
+
+def _poly_mul(a: list[int], b: list[int], p: int) -> list[int]:
+    """Product of polynomials over Fp by Kronecker substitution"""
+    if not a or not b:
+        return []
+    if min(len(a), len(b)) <= POLY_SCHOOLBOOK_LENGTH:
+        ans = [0] * (len(a) + len(b) - 1)
+        for i, c in enumerate(a):
+            if c:
+                for j, d in enumerate(b):
+                    ans[i + j] += c * d
+        return [c % p for c in ans]
+    length = len(a) + len(b) - 1
+    width = (2 * p.bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+    packed = _pack(a, width)
+    data = (packed * packed if a is b else packed * _pack(b, width)).to_bytes(width * length, "little")
+    return [int.from_bytes(data[i:i + width], "little") % p for i in range(0, width * length, width)]
+
+
+def _poly_trim(a: list[int]) -> list[int]:
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def _poly_sub(a: list[int], b: list[int], p: int) -> list[int]:
+    if len(a) < len(b):
+        a = a + [0] * (len(b) - len(a))
+    return _poly_trim([(x - y) % p for x, y in zip(a, b + [0] * (len(a) - len(b)))])
+
+
+def _poly_divmod(a: list[int], b: list[int], p: int) -> tuple[list[int], list[int]]:
+    """Schoolbook division, b must be trimmed"""
+    a = list(a)
+    inverse = pow(b[-1], -1, p)
+    quotient = [0] * max(len(a) - len(b) + 1, 0)
+    for i in range(len(a) - len(b), -1, -1):
+        c = a[i + len(b) - 1] * inverse % p
+        quotient[i] = c
+        if c:
+            for j, d in enumerate(b):
+                a[i + j] = (a[i + j] - c * d) % p
+    return quotient, _poly_trim(a[:len(b) - 1])
+
+
+def _poly_gcd(a: list[int], b: list[int], p: int) -> list[int]:
+    """Monic greatest common divisor"""
+    a, b = _poly_trim(list(a)), _poly_trim(list(b))
+    while b:
+        a, b = b, _poly_divmod(a, b, p)[1]
+    inverse = pow(a[-1], -1, p) if a else 0
+    return [c * inverse % p for c in a]
+
+
+class _QuotientRing:
+    """Fp[x] / (h) for a monic h, reduction uses the precomputed inverse of reversed h (Barrett's method)"""
+
+    def __init__(self, h: list[int], p: int):
+        self.h, self.p, self.d = h, p, len(h) - 1
+        precision = max(self.d - 1, 1)
+        reversed_h = h[::-1]
+        inverse, k = [1], 1
+        while k < precision:  # Newton's iteration g = g * (2 - h * g)
+            k = min(2 * k, precision)
+            error = _poly_mul(reversed_h[:k], inverse, p)[:k]
+            error = [(-c) % p for c in error]
+            error[0] = (error[0] + 2) % p
+            inverse = _poly_mul(inverse, error, p)[:k]
+        self.inverse = inverse
+
+    def reduce(self, f: list[int]) -> list[int]:
+        d, p = self.d, self.p
+        if len(f) <= d:
+            return _poly_trim(list(f))
+        n = len(f) - d  # number of quotient coefficients
+        if n > len(self.inverse):
+            return _poly_divmod(f, self.h, p)[1]
+        quotient = _poly_mul(f[::-1][:n], self.inverse[:n], p)[:n][::-1]
+        return _poly_sub(f[:d], _poly_mul(quotient, self.h, p)[:d], p)
+
+    def mul(self, a: list[int], b: list[int]) -> list[int]:
+        return self.reduce(_poly_mul(a, b, self.p))
+
+    def pow(self, a: list[int], e: int) -> list[int]:
+        """Fixed window exponentiation, POLY_POW_WINDOW bits of the exponent cost one multiplication"""
+        powers = [[1], a]
+        for _ in range(2, 1 << POLY_POW_WINDOW):
+            powers.append(self.mul(powers[-1], a))
+        ans = [1]
+        digits = -(-e.bit_length() // POLY_POW_WINDOW)
+        for i in range(digits - 1, -1, -1):
+            for _ in range(POLY_POW_WINDOW):
+                ans = self.mul(ans, ans)
+            if digit := (e >> (i * POLY_POW_WINDOW)) & ((1 << POLY_POW_WINDOW) - 1):
+                ans = self.mul(ans, powers[digit])
+        return ans
+
+    def pow_x(self, e: int) -> list[int]:
+        """x^e, multiplications by x are shifts"""
+        p, h, d = self.p, self.h, self.d
+        ans = [1]
+        for bit in bin(e)[2:]:
+            ans = self.mul(ans, ans)
+            if bit == "1":
+                ans = [0] + ans
+                if len(ans) > d:
+                    c = ans.pop()
+                    ans = _poly_trim([(u - c * v) % p for u, v in zip(ans, h)])
+        return ans
+
+    def inverse_of(self, a: list[int]) -> list[int]:
+        """Extended Euclidean algorithm, a must be invertible modulo h"""
+        p = self.p
+        r0, r1, s0, s1 = list(self.h), _poly_trim(list(a)), [], [1]
+        while r1:
+            quotient, remainder = _poly_divmod(r0, r1, p)
+            r0, r1 = r1, remainder
+            s0, s1 = s1, _poly_sub(s0, _poly_mul(quotient, s1, p), p)
+        assert len(r0) == 1, "element isn't invertible"
+        inverse = pow(r0[0], -1, p)
+        return self.reduce([c * inverse % p for c in s0])
+
+
+def _division_polynomial(l: int, a: int, b: int, p: int) -> list[int]:
+    """
+    Division polynomial psi_l of y^2 = x^3 + ax + b for an odd l. Even ones are stored divided by y,
+    so every psi_n is a polynomial in x and y^2 = f(x) is substituted in the recurrences.
+    """
+    f = [b % p, a % p, 0, 1]
+    f2 = _poly_mul(f, f, p)
+    psi = {
+        0: [], 1: [1], 2: [2],
+        3: [(-a * a) % p, 12 * b % p, 6 * a % p, 0, 3],
+        4: [c * 4 % p for c in [(-8 * b * b - a ** 3) % p, (-4 * a * b) % p, (-5 * a * a) % p, 20 * b % p, 5 * a % p, 0, 1]],
+    }
+
+    def get(n: int) -> list[int]:
+        if n not in psi:
+            m = n // 2
+            if n % 2:
+                first = _poly_mul(get(m + 2), _poly_mul(get(m), _poly_mul(get(m), get(m), p), p), p)
+                second = _poly_mul(get(m - 1), _poly_mul(get(m + 1), _poly_mul(get(m + 1), get(m + 1), p), p), p)
+                if m % 2:
+                    second = _poly_mul(second, f2, p)
+                else:
+                    first = _poly_mul(first, f2, p)
+                psi[n] = _poly_sub(first, second, p)
+            else:
+                half = pow(2, -1, p)
+                difference = _poly_sub(_poly_mul(get(m + 2), _poly_mul(get(m - 1), get(m - 1), p), p),
+                                       _poly_mul(get(m - 2), _poly_mul(get(m + 1), get(m + 1), p), p), p)
+                psi[n] = [c * half % p for c in _poly_mul(get(m), difference, p)]
+        return psi[n]
+
+    return get(l)
+
+
+def _ring_double(ring: _QuotientRing, f: list[int], a: int, point: tuple) -> tuple:
+    """2 * (A, y * B) for a point with coordinates in the ring, the only step that needs an inversion"""
+    p = ring.p
+    x, y = point
+    numerator = [3 * c % p for c in ring.mul(x, x)] or [0]
+    numerator[0] = (numerator[0] + a) % p  # 3x^2 + a
+    slope = ring.mul(numerator, ring.inverse_of(ring.mul([2 * c % p for c in y], f)))  # slope = y * this
+    x3 = _poly_sub(ring.mul(f, ring.mul(slope, slope)), [2 * c % p for c in x], p)
+    return x3, _poly_sub(ring.mul(slope, _poly_sub(x, x3, p)), y, p)
+
+
+def _ring_add(ring: _QuotientRing, f: list[int], first: tuple, second: tuple) -> tuple:
+    """
+    Sum of (X1 : y * Y1 : Z1) in Jacobian coordinates and (A2, y * B2) with coordinates in the ring,
+    points must differ at every root of h (neither equal nor opposite). Z never gets the factor y.
+    """
+    p, mul = ring.p, ring.mul
+    (x1, y1, z1), (x2, y2) = first, second
+    zz = mul(z1, z1)
+    h = _poly_sub(mul(x2, zz), x1, p)
+    r = _poly_sub(mul(y2, mul(z1, zz)), y1, p)  # y * r
+    hh = mul(h, h)
+    hhh, v = mul(hh, h), mul(x1, hh)
+    x3 = _poly_sub(_poly_sub(mul(f, mul(r, r)), hhh, p), [2 * c % p for c in v], p)
+    return x3, _poly_sub(mul(r, _poly_sub(v, x3, p)), mul(y1, hhh), p), mul(z1, h)
+
+
+def _ring_multiples(ring: _QuotientRing, f: list[int], a: int, point: tuple, count: int) -> list[tuple]:
+    """[k * point for k in range(1, count + 1)] in Jacobian coordinates, count must be less than l - 1"""
+    ans = [(*point, [1])]
+    if count > 1:
+        ans.append((*_ring_double(ring, f, a, point), [1]))
+    while len(ans) < count:
+        ans.append(_ring_add(ring, f, ans[-1], point))
+    return ans
+
+
+def _ring_multiple(ring: _QuotientRing, f: list[int], a: int, point: tuple, k: int, l: int) -> tuple:
+    """k * point for 0 < k < l using -k * point = (X, -Y, Z) if it's shorter to get"""
+    if 2 * k < l:
+        return _ring_multiples(ring, f, a, point, k)[-1]
+    x, y, z = _ring_multiples(ring, f, a, point, l - k)[-1]
+    return x, [(-c) % ring.p for c in y], z
+
+
+def _trace_modulo(l: int, a: int, b: int, p: int) -> int:
+    """Trace of Frobenius modulo a prime l != p (Schoof's algorithm)"""
+    f = [b % p, a % p, 0, 1]
+    if l == 2:  # t is even iff the curve has a point of order 2
+        ring = _QuotientRing(f, p)
+        return 0 if len(_poly_gcd(f, _poly_sub(ring.pow_x(p), [0, 1], p), p)) > 1 else 1
+
+    psi = _division_polynomial(l, a, b, p)
+    inverse = pow(psi[-1], -1, p)
+    ring = _QuotientRing([c * inverse % p for c in psi], p)
+    f = ring.reduce(f)
+    h, mul = ring.h, ring.mul
+    x = ring.reduce([0, 1])
+
+    x1, y1 = ring.pow_x(p), ring.pow(f, (p - 1) // 2)  # pi(x, y) = (x^p, y * f^((p - 1) / 2))
+    x2, y2 = ring.pow(x1, p), mul(ring.pow(y1, p), y1)
+    q = p % l
+    xq, yq, zq = _ring_multiple(ring, f, a, (x, [1]), q, l)
+
+    if len(_poly_gcd(h, _poly_sub(mul(x2, mul(zq, zq)), xq, p), p)) > 1:  # pi^2 P = +-qP for some P of order l
+        w = next((w for w in range(1, l) if w * w % l == q), None)
+        if w is None:
+            return 0
+        xw, yw, zw = _ring_multiple(ring, f, a, (x, [1]), w, l)
+        zz = mul(zw, zw)
+        if len(_poly_gcd(h, _poly_sub(mul(x1, zz), xw, p), p)) == 1:
+            return 0
+        return 2 * w % l if len(_poly_gcd(h, _poly_sub(mul(y1, mul(zz, zw)), yw, p), p)) > 1 else -2 * w % l
+
+    sx, sy, sz = _ring_add(ring, f, (xq, yq, zq), (x2, y2))  # pi^2 + q
+    szz = mul(sz, sz)
+    for tau, (tx, ty, tz) in enumerate(_ring_multiples(ring, f, a, (x1, y1), (l - 1) // 2), 1):
+        tzz = mul(tz, tz)
+        if mul(sx, tzz) == mul(tx, szz):
+            return tau if mul(sy, mul(tzz, tz)) == mul(ty, mul(szz, sz)) else l - tau
+    raise RuntimeError(f"Schoof's algorithm found no trace modulo {l}")
+
+
+def _affine_add(first: tuple[int, int] | None, second: tuple[int, int] | None, a: int, p: int) -> tuple[int, int] | None:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    (x1, y1), (x2, y2) = first, second
+    if x1 == x2:
+        if (y1 + y2) % p == 0:
+            return None
+        slope = (3 * x1 * x1 + a) * pow(2 * y1, -1, p) % p
+    else:
+        slope = (y2 - y1) * pow(x2 - x1, -1, p) % p
+    x = (slope * slope - x1 - x2) % p
+    return x, (slope * (x1 - x) - y1) % p
+
+
+def _affine_multiply(point: tuple[int, int] | None, k: int, a: int, p: int) -> tuple[int, int] | None:
+    ans = None
+    for bit in bin(k)[2:]:
+        ans = _affine_add(ans, ans, a, p)
+        if bit == "1":
+            ans = _affine_add(ans, point, a, p)
+    return ans
+
+
+def _bsgs_orders(curve: EllipticCurve, trace: int, modulus: int) -> set[int]:
+    """
+    Orders N = p + 1 - t in the Hasse interval with t = trace (mod modulus) and N * P = O for random points P
+    """
+    a, p = curve.a.value, curve.p
+    w = isqrt(4 * p)
+    k_low, k_high = -((w + trace) // modulus), (w - trace) // modulus
+    count = k_high - k_low + 1
+    orders = None
+    for _ in range(CURVE_ORDER_POINTS):
+        point = curve.get_random_point()
+        point = (point.x.value, point.y.value)
+        target = _affine_multiply(point, p + 1 - trace - k_low * modulus, a, p)  # target = k * (modulus * P)
+        base = _affine_multiply(point, modulus, a, p)
+        m = isqrt(count // 2) + 1  # baby steps j * base for j <= m match both +-j by x
+        baby, current, period = {}, None, None
+        for j in range(1, m + 1):
+            current = _affine_add(current, base, a, p)
+            if current is None or current[0] in baby:  # base has a small order, so all k in a class modulo it work
+                period = j if current is None else j + baby[current[0]][0]
+                break
+            baby[current[0]] = j, current[1]
+        found = set()
+        if period is not None:
+            if target is None:
+                found = set(range(0, count, period))
+            elif target[0] in baby:
+                j, y = baby[target[0]]
+                found = set(range(j if y == target[1] else period - j, count, period))
+        else:
+            giant = _affine_multiply(base, 2 * m, a, p)
+            giant = None if giant is None else (giant[0], -giant[1] % p)
+            shift = _affine_multiply(base, m, a, p)
+            current = _affine_add(target, None if shift is None else (shift[0], -shift[1] % p), a, p)
+            for i in range(count // (2 * m) + 1):  # current = target - (2mi + m) * base
+                if current is None:
+                    found.add(2 * m * i + m)
+                elif current[0] in baby:
+                    j, y = baby[current[0]]
+                    found.add(2 * m * i + m + (j if y == current[1] else -j))
+                current = _affine_add(current, giant, a, p)
+        candidates = {p + 1 - trace - (k_low + k) * modulus for k in found if 0 <= k < count}
+        orders = candidates if orders is None else orders & candidates
+        if len(orders) <= 1:
+            break
+    return orders
+
+
+def _primes_from(start: int):
+    n = start
+    while True:
+        if is_probable_prime(n):
+            yield n
+        n += 1
+
+
+def _count_points(curve: EllipticCurve, max_cofactor: int | None = None) -> int | None:
+    """
+    Number of points of the curve. With max_cofactor given, returns None as soon as a prime l > max_cofactor
+    is found to divide it.
+    """
+    a, b, p = curve.a.value, curve.b.value, curve.p
+    w = isqrt(4 * p)
+    trace, modulus = 0, 1
+    for l in _primes_from(2):
+        if (2 * w) // modulus + 1 <= CURVE_BSGS_RANGE and (max_cofactor is None or l > CURVE_EARLY_ABORT_BOUND):
+            orders = _bsgs_orders(curve, trace, modulus)
+            if len(orders) == 1:
+                return orders.pop()
+        if l == p:
+            continue
+        t = _trace_modulo(l, a, b, p)
+        if max_cofactor is not None and l > max_cofactor and (p + 1 - t) % l == 0:
+            return None
+        trace += modulus * ((t - trace) * pow(modulus, -1, l) % l)  # Chinese remainder theorem
+        modulus *= l
+
+
+def count_points(curve: EllipticCurve) -> int:
+    """Number of points of the curve over Fp including the point at infinity, it's stored in the precomputation cache"""
+    assert curve.p > 3, "only curves over Fp with p > 3 are supported"
+    cache = curve.precomputation_cache
+    order = cache.load_order(curve) if cache is not None else None
+    if order is None:
+        order = _count_points(curve)
+        if cache is not None:
+            cache.store_order(curve, order)
+    return order
+
+
+def prime_subgroup_order(order: int, p: int, max_cofactor: int = 1) -> int | None:
+    """
+    Returns the prime r with order = h * r for a cofactor h <= max_cofactor if the curve of that order over Fp
+    is suitable for cryptography: r != p (not anomalous) and p^k != 1 modulo r for k <= CURVE_MIN_EMBEDDING_DEGREE.
+    Returns None otherwise.
+    """
+    for h in range(1, max_cofactor + 1):
+        r = order // h
+        if order % h or r <= max_cofactor or not is_probable_prime(r):
+            continue
+        if r == p or any(pow(p, k, r) == 1 for k in range(1, CURVE_MIN_EMBEDDING_DEGREE + 1)):
+            return None
+        return r
+    return None
+
+
+def _check_candidate(a: int, b: int, p: int, max_cofactor: int) -> int | None:
+    """Order of the curve if it's suitable, None otherwise"""
+    order = _count_points(EllipticCurve(a, b, p), max_cofactor)
+    if order is None or prime_subgroup_order(order, p, max_cofactor) is None:
+        return None
+    return order
+
+
+def _candidates(p: int):
+    while True:
+        a, b = random.randrange(p), random.randrange(p)
+        if (4 * a ** 3 + 27 * b * b) % p:
+            yield a, b
+
+
+def find_curves(p: int,
+                count: int = 1,
+                max_cofactor: int = 1,
+                *,
+                executor: Executor | None = None,
+                max_workers: int | None = 1,
+                max_candidates: int = CURVE_SEARCH_MAX_CANDIDATES) -> list[tuple[EllipticCurve, int]]:
+    """
+    Returns `count` random curves over Fp with their orders, each order is a prime times a cofactor <= max_cofactor
+    and the curves pass the checks of prime_subgroup_order.
+    With max_workers > 1 (or None for the number of CPUs) or a given executor candidates are checked
+    on a process pool, at most 2 per worker are in flight and the rest is cancelled once enough curves are found.
+    """
+    assert p > 3 and is_probable_prime(p), "p must be a prime greater than 3"
+    assert count > 0 and max_cofactor > 0, "count and max_cofactor must be positive"
+    found = []
+    candidates = _candidates(p)
+
+    if executor is None and max_workers == 1:
+        for a, b in islice(candidates, max_candidates):
+            order = _check_candidate(a, b, p, max_cofactor)
+            if order is not None:
+                found.append((EllipticCurve(a, b, p), order))
+                if len(found) == count:
+                    return found
+    else:
+        pool = executor or ProcessPoolExecutor(max_workers)
+        in_flight = 2 * (max_workers or os.cpu_count() or 1)
+        pending, submitted = {}, 0
+        try:
+            while len(found) < count and (pending or submitted < max_candidates):
+                while len(pending) < in_flight and submitted < max_candidates:
+                    a, b = next(candidates)
+                    pending[pool.submit(_check_candidate, a, b, p, max_cofactor)] = (a, b)
+                    submitted += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    a, b = pending.pop(future)
+                    if (order := future.result()) is not None and len(found) < count:
+                        found.append((EllipticCurve(a, b, p), order))
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor is None:
+                pool.shutdown(cancel_futures=True)
+        if len(found) == count:
+            return found
+
+    raise RuntimeError(f"Cannot find {count} suitable curves among {max_candidates} candidates. If you are sure they exist, "
+                       f"try increasing max_candidates or max_cofactor.")
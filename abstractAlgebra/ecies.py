@@ -0,0 +1,155 @@
+"""
+Hybrid ECIES-style encryption of arbitrary byte payloads with ElGamal keys (see elgamal_genkey).
+
+Only one ephemeral key agreement is done per message: R = r * alpha is sent along, S = r * beta = pk * R is
+the shared secret. Encryption and MAC keys are derived from it with HKDF-SHA256 and the payload is
+encrypted in chunks with a SHAKE-256 keystream, each chunk is authenticated with HMAC-SHA256.
+
+Format: MAGIC, R, then records of
+    4-byte big-endian length (the highest bit marks the last record), ciphertext, 32-byte tag
+where the tag covers the record index, the length field and the ciphertext, so chunks cannot be
+modified, reordered or dropped, and a stream cut at a record boundary is detected as well.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import io
+import secrets
+from typing import BinaryIO
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+
+ECIES_MAGIC = b"ECIES\x01"
+ECIES_CHUNK_SIZE = 1 << 16  # plaintext bytes per record
+ECIES_INFO = b"abstractAlgebra ECIES v1"
+TAG_SIZE = 32
+FINAL_FLAG = 1 << 31
+
+
+def _hkdf(salt: bytes, ikm: bytes, info: bytes, length: int) -> bytes:
+    """HKDF with SHA-256 - RFC 5869"""
+    prk = hmac.new(salt, ikm, hashlib.sha256).digest()
+    okm, block = b"", b""
+    for counter in range(1, -(-length // 32) + 1):
+        block = hmac.new(prk, block + info + bytes([counter]), hashlib.sha256).digest()
+        okm += block
+    return okm[:length]
+
+
+def _keys(ephemeral: EllipticCurvePoint, shared: EllipticCurvePoint) -> tuple[bytes, bytes]:
+    """Returns the (encryption key, mac key) pair"""
+    okm = _hkdf(ephemeral.to_bytes(), shared.to_bytes(), ECIES_INFO, 64)
+    return okm[:32], okm[32:]
+
+
+def _xor_keystream(key: bytes, index: int, data: bytes) -> bytes:
+    keystream = hashlib.shake_256(key + index.to_bytes(8, "big")).digest(len(data))
+    return (int.from_bytes(data, "little") ^ int.from_bytes(keystream, "little")).to_bytes(len(data), "little")
+
+
+def _tag(key: bytes, index: int, header: bytes, ciphertext: bytes) -> bytes:
+    return hmac.new(key, index.to_bytes(8, "big") + header + ciphertext, hashlib.sha256).digest()
+
+
+def _read_exactly(source: BinaryIO, n: int) -> bytes:
+    data = source.read(n)
+    while len(data) < n:
+        more = source.read(n - len(data))
+        if not more:
+            raise ValueError("ciphertext is truncated")
+        data += more
+    return data
+
+
+def ecies_encrypt_stream(source: BinaryIO,
+                         destination: BinaryIO,
+                         alpha: EllipticCurvePoint,
+                         beta: EllipticCurvePoint,
+                         chunk_size: int = ECIES_CHUNK_SIZE) -> int:
+    """
+    Reads the whole source and writes its encryption to the destination (both are binary file-like objects)
+    chunk by chunk, so memory usage doesn't depend on the payload size. Returns the number of written bytes.
+    """
+    curve = alpha.curve
+    assert curve == beta.curve, "points must belong to the same curve"
+    assert 0 < chunk_size < FINAL_FLAG, "chunk size must be positive and fit 31 bits"
+
+    # ephemeral key agreement
+    while True:
+        r = secrets.randbelow(curve.p - 1) + 1
+        ephemeral, shared = curve.multiply(alpha, r, "ladder"), curve.multiply(beta, r, "ladder")
+        if not ephemeral.is_identity and not shared.is_identity:
+            break
+    enc_key, mac_key = _keys(ephemeral, shared)
+
+    written = destination.write(ECIES_MAGIC + ephemeral.to_bytes())
+    index = 0
+    chunk = source.read(chunk_size)
+    while True:
+        # reading ahead to know whether the current chunk is the last one
+        following = source.read(chunk_size)
+        header = (len(chunk) | (0 if following else FINAL_FLAG)).to_bytes(4, "big")
+        ciphertext = _xor_keystream(enc_key, index, chunk)
+        written += destination.write(header + ciphertext + _tag(mac_key, index, header, ciphertext))
+        if not following:
+            return written
+        chunk = following
+        index += 1
+
+
+def ecies_decrypt_stream(source: BinaryIO,
+                         destination: BinaryIO,
+                         curve: EllipticCurve,
+                         pk: int,
+                         chunk_size: int = ECIES_CHUNK_SIZE) -> int:
+    """
+    Decrypts the stream written by ecies_encrypt_stream. Every chunk is authenticated before it's written,
+    ValueError is raised if the ciphertext was modified, truncated or followed by other data.
+    Returns the number of written bytes.
+
+    :param chunk_size: chunk size the stream was encrypted with, longer records are rejected before they're read
+    """
+    assert 0 < chunk_size < FINAL_FLAG, "chunk size must be positive and fit 31 bits"
+    if _read_exactly(source, len(ECIES_MAGIC)) != ECIES_MAGIC:
+        raise ValueError("not an ECIES ciphertext")
+    prefix = _read_exactly(source, 1)
+    width = (curve.p.bit_length() + 7) // 8
+    encoded = prefix + (_read_exactly(source, 2 * width) if prefix == b"\x04" else b"")
+    try:
+        ephemeral = curve.point_from_bytes(encoded)
+    except (AttributeError, AssertionError):
+        raise ValueError("invalid ephemeral key")
+    if ephemeral.is_identity:
+        raise ValueError("invalid ephemeral key")
+    enc_key, mac_key = _keys(ephemeral, curve.multiply(ephemeral, pk, "ladder"))
+
+    written, index = 0, 0
+    while True:
+        header = _read_exactly(source, 4)
+        length = int.from_bytes(header, "big")
+        if length & ~FINAL_FLAG > chunk_size:
+            raise ValueError(f"record of {length & ~FINAL_FLAG} bytes exceeds the chunk size {chunk_size}")
+        ciphertext = _read_exactly(source, length & ~FINAL_FLAG)
+        if not hmac.compare_digest(_read_exactly(source, TAG_SIZE), _tag(mac_key, index, header, ciphertext)):
+            raise ValueError("ciphertext authentication failed")
+        written += destination.write(_xor_keystream(enc_key, index, ciphertext))
+        if length & FINAL_FLAG:
+            if source.read(1):
+                raise ValueError("unexpected data after the final record")
+            return written
+        index += 1
+
+
+def ecies_encrypt(data: bytes, alpha: EllipticCurvePoint, beta: EllipticCurvePoint,
+                  chunk_size: int = ECIES_CHUNK_SIZE) -> bytes:
+    destination = io.BytesIO()
+    ecies_encrypt_stream(io.BytesIO(data), destination, alpha, beta, chunk_size)
+    return destination.getvalue()
+
+
+def ecies_decrypt(data: bytes, curve: EllipticCurve, pk: int, chunk_size: int = ECIES_CHUNK_SIZE) -> bytes:
+    destination = io.BytesIO()
+    ecies_decrypt_stream(io.BytesIO(data), destination, curve, pk, chunk_size)
+    return destination.getvalue()
@@ -1,29 +1,86 @@
+import hashlib
+import secrets
+
 from abstractAlgebra.structures import *
 from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.curve_search import find_curves
 
 ELGAMAL_MAX_I_ITERATIONS = 128
-
-def elgamal_genkey(p: int) -> tuple[EllipticCurvePoint, EllipticCurvePoint, int]:
+ELGAMAL_ENCODINGS = ("increment", "map")  # the legacy try-and-increment embedding and the reversible map to curve
+EMBEDDING_TAG_ATTEMPTS = 8  # number of tags tried when the embedded message would be ambiguous
+
+def _embedding_tags(message: int, parameter: int) -> list[int]:
+    """Tags 0 < tag < parameter of every attempt, all of them derived from a single hash of the message"""
+    width = (parameter.bit_length() + 7) // 8 + 8  # extra bytes make the tags close to uniform
+    stream = hashlib.shake_256(message.to_bytes((message.bit_length() + 7) // 8 + 1, "big")).digest(EMBEDDING_TAG_ATTEMPTS * width)
+    return [1 + int.from_bytes(stream[i:i + width], "big") % (parameter - 1) for i in range(0, len(stream), width)]
+
+def _embedded_value(values: Iterable[int], parameter: int) -> int | None:
+    """The value v = parameter * message + tag with a tag of the earliest attempt, the smallest one on ties"""
+    tagged = {}
+    for v in values:
+        message, tag = divmod(v, parameter)
+        tags = _embedding_tags(message, parameter)
+        if tag in tags:
+            tagged[v] = tags.index(tag)
+    return min(tagged, key=lambda v: (tagged[v], v), default=None)
+
+def embed_message(message: int, curve: EllipticCurve, parameter: int) -> EllipticCurvePoint:
+    """
+    Reversibly embeds a non-negative integer message into a curve point: v = parameter * message + tag
+    is embedded by curve.embed_value, where 0 < tag < parameter is derived from the hash of the message.
+    Up to 4 values share a point, so the tag tells the right one apart when the message is extracted.
+    Values sharing the point are found without computing it, in the rare case (probability about 4 / parameter)
+    when another one would be extracted instead, the next tag is used.
+    """
+    assert isinstance(message, int) and message >= 0, "message must be a non-negative integer"
+    assert parameter > 1, "parameter must leave room for the tag"
+    assert (message + 1) * parameter <= curve.p, "message is too big for the field and parameter"
+    for tag in _embedding_tags(message, parameter):
+        v = parameter * message + tag
+        if _embedded_value(curve.embedding_class(v), parameter) == v:
+            return curve.embed_value(v)
+    raise RuntimeError("Cannot embed the message unambiguously. If you are sure it's possible, "
+                       "try increasing the parameter or EMBEDDING_TAG_ATTEMPTS.")
+
+def extract_message(point: EllipticCurvePoint, parameter: int) -> int | None:
+    """Returns the message embedded by embed_message or None if the point doesn't hold any"""
+    v = _embedded_value(point.curve.embedded_values(point), parameter)
+    return None if v is None else v // parameter
+
+def elgamal_genkey(p: int, search: bool = False, max_workers: int | None = 1) -> tuple[EllipticCurvePoint, EllipticCurvePoint, int]:
     """
     Returns 2 points which represent a public key and a number that is a part of private key.
+
+    :param search: find a curve of prime order with find_curves instead of taking a random one,
+        which may have a tiny subgroup, max_workers processes are used by the search
     """
     # TODO: test whether p is prime or not
 
-    curve = random_elliptic_curve(p)
-    pk = (curve.field.get_random_element() % (curve.field.p - 1)).value + 1  # 1<k<p-1
+    if search:
+        (curve, order), = find_curves(p, max_workers=max_workers)
+        pk = secrets.randbelow(order - 1) + 1  # every point generates the whole group of prime order
+    else:
+        curve = random_elliptic_curve(p)
+        pk = (curve.field.get_random_element() % (curve.field.p - 1)).value + 1  # 1<k<p-1
     alpha = curve.get_random_point()
-    beta = alpha * pk
+    beta = curve.multiply(alpha, pk)
 
     return alpha, beta, pk
 
 def elgamal_encrypt(message: FieldElement,
                     alpha: EllipticCurvePoint,
                     beta: EllipticCurvePoint,
-                    parameter: int) -> tuple[EllipticCurvePoint, EllipticCurvePoint]:
+                    parameter: int,
+                    encoding: str = "increment") -> tuple[EllipticCurvePoint, EllipticCurvePoint]:
     """
     Encrypts a message using ElGamal encryption by 2 given points that must belong to the same elliptic curve and given parameter.
     Message could be either an integer or an element curve is built on (essentially anything that can be converted to a field element).
 
+    :param encoding: "increment" tries x = parameter * message + i for i < ELGAMAL_MAX_I_ITERATIONS until x is on the curve,
+        "map" embeds the message with embed_message - a single sqrt on curves with a * b != 0 and no retry loop,
+        the message has to be decrypted with the same encoding
+
     Returns 2 points (c1, c2).
     """
     curve = alpha.curve
@@ -31,39 +88,53 @@ def elgamal_encrypt(message: FieldElement,
 
     assert message in field, "message must be an element of the curve's field"
     assert curve == beta.curve, "points must belong to the same curve"
+    if encoding not in ELGAMAL_ENCODINGS:
+        raise AttributeError(f"unknown message encoding: {encoding}, expected one of {ELGAMAL_ENCODINGS}")
 
-    # generating i
-    for c in range(ELGAMAL_MAX_I_ITERATIONS):
-        i = field(c)
-        message_x = parameter * message + i
-        if curve.polynom(message_x).is_quadratic_residue():
-            break
+    if encoding == "map":
+        message_point = embed_message(field(message).value, curve, parameter)
     else:
-        raise RuntimeError("Cannot generate i. If you are sure it exists, try increasing the ELGAMAL_MAX_I_ITERATIONS parameter.")
-
-    # cure point to be encrypted
-    message_point = curve(message_x, curve.polynom(message_x).sqrt)
+        # generating i
+        for c in range(ELGAMAL_MAX_I_ITERATIONS):
+            i = field(c)
+            message_x = parameter * message + i
+            if curve.polynom(message_x).is_quadratic_residue():
+                break
+        else:
+            raise RuntimeError("Cannot generate i. If you are sure it exists, try increasing the ELGAMAL_MAX_I_ITERATIONS parameter.")
+
+        # cure point to be encrypted
+        message_point = curve(message_x, curve.polynom(message_x).sqrt)
 
     # encrypting with random x
-    x = field.get_random_element()
-    с1 = alpha * x
-    с2 = message_point + beta * x
+    x = secrets.randbelow(field.p - 1) + 1
+    с1 = curve.multiply(alpha, x)
+    с2 = message_point + curve.multiply(beta, x)
 
     return с1, с2
 
 def elgamal_decrypt(c1: EllipticCurvePoint,
                     c2: EllipticCurvePoint,
                     parameter: int,
-                    pk: int):
+                    pk: int,
+                    encoding: str = "increment"):
     curve = c1.curve
 
     assert curve == c2.curve, "points must belong to the same curve"
+    if encoding not in ELGAMAL_ENCODINGS:
+        raise AttributeError(f"unknown message encoding: {encoding}, expected one of {ELGAMAL_ENCODINGS}")
 
     # decrypting
-    beta_x = c1 * pk  # a * x*k = a * k*x = b * x
+    beta_x = curve.elements_mul(c1, pk, method="ladder")  # a * x*k = a * k*x = b * x
     message_point = c2 - beta_x
+
+    if encoding == "map":
+        message = extract_message(message_point, parameter)
+        if message is None:
+            raise AttributeError("decrypted point doesn't hold an embedded message")
+        return curve.field(message)
+
     message_x = message_point.x
     message = message_x // parameter
 
     return message
-
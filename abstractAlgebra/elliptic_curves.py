@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Tuple
 
 from abstractAlgebra.structures import *
 from decimal import Decimal
+from math import isqrt
 
 import random
 
 INFTY = Decimal('Infinity')
 MAX_RANDOM_CURVE_ITERS = 64
+SCALAR_MUL_METHODS = ("binary", "ladder", "glv")  # available algorithms of scalar multiplication
+GLV_FROBENIUS_CHECKS = 8  # number of random points the Frobenius endomorphism candidates are tested on
+MSM_MAX_WINDOW = 16  # upper bound of the window width (in bits) of multi-scalar multiplication
+MSM_SHAMIR_MAX_POINTS = 4  # multi-scalar multiplications of at most that many points use Shamir's trick
+HASH_TO_CURVE_DST = b"abstractAlgebra-hash-to-curve-v1"  # domain separation tag of hash_to_curve
+HASH_TO_FIELD_EXTRA_BITS = 128  # hash outputs are longer than p by that many bits, so their remainders are almost uniform
 
 
 def define_appropriate_curve(a: FieldElement, b: FieldElement) -> bool:
@@ -36,11 +44,147 @@ def random_elliptic_curve(p: int) -> EllipticCurve:
                            " try increasing the MAX_RANDOM_CURVE_ITERS parameter.")
 
 
+def cornacchia(d: int, m: int) -> tuple[int, int] | None:
+    """
+    Cornacchia's algorithm - https://en.wikipedia.org/wiki/Cornacchia%27s_algorithm
+    Returns a solution (x, y) of x^2 + d*y^2 = m for a prime m, or None if it doesn't exist.
+    """
+    r = Fp(m)(-d).sqrt
+    if r is None:
+        return None
+    r0 = r.value
+    if r0 > m // 2:
+        r0 = m - r0
+
+    r1 = m
+    while r0 * r0 >= m:
+        r1, r0 = r0, r1 % r0
+    y2, rest = divmod(m - r0 * r0, d)
+    y = isqrt(y2)
+    if rest or y * y != y2:
+        return None
+    return r0, y
+
+
+def _ring_mul(u: tuple[int, int], v: tuple[int, int], c1: int, c0: int) -> tuple[int, int]:
+    """
+    Multiplication in Z[phi], where phi^2 + c1*phi + c0 = 0 and elements are stored as pairs (a, b) = a + b*phi
+    """
+    a, b = u
+    c, d = v
+    return a * c - c0 * b * d, a * d + b * c - c1 * b * d
+
+
+def _ring_conjugate(u: tuple[int, int], c1: int) -> tuple[int, int]:
+    """Complex conjugate in Z[phi], where phi^2 + c1*phi + c0 = 0"""
+    a, b = u
+    return a - c1 * b, -b
+
+
+def _affine_add(p: int, a: int, u: tuple[int, int] | None, v: tuple[int, int] | None) -> tuple[int, int] | None:
+    """Adds points given as integer (x, y) pairs, None is the point at infinity"""
+    if u is None:
+        return v
+    if v is None:
+        return u
+    (x1, y1), (x2, y2) = u, v
+    if x1 == x2:
+        if not (y1 + y2) % p:
+            return None
+        m = (3 * x1 * x1 + a) * pow(2 * y1, -1, p)
+    else:
+        m = (y1 - y2) * pow(x1 - x2, -1, p)
+    rx = (m * m - x1 - x2) % p
+    return rx, (m * (x1 - rx) - y1) % p
+
+
+def _batch_affine_add(p: int, a: int, pairs: list[tuple[tuple[int, int], tuple[int, int]]]) -> list[tuple[int, int] | None]:
+    """
+    Adds every pair of finite points sharing a single inversion between all of them (Montgomery's trick),
+    so each addition costs a few multiplications only.
+    """
+    denominators = []
+    for (x1, y1), (x2, y2) in pairs:
+        den = (x1 - x2) % p if x1 != x2 else 2 * y1 % p
+        denominators.append(den or 1)  # P + (-P) doesn't need the inversion
+
+    prefix = [1]
+    for den in denominators:
+        prefix.append(prefix[-1] * den % p)
+    inv = pow(prefix[-1], -1, p)
+
+    ans = [None] * len(pairs)
+    for i in range(len(pairs) - 1, -1, -1):
+        den_inv = inv * prefix[i] % p
+        inv = inv * denominators[i] % p
+        (x1, y1), (x2, y2) = pairs[i]
+        if x1 != x2:
+            m = (y1 - y2) * den_inv
+        elif (y1 + y2) % p:
+            m = (3 * x1 * x1 + a) * den_inv
+        else:
+            continue
+        rx = (m * m - x1 - x2) % p
+        ans[i] = rx, (m * (x1 - rx) - y1) % p
+    return ans
+
+
+def _batch_affine_sums(p: int, a: int, groups: list[list[tuple[int, int]]]) -> list[tuple[int, int] | None]:
+    """Returns sums of all groups of finite points adding them pairwise in rounds, every round does one inversion"""
+    groups = [list(group) for group in groups]
+    while True:
+        pairs, targets = [], []
+        for index, group in enumerate(groups):
+            for j in range(0, len(group) - 1, 2):
+                pairs.append((group[j], group[j + 1]))
+                targets.append(index)
+        if not pairs:
+            return [group[0] if group else None for group in groups]
+
+        sums = _batch_affine_add(p, a, pairs)
+        reduced = [[] if len(group) % 2 == 0 else [group[-1]] for group in groups]
+        for index, point in zip(targets, sums):
+            if point is not None:
+                reduced[index].append(point)
+        groups = reduced
+
+
+def _quadratic_roots(a: int, b: int, c: int, field: Fp) -> list[int]:
+    """Roots of a*t^2 + b*t + c = 0 in Fp (the equation may degenerate into a linear one)"""
+    p = field.p
+    a, b, c = a % p, b % p, c % p
+    if not a:
+        if not b:
+            return []
+        return [-c * pow(b, -1, p) % p]
+    root = field.sqrt(field(b * b - 4 * a * c))
+    if root is None:
+        return []
+    inverse = pow(2 * a, -1, p)
+    return sorted({(-b + root.value) * inverse % p, (-b - root.value) * inverse % p})
+
+
+def _interned_curve(cls: type, a: int, b: int, p: int, backend: str | ArithmeticBackend, reduction: str) -> EllipticCurve:
+    """Unpickles the curve over the interned field, so it's shared with unpickled field elements (see interned_structure)"""
+    if not isinstance(backend, str):
+        return cls(a, b, Fp(p, backend, reduction))
+    field = interned_structure(Fp, p, backend, reduction)
+    return intern_structure((cls, a, b, p, backend, reduction), lambda: cls(a, b, field))
+
+
+def _curve_point(curve: EllipticCurve, xy: tuple[int, int] | None) -> EllipticCurvePoint:
+    """Unpickles the point, the point at infinity stays the only one of its curve"""
+    return curve.aneutral if xy is None else curve(*xy)
+
+
 class EllipticCurvePoint(FieldElement):
     """
     Represents a point in an Elliptic Curve.
-    Its value is a tuple of 2 decimals that can be reached via x and y properties.
+    Its value is a tuple of 2 field elements that can be reached via x and y properties.
+    Points are immutable, so they can be freely shared between threads.
+    The point at infinity has (INFTY, INFTY) value and is_identity flag set, there's only one such point per curve.
     """
+    is_identity = False
 
     def __init__(self,
                  x: int = None,
@@ -58,6 +202,7 @@ class EllipticCurvePoint(FieldElement):
         if zero_passed or infty_passed:
             self.value = (INFTY, INFTY)
             self.__structure__ = curve
+            self.is_identity = True
             return
 
         if x is None or y is None:
@@ -77,6 +222,9 @@ class EllipticCurvePoint(FieldElement):
         super().__init__(value=value, structure=structure)
         self.value: Tuple[FieldElement | INFTY, FieldElement | INFTY]
 
+    def __reduce__(self):
+        return _curve_point, (self.curve, None if self.is_identity else (self.x.value, self.y.value))
+
     def is_inverse_of(self, point: Any):
         """Checks whether the point is inverse of the given point"""
 
@@ -91,29 +239,25 @@ class EllipticCurvePoint(FieldElement):
     def __str__(self):
         return f"<{self.__class__.__name__}: {self.value}>"
 
+    @override
+    def __bool__(self):
+        return not self.is_identity
+
     @override
     @property
     def ainverse(self) -> EllipticCurvePoint | None:
-        if self == self.curve.aneutral:
-            return self.curve.aneutral
+        if self.is_identity:
+            return self
         return self.structure.element_additive_inverse(self)
 
     @property
     def x(self) -> FieldElement | INFTY:
         return self.value[0]
 
-    @x.setter
-    def x(self, value: int):
-        self.value = (self.field(value), self.y)
-
     @property
     def y(self) -> FieldElement | INFTY:
         return self.value[1]
 
-    @y.setter
-    def y(self, value: int):
-        self.value = (self.x, self.field(value))
-
     @property
     def field(self) -> Fp:
         return self.curve.field
@@ -128,17 +272,42 @@ class EllipticCurvePoint(FieldElement):
         """returns the tuple made of x and y values (alias for point.value)"""
         return self.value
 
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the point as 0x04 followed by fixed width big-endian x and y (SEC 1 uncompressed form),
+        the point at infinity is a single 0x00 byte. See EllipticCurve.point_from_bytes.
+        """
+        if self.is_identity:
+            return b"\x00"
+        width = (self.curve.p.bit_length() + 7) // 8
+        return b"\x04" + self.value[0].value.to_bytes(width, "big") + self.value[1].value.to_bytes(width, "big")
+
 
 class EllipticCurve(Field):
     """
     Elliptic curve over finite field Fp
     """
 
-    def __init__(self, a: Any, b: Any, p: int):
-        self.field = Fp(p)
+    def __init__(self, a: Any, b: Any, p: int | Fp, backend: str | ArithmeticBackend = None):
+        """
+        :param p: characteristic of the field or the field itself (then the backend is ignored)
+        :param backend: arithmetic backend of the underlying field, see abstractAlgebra.backends.
+            Point formulas of backends which aren't inlined (gmpy2, cross-check) are computed by the backend too,
+            so they use the generic algorithms instead of the ones working on raw integers (ladder, batched sums)
+        """
+        self.field = p if isinstance(p, Fp) else Fp(p, backend)
         self.a = self.field(a)
         self.b = self.field(b)
         assert define_appropriate_curve(self.a, self.b), "4a^3 + 27b^2 must not be zero"
+        self.__glv__ = None
+        self.__map_constants__ = None
+        self.__identity__ = EllipticCurvePoint(0, structure=self)
+
+    def __reduce__(self):
+        """Curves are pickled as their parameters, unpickled ones are interned (see interned_structure)"""
+        field = self.field
+        return _interned_curve, (self.__class__, self.a.value, self.b.value, self.p, backend_reference(field.backend),
+                                 field.reduction)
 
     def __call__(self, *args, **kwargs) -> EllipticCurvePoint:
         """
@@ -163,6 +332,9 @@ class EllipticCurve(Field):
         else:
             raise AttributeError(f"Expected 1 or 2 arguments, got {len(args)}")
 
+        if INFTY == x and INFTY == y:
+            return self.aneutral
+
         # constructing new field elements when x or y isn't from the equal field
         field_element = isinstance(x, FieldElement)
         if (not field_element and x != INFTY) or (field_element and x.structure != self.field):
@@ -217,66 +389,635 @@ class EllipticCurve(Field):
             else:
                 raise AttributeError(f"Expected 2 values to be unpacked, got {len(item)}")
 
+    def _point(self, x: int, y: int) -> EllipticCurvePoint:
+        """Builds a point from already reduced integer coordinates, skipping all the validation"""
+        point = EllipticCurvePoint.__new__(EllipticCurvePoint)
+        point.__structure__ = self
+        point.value = (self.field(x), self.field(y))
+        return point
+
+    def _as_point(self, other: Any) -> EllipticCurvePoint:
+        """Returns the given object if it's a point of this curve, otherwise tries to convert it"""
+        if isinstance(other, EllipticCurvePoint) and (other.__structure__ is self or other.__structure__ == self):
+            return other
+        try:
+            return self(other)
+        except (AssertionError, AttributeError):
+            raise AttributeError(f"{other} of type {type(other)} cannot be turned into a point of {self}")
+
+    def point_from_bytes(self, data: bytes) -> EllipticCurvePoint:
+        """Decodes the point encoded by EllipticCurvePoint.to_bytes, raises AttributeError if it's not a curve point"""
+        width = (self.p.bit_length() + 7) // 8
+        if data == b"\x00":
+            return self.aneutral
+        if len(data) != 2 * width + 1 or data[0] != 4:
+            raise AttributeError(f"{data!r} is not an encoded point of {self}")
+        x, y = int.from_bytes(data[1:width + 1], "big"), int.from_bytes(data[width + 1:], "big")
+        if x >= self.p or y >= self.p:
+            raise AttributeError(f"{data!r} is not an encoded point of {self}")
+        return self(x, y)
+
+    @override
+    def elements_eq(self, element: EllipticCurvePoint, other: Any) -> bool:
+        if isinstance(other, EllipticCurvePoint) and (other.__structure__ is self or other.__structure__ == self):
+            if element.is_identity or other.is_identity:
+                return element.is_identity and other.is_identity
+            return element.value[0].value == other.value[0].value and element.value[1].value == other.value[1].value
+        return super().elements_eq(element, other)
+
     @override
     def element_additive_inverse(self, element: EllipticCurvePoint) -> EllipticCurvePoint:
-        inverse = self(element.x, element.y.ainverse)
-        return inverse
+        if element.is_identity:
+            return element
+        return self._point(element.x.value, self.field.backend.neg(element.y.value, self.p))
 
     @override
     def elements_add(self, self_point: EllipticCurvePoint, other: Any):
 
         # converting another object to Curve point
         try:
-            other_point = self(other)
-        except (AssertionError, AttributeError):
+            other_point = self._as_point(other)
+        except AttributeError:
             raise AttributeError(f"cannot add {type(self)} and {type(other)} since the second argument cannot be "
                                  f"turned into a {type(self_point)}")
 
         # case 1 - at least 1 of elements is a 'zero' element
-        if self_point == self.aneutral:
+        if self_point.is_identity:
             return other_point
-        if other_point == self.aneutral:
+        if other_point.is_identity:
             return self_point
 
-        # case 2 - points are inverses of each other (returning 0)
-        if self_point == other_point.ainverse:
-            return self.aneutral
+        p = self.p
+        (x1, y1), (x2, y2) = self_point.value, other_point.value
+        x1, y1, x2, y2 = x1.value, y1.value, x2.value, y2.value
+        if not self.field.backend.inline:
+            return self.__backend_add__(x1, y1, x2, y2)
 
-        # the rest
-        if self_point != other_point:  # case 3 - p1 != p2
-            m = (self_point.y - other_point.y) / (self_point.x - other_point.x)
-        if self_point == other_point:  # case 4 - p1 == p2
-            m = (3*self_point.x ** 2 + self_point.curve.a) / (2*self_point.y)
-        rx = m ** 2 - self_point.x - other_point.x
-        ry = self_point.y + m*(rx - self_point.x)
+        if x1 == x2:
+            # case 2 - points are inverses of each other (returning 0)
+            if not (y1 + y2) % p:
+                return self.aneutral
+            # case 4 - p1 == p2
+            m = (3 * x1 * x1 + self.a.value) * pow(2 * y1, -1, p)
+        else:  # case 3 - p1 != p2
+            m = (y1 - y2) * pow(x1 - x2, -1, p)
 
-        return self(rx, -ry)
+        rx = (m * m - x1 - x2) % p
+        ry = (m * (x1 - rx) - y1) % p
+        return self._point(rx, ry)
+
+    def __backend_add__(self, x1: int, y1: int, x2: int, y2: int) -> EllipticCurvePoint:
+        """Addition of 2 finite points with every operation done by the field backend"""
+        backend, p = self.field.backend, self.p
+        if x1 == x2:
+            if not backend.add(y1, y2, p):
+                return self.aneutral
+            numerator = backend.add(backend.mul(3, backend.mul(x1, x1, p), p), self.a.value, p)
+            denominator = backend.add(y1, y1, p)
+        else:
+            numerator, denominator = backend.sub(y1, y2, p), backend.sub(x1, x2, p)
+        m = backend.mul(numerator, backend.inverse(denominator, p), p)
+        rx = backend.sub(backend.sub(backend.mul(m, m, p), x1, p), x2, p)
+        ry = backend.sub(backend.mul(m, backend.sub(x1, rx, p), p), y1, p)
+        return self._point(rx, ry)
 
     @override
-    def elements_mul(self, element: EllipticCurve, other: Any) -> EllipticCurve:
+    def elements_mul(self, element: EllipticCurvePoint, other: Any, method: str = None) -> EllipticCurvePoint:
+        """
+        Scalar multiplication of an elliptic curve point.
+        The scalar is converted into the element of the underlying field first.
+
+        :param method: "binary" for double-and-add, "ladder" for x-only Montgomery ladder or "glv",
+            by default GLV is used on curves with efficient endomorphism and double-and-add otherwise
+        """
+        return self.multiply(element, self.field(other).value, method)
+
+    def multiply(self, point: EllipticCurvePoint, k: int, method: str = None) -> EllipticCurvePoint:
         """
-        Scalar multiplication of an elliptic curve
+        Returns k*point for an arbitrary integer k using the given algorithm (see SCALAR_MUL_METHODS).
+        If the method isn't given, GLV is chosen for curves supporting it and double-and-add for the rest.
+        Products are memoized if the curve has a memo (see abstractAlgebra.memo).
         """
-        other = self.field(other).value
+        assert isinstance(k, int), "scalar must be an integer"
+        if method is None:
+            method = "glv" if self.has_efficient_endomorphism and self.glv_parameters is not None else "binary"
+        if method not in SCALAR_MUL_METHODS:
+            raise AttributeError(f"unknown scalar multiplication method: {method}, expected one of {SCALAR_MUL_METHODS}")
+
+        if self.memo is not None and not point.is_identity:
+            key = (point.x.value, point.y.value, k)
+            return self.memo.lookup("mul", key, lambda: self.__multiply__(point, k, method))
+        return self.__multiply__(point, k, method)
+
+    def __multiply__(self, point: EllipticCurvePoint, k: int, method: str) -> EllipticCurvePoint:
+        if k < 0:
+            point, k = -point, -k
+
+        # the ladder works on raw integers, other backends get the generic methods built on point additions
+        if method == "ladder" and self.p > 3 and self.field.backend.inline:
+            return self._ladder_mul(point, k)
+        if method == "glv" and self.glv_parameters is not None:
+            return self._glv_mul(point, k)
 
         # fast powering algorithm with addition instead of multiplication
         ans = self.aneutral
-        while other:
-            if other % 2:
-                ans += element
-            element = element + element
-            other //= 2
+        while k:
+            if k % 2:
+                ans += point
+            point = point + point
+            k //= 2
 
         return ans
 
+    def _ladder_mul(self, point: EllipticCurvePoint, k: int) -> EllipticCurvePoint:
+        """
+        Montgomery ladder in projective XZ coordinates for short Weierstrass curves (Brier-Joye formulas).
+        Every bit costs exactly one differential addition and one doubling. Ladder keeps R1 - R0 = point,
+        so y coordinate of the result is recovered at the end from R0 = k*point and R1 = (k+1)*point (Okeya-Sakurai).
+        """
+        if point.is_identity or not k:
+            return self.aneutral
+
+        p, a, b = self.p, self.a.value, self.b.value
+        x, y = point.x.value, point.y.value
+
+        # point of order 2
+        if not y:
+            return point if k % 2 else self.aneutral
+
+        b2, b4, b8 = 2 * b % p, 4 * b % p, 8 * b % p
+        x0, z0 = 1, 0  # R0 = O
+        x1, z1 = x, 1  # R1 = point
+
+        for bit in bin(k)[2:]:
+            # differential addition R0 + R1 (their difference is always the given point)
+            u, v = x0 * z1, x1 * z0
+            z01 = z0 * z1 % p
+            add_x = (2 * (u + v) * (x0 * x1 + a * z01) + b4 * z01 * z01 - x * (u - v) ** 2) % p
+            add_z = (u - v) ** 2 % p
+
+            # doubling of either R0 or R1
+            dx, dz = (x1, z1) if bit == "1" else (x0, z0)
+            xx, zz = dx * dx % p, dz * dz % p
+            dbl_x = ((xx - a * zz) ** 2 - b8 * dx * dz * zz) % p
+            dbl_z = 4 * dz * (dx * xx + a * dx * zz + b * dz * zz) % p
+
+            if bit == "1":
+                x0, z0, x1, z1 = add_x, add_z, dbl_x, dbl_z
+            else:
+                x0, z0, x1, z1 = dbl_x, dbl_z, add_x, add_z
+
+        # k*point = O
+        if not z0:
+            return self.aneutral
+        xq = x0 * pow(z0, -1, p) % p
+
+        # (k+1)*point = O, so k*point = -point
+        if not z1:
+            return EllipticCurvePoint(self.field(x), self.field(-y), structure=self)
+        xr = x1 * pow(z1, -1, p) % p
+
+        yq = (b2 + (a + x * xq) * (x + xq) - xr * (x - xq) ** 2) * pow(2 * y, -1, p) % p
+        return EllipticCurvePoint(self.field(xq), self.field(yq), structure=self)
+
+    def _glv_mul(self, point: EllipticCurvePoint, k: int) -> EllipticCurvePoint:
+        """
+        GLV method - k is split into k1 + k2*phi with both halves about sqrt(p) in size,
+        and then k1*point + k2*phi(point) is computed with simultaneous double-and-add (Shamir's trick).
+        """
+        k1, k2 = self.glv_decompose(k)
+        p1, p2 = point, self.endomorphism(point)
+        if k1 < 0:
+            p1, k1 = -p1, -k1
+        if k2 < 0:
+            p2, k2 = -p2, -k2
+
+        table = {(1, 0): p1, (0, 1): p2, (1, 1): p1 + p2}
+        ans = self.aneutral
+        for i in reversed(range(max(k1.bit_length(), k2.bit_length()))):
+            ans = ans + ans
+            bits = (k1 >> i & 1, k2 >> i & 1)
+            if bits != (0, 0):
+                ans += table[bits]
+        return ans
+
+    def sum_points(self, points: Iterable[EllipticCurvePoint]) -> EllipticCurvePoint:
+        """
+        Returns the sum of all the points. They are added pairwise in rounds,
+        every round costs a single inversion no matter how many additions it does.
+        """
+        if not self.field.backend.inline:
+            ans = self.aneutral
+            for point in points:
+                ans += point
+            return ans
+
+        finite = []
+        for point in points:
+            point = self._as_point(point)
+            if not point.is_identity:
+                finite.append((point.value[0].value, point.value[1].value))
+        ans = _batch_affine_sums(self.p, self.a.value, [finite])[0]
+        return self.aneutral if ans is None else self._point(*ans)
+
+    def multi_multiply(self, points: Iterable[EllipticCurvePoint], scalars: Iterable[int]) -> EllipticCurvePoint:
+        """
+        Returns sum of k_i * P_i computed at once with Pippenger's bucket method (Shamir's trick for a few points).
+        Scalars are processed in windows of c bits; in every window each point is added to the bucket
+        of its digit and the buckets are summed with running sums, so the cost is about (bits / c) * (n + 2^c)
+        additions instead of n * bits doublings and additions of separate multiplications.
+        Points are added into the buckets in affine coordinates with inversions shared across all the buckets.
+        """
+        p, a = self.p, self.a.value
+        pairs = []
+        for point, k in zip(points, scalars):
+            point = self._as_point(point)
+            if k < 0:
+                point, k = -point, -k
+            if k and not point.is_identity:
+                pairs.append(((point.value[0].value, point.value[1].value), k))
+        if not pairs:
+            return self.aneutral
+        if not self.field.backend.inline:  # batched affine additions work on raw integers
+            return self.sum_points(self.multiply(self._point(*point), k) for point, k in pairs)
+
+        bits = max(k.bit_length() for _, k in pairs)
+
+        # few points - Shamir's trick with the table of all subset sums is cheaper than buckets
+        if len(pairs) <= MSM_SHAMIR_MAX_POINTS:
+            table = [None]
+            for point, _ in pairs:
+                table += [_affine_add(p, a, entry, point) for entry in table]
+            ans = None
+            for i in reversed(range(bits)):
+                ans = _affine_add(p, a, ans, ans)
+                index = sum(1 << j for j, (_, k) in enumerate(pairs) if k >> i & 1)
+                ans = _affine_add(p, a, ans, table[index])
+            return self.aneutral if ans is None else self._point(*ans)
+
+        c = max(2, min(MSM_MAX_WINDOW, len(pairs).bit_length() - 2))
+        mask = (1 << c) - 1
+
+        ans = None
+        for shift in reversed(range(0, bits, c)):
+            for _ in range(c):
+                ans = _affine_add(p, a, ans, ans)
+
+            groups = [[] for _ in range(mask + 1)]
+            for point, k in pairs:
+                groups[k >> shift & mask].append(point)
+            buckets = _batch_affine_sums(p, a, groups)
+
+            # sum of digit * bucket[digit]
+            running = total = None
+            for digit in range(mask, 0, -1):
+                running = _affine_add(p, a, running, buckets[digit])
+                total = _affine_add(p, a, total, running)
+            ans = _affine_add(p, a, ans, total)
+
+        return self.aneutral if ans is None else self._point(*ans)
+
+    def glv_decompose(self, k: int) -> tuple[int, int]:
+        """
+        Returns (k1, k2) such that k*P = k1*P + k2*phi(P) for every point P of the curve.
+
+        Frobenius endomorphism pi acts as identity on the curve, so (pi - 1) = mu kills every point
+        and k can be reduced modulo mu in Z[phi] - the remainder is the closest lattice point to k/mu.
+        """
+        c1, c0, mu, _ = self.glv_parameters
+        x, y = mu
+        norm = x * x - c1 * x * y + c0 * y * y
+        n1, n2 = _ring_conjugate(mu, c1)
+        q1 = (2 * k * n1 + norm) // (2 * norm)
+        q2 = (2 * k * n2 + norm) // (2 * norm)
+        r1, r2 = _ring_mul((q1, q2), mu, c1, c0)
+        return k - r1, -r2
+
+    def endomorphism(self, point: EllipticCurvePoint) -> EllipticCurvePoint:
+        """
+        Efficiently computable endomorphism phi of the curve:
+        (x, y) -> (beta*x, y) for a = 0 where beta^3 = 1, and (x, y) -> (-x, i*y) for b = 0 where i^2 = -1
+        """
+        assert self.glv_parameters is not None, f"{self} has no efficient endomorphism"
+        if point.is_identity:
+            return point
+        constant = self.glv_parameters[3]
+        if self.a == 0:
+            return EllipticCurvePoint(point.x * constant, point.y, structure=self)
+        return EllipticCurvePoint(-point.x, point.y * constant, structure=self)
+
+    @property
+    def j_invariant(self) -> FieldElement:
+        """j = 1728 * 4a^3 / (4a^3 + 27b^2)"""
+        a3 = 4 * self.a ** 3
+        return 1728 * a3 / (a3 + 27 * self.b ** 2)
+
+    @property
+    def has_efficient_endomorphism(self) -> bool:
+        """
+        Curves with j = 0 (a = 0, p = 1 mod 3) or j = 1728 (b = 0, p = 1 mod 4) have an endomorphism
+        of order 3 or 4 respectively, which can be used by GLV scalar multiplication.
+        """
+        p = self.p
+        return p > 3 and ((self.a == 0 and p % 3 == 1) or (self.b == 0 and p % 4 == 1))
+
+    @property
+    def glv_parameters(self) -> tuple[int, int, tuple[int, int], FieldElement] | None:
+        """
+        Returns (c1, c0, mu, constant) where phi^2 + c1*phi + c0 = 0, mu = (pi - 1) in Z[phi] and
+        constant is beta or i defining the endomorphism, or None if the curve doesn't support GLV.
+        """
+        if self.__glv__ is None:
+            with PRECOMPUTATION_LOCK:
+                if self.__glv__ is None and self.precomputation_cache is not None:
+                    self.precomputation_cache.load_curve(self)
+                if self.__glv__ is None:
+                    self.__glv__ = self._find_glv_parameters() or ()
+                    if self.precomputation_cache is not None:
+                        self.precomputation_cache.store_curve(self)
+        return self.__glv__ or None
+
+    @property
+    def order(self) -> int | None:
+        """
+        Number of points of the curve (including the point at infinity) if it's known from the GLV parameters,
+        None otherwise
+        """
+        if self.glv_parameters is None:
+            return None
+        c1, c0, (x, y), _ = self.glv_parameters
+        return x * x - c1 * x * y + c0 * y * y
+
+    def _find_glv_parameters(self) -> tuple[int, int, tuple[int, int], FieldElement] | None:
+        if not self.has_efficient_endomorphism:
+            return None
+
+        # pi has norm p in Z[phi], so it's one of the associates of the solution of norm equation or its conjugate
+        p = self.p
+        if self.a == 0:
+            c1, c0 = 1, 1
+            constant = (self.field(-3).sqrt - 1) / 2  # primitive cube root of unity
+            x, y = cornacchia(3, p)
+            pi = (x + y, 2 * y)  # x + y*sqrt(-3), where sqrt(-3) = 1 + 2*omega
+            unit, units_count = (0, -1), 6  # -omega generates all units
+        else:
+            c1, c0 = 0, 1
+            constant = self.field(-1).sqrt
+            pi = cornacchia(1, p)
+            unit, units_count = (0, 1), 4  # i
+
+        candidates = []
+        for start in (pi, _ring_conjugate(pi, c1)):
+            for _ in range(units_count):
+                start = _ring_mul(start, unit, c1, c0)
+                candidates.append((start[0] - 1, start[1]))
+
+        # looking for the one which kills every point
+        for _ in range(GLV_FROBENIUS_CHECKS):
+            point = self.get_random_point()
+            image = EllipticCurvePoint(point.x * constant, point.y, structure=self) if self.a == 0 \
+                else EllipticCurvePoint(-point.x, point.y * constant, structure=self)
+            candidates = [(u, v) for u, v in candidates
+                          if (self.multiply(point, u, "binary") + self.multiply(image, v, "binary")).is_identity]
+
+        if len(candidates) != 1:
+            return None
+        return c1, c0, candidates[0], constant
+
+    @property
+    def map_to_curve_constants(self) -> tuple:
+        """
+        Constants of the deterministic map to curve (RFC 9380, section 6.6):
+        ("sswu", Z, -B/A, B/(Z*A)) for the simplified Shallue-van de Woestijne-Ulas map when a*b != 0,
+        ("svdw", Z, c1, c2, c3, c4) for the Shallue-van de Woestijne map otherwise.
+        """
+        if self.__map_constants__ is None:
+            with PRECOMPUTATION_LOCK:
+                if self.__map_constants__ is None:
+                    self.__map_constants__ = self._find_map_constants()
+        return self.__map_constants__
+
+    def _find_map_constants(self) -> tuple:
+        assert self.p > 3, "map to curve is defined only for p > 3"
+        field, p, a, b = self.field, self.p, self.a.value, self.b.value
+        g = lambda x: ((x * x + a) * x + b) % p
+        is_square = lambda x: field.legendre_symbol(x) >= 0
+        candidates = lambda: (z for i in range(1, (p + 1) // 2) for z in (i, p - i))  # 1, -1, 2, -2, ...
+
+        # Z must be a non-square different from -1, B/(Z*A) being the image of exceptional inputs
+        if a and b:
+            for z in candidates():
+                exceptional = b * pow(z * a, -1, p) % p
+                if field.legendre_symbol(z) == -1 and z != p - 1 and is_square(g(exceptional)):
+                    return "sswu", z, -b * pow(a, -1, p) % p, exceptional
+
+        # SSWU isn't applicable, generic map works for every curve
+        for z in candidates():
+            gz, h = g(z), (3 * z * z + 4 * a) % p
+            if not gz or not h or not is_square(-h * pow(4 * gz, -1, p)):
+                continue
+            if not (is_square(gz) or is_square(g(-z * pow(2, -1, p)))):
+                continue
+            c3 = field.sqrt(field(-gz * h)).value
+            c3 = p - c3 if c3 & 1 else c3  # sgn0(c3) = 0
+            return "svdw", z, gz, -z * pow(2, -1, p) % p, c3, -4 * gz * pow(h, -1, p) % p
+        raise RuntimeError(f"Cannot find the constants of the map to {self}")
+
+    def map_to_curve(self, u: FieldElement | int) -> EllipticCurvePoint:
+        """
+        Deterministic map of a field element to a curve point (RFC 9380, section 6.6).
+        Every input costs the same fixed sequence of field operations: a single inversion,
+        2 or 3 Legendre symbols and a single square root, there's no retry loop.
+        Sign of y matches the parity of u, so u and -u are mapped to opposite points.
+        """
+        x, y = self.__map__(self.field(u).value)
+        return self._point(x, y)
+
+    def __map__(self, u: int) -> tuple[int, int]:
+        if self.map_to_curve_constants[0] == "sswu":
+            x, gx, _ = self.__sswu_x__(self.map_to_curve_constants[1] * u * u % self.p)
+        else:
+            x, gx = self.__svdw_x__(u)
+        y = self.field.sqrt(self.field(gx)).value
+        if y & 1 != u & 1:
+            y = -y % self.p
+        return x, y
+
+    def __sswu_x__(self, t: int) -> tuple[int, int, int]:
+        """
+        x and g(x) of the simplified SWU map for t = Z*u^2 and the root r of the first branch with x = K(1 + 1/(r^2 + r)):
+        r = t when g(x1(t)) is a square, otherwise r = 1/t as the second branch is x2(t) = t*x1(t) = x1(1/t)
+        """
+        p, a, b = self.p, self.a.value, self.b.value
+        g = lambda x: ((x * x + a) * x + b) % p
+        _, z, k, exceptional = self.map_to_curve_constants
+        tv1 = (t * t + t) % p
+        x1 = k * (1 + pow(tv1, -1, p)) % p if tv1 else exceptional
+        gx1 = g(x1)
+        if self.field.legendre_symbol(gx1) >= 0:
+            return x1, gx1, t
+        x2 = t * x1 % p
+        return x2, g(x2), pow(t, -1, p)
+
+    def __svdw_x__(self, u: int) -> tuple[int, int]:
+        """x and g(x) of the Shallue-van de Woestijne map"""
+        field, p, a, b = self.field, self.p, self.a.value, self.b.value
+        g = lambda x: ((x * x + a) * x + b) % p
+        _, z, c1, c2, c3, c4 = self.map_to_curve_constants
+        tv1 = u * u * c1 % p
+        tv2, tv1 = (1 + tv1) % p, (1 - tv1) % p
+        tv3 = tv1 * tv2 % p
+        tv3 = pow(tv3, -1, p) if tv3 else 0
+        tv4 = u * tv1 * tv3 * c3 % p
+        for x in ((c2 - tv4) % p, (c2 + tv4) % p):
+            gx = g(x)
+            if field.legendre_symbol(gx) >= 0:
+                return x, gx
+        x3 = tv2 * tv2 * tv3 % p
+        x3 = (x3 * x3 * c4 + z) % p
+        return x3, g(x3)
+
+    def __sswu_roots__(self, x: int, y: int) -> set[int]:
+        """
+        All non-zero t = Z*u^2 mapped to the point (x, y) by the simplified SWU map: the non-square roots r
+        of r^2 + r = 1/(x/K - 1) and, unless y = 0, their inverses. Costs a single square root.
+        """
+        field, p = self.field, self.p
+        _, z, k, exceptional = self.map_to_curve_constants
+        ts = {p - 1} if x == exceptional and field.legendre_symbol(p - 1) == -1 else set()
+        w = (x * pow(k, -1, p) - 1) % p
+        if w:
+            for r in _quadratic_roots(1, 1, -pow(w, -1, p), field):
+                if field.legendre_symbol(r) == -1:
+                    # g(x1(1/r)) = g(x)*r^3 is a non-square, so 1/r takes the second branch to x as well
+                    ts |= {r, pow(r, -1, p)} if y else {r}
+        return ts
+
+    def __svdw_preimages__(self, x: int, y: int) -> set[int]:
+        """
+        All u mapped to the point (x, y) by the Shallue-van de Woestijne map, found by solving the equation
+        of each branch for u (at most 3 square roots) and checked by computing x of the map without a square root
+        """
+        field, p = self.field, self.p
+        _, z, c1, c2, c3, c4 = self.map_to_curve_constants
+        inverse_c1 = pow(c1, -1, p)
+        candidates = {0}
+
+        # x = c2 -+ u*c3/(1 + c1*u^2), so d*c1*u^2 +- c3*u + d = 0 where d = x - c2, both share the discriminant
+        d = (x - c2) % p
+        if d:
+            root = field.sqrt(field(c3 * c3 - 4 * d * d * c1))
+            if root is not None:
+                inverse = pow(2 * d * c1, -1, p)
+                candidates |= {(sign * c3 + r) * inverse % p for sign in (1, -1) for r in (root.value, -root.value)}
+
+        # x = c4*w^2 + Z where w = (1 + s)/(1 - s), s = c1*u^2, exceptional inputs with s = +-1 are mapped to c2 or Z
+        squares = [inverse_c1, p - inverse_c1] if x in (c2, z) else []
+        w = field.sqrt(field((x - z) * pow(c4, -1, p)))
+        if w is not None:
+            squares += [(v - 1) * pow(v + 1, -1, p) * inverse_c1 % p for v in {w.value, -w.value % p} if (v + 1) % p]
+        for square in squares:
+            root = field.sqrt(field(square))
+            if root is not None:
+                candidates |= {root.value, -root.value % p}
+
+        return {u for u in candidates if (not y or u & 1 == y & 1) and self.__svdw_x__(u)[0] == x}
+
+    def map_to_curve_preimages(self, point: EllipticCurvePoint) -> list[int]:
+        """
+        Returns all u (in increasing order) such that map_to_curve(u) == point.
+        The map is inverted directly: equations of its branches are solved for u and the parity of y fixes the sign of u,
+        so a fixed number of square roots is taken and the map itself is never recomputed.
+        """
+        point = self._as_point(point)
+        if point.is_identity:
+            return []
+        field, p = self.field, self.p
+        x, y = point.value[0].value, point.value[1].value
+        constants = self.map_to_curve_constants
+        if constants[0] == "svdw":
+            return sorted(self.__svdw_preimages__(x, y))
+
+        # u = +-sqrt(t/Z), t = 0 is the exceptional input u = 0 mapped to B/(Z*A)
+        z, exceptional = constants[1], constants[3]
+        preimages = {0} if x == exceptional and not y & 1 else set()
+        for t in self.__sswu_roots__(x, y):
+            root = field.sqrt(field(t * pow(z, -1, p))).value
+            preimages |= {u for u in (root, -root % p) if not y or u & 1 == y & 1}
+        return sorted(preimages)
+
+    def embed_value(self, v: FieldElement | int) -> EllipticCurvePoint:
+        """
+        Embeds a non-zero field element into a point, reversed by embedded_values. On curves with a*b != 0
+        t = v (non-squares) or t = Z*v (squares) is mapped by the simplified SWU map and y is odd for squares,
+        so the embedding takes a single square root, other curves use map_to_curve(v).
+        """
+        v = self.field(v).value
+        assert v, "zero can't be embedded"
+        if self.map_to_curve_constants[0] == "svdw":
+            return self.map_to_curve(v)
+        square = self.field.legendre_symbol(v) == 1
+        x, gx, _ = self.__sswu_x__(self.map_to_curve_constants[1] * v % self.p if square else v)
+        y = self.field.sqrt(self.field(gx)).value
+        if y & 1 != square:
+            y = -y % self.p
+        return self._point(x, y)
+
+    def embedded_values(self, point: EllipticCurvePoint) -> list[int]:
+        """Returns all v (in increasing order) such that embed_value(v) == point, a single square root on curves with a*b != 0"""
+        point = self._as_point(point)
+        if point.is_identity:
+            return []
+        if self.map_to_curve_constants[0] == "svdw":
+            return [v for v in self.map_to_curve_preimages(point) if v]
+        x, y = point.value[0].value, point.value[1].value
+        return self.__embedded_values__(self.__sswu_roots__(x, y), y == 0, y & 1)
+
+    def __embedded_values__(self, ts: Iterable[int], both: bool, square: int) -> list[int]:
+        """Values v embedded through the non-square t: v = t for odd y, v = t/Z for even y (both when y = 0)"""
+        inverse_z = pow(self.map_to_curve_constants[1], -1, self.p)
+        return sorted({t * inverse_z % self.p if s else t for t in ts for s in ({0, 1} if both else {square})})
+
+    def embedding_class(self, v: FieldElement | int) -> list[int]:
+        """
+        Returns all values embedded into the same point as v (v included, in increasing order).
+        On curves with a*b != 0 they are found without computing the point or any square root:
+        the roots of r^2 + r = q come in pairs r, -1 - r (unless x is the exceptional B/(Z*A)).
+        """
+        v = self.field(v).value
+        if self.map_to_curve_constants[0] == "svdw":
+            return self.embedded_values(self.embed_value(v))
+        field, p = self.field, self.p
+        z, exceptional = self.map_to_curve_constants[1], self.map_to_curve_constants[3]
+        square = field.legendre_symbol(v) == 1
+        x, gx, r = self.__sswu_x__(z * v % p if square else v)
+        if x == exceptional:
+            return self.embedded_values(self.embed_value(v))
+        roots = {root for root in (r, (-1 - r) % p) if field.legendre_symbol(root) == -1}
+        ts = roots | {pow(root, -1, p) for root in roots} if gx else roots
+        return self.__embedded_values__(ts, gx == 0, square)
+
+    def hash_to_curve(self, data: bytes, dst: bytes = HASH_TO_CURVE_DST) -> EllipticCurvePoint:
+        """
+        Hashes the data to a curve point as map(u0) + map(u1) with u0, u1 derived from SHA-256 of the data,
+        so the result can be used as a random oracle (the discrete log of the point is unknown).
+        """
+        length = (self.p.bit_length() + HASH_TO_FIELD_EXTRA_BITS + 7) // 8
+        prefix = len(dst).to_bytes(1, "big") + dst + data
+        stream = b"".join(hashlib.sha256(prefix + counter.to_bytes(4, "big")).digest()
+                          for counter in range(-(-2 * length // 32)))
+        u0 = int.from_bytes(stream[:length], "big") % self.p
+        u1 = int.from_bytes(stream[length:2 * length], "big") % self.p
+        return self.map_to_curve(u0) + self.map_to_curve(u1)
+
     @override
     def sqrt(self, element: EllipticCurvePoint) -> EllipticCurvePoint | None:
         raise NotImplementedError
 
     @property
     def aneutral(self) -> EllipticCurvePoint:
-        """neutral element of addition"""
-        return EllipticCurvePoint(0, structure=self)
+        """neutral element of addition (the point at infinity)"""
+        return self.__identity__
 
     @property
     def mneutral(self) -> EllipticCurvePoint:
@@ -0,0 +1,187 @@
+"""
+Exponential (additively homomorphic) ElGamal on elliptic curves.
+
+Message m is encoded as the point m * alpha, so ciphertexts of m1 and m2 add up to a ciphertext of m1 + m2
+and can be aggregated without decrypting. Decryption gives m * alpha back, m is then found
+with the baby-step giant-step algorithm, which is feasible only for small totals (counters, votes, metrics).
+
+Usage:
+    alpha, beta, pk = elgamal_genkey(p)
+    total = aggregate(exp_elgamal_encrypt(vote, alpha, beta) for vote in votes)
+    exp_elgamal_decrypt(total, pk, DiscreteLogTable(alpha, len(votes)))
+"""
+from __future__ import annotations
+
+import hashlib
+import secrets
+from itertools import islice
+from math import isqrt
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.elgamal import *
+
+AGGREGATE_CHUNK_SIZE = 1 << 14  # number of ciphertexts summed at once by aggregate, bounds its memory usage
+
+
+class ExpElGamalCiphertext:
+    """
+    Pair of points (c1, c2) = (r * alpha, m * alpha + r * beta).
+    Supports addition of ciphertexts, subtraction, negation and multiplication by an integer.
+    """
+    __slots__ = ("c1", "c2")
+
+    def __init__(self, c1: EllipticCurvePoint, c2: EllipticCurvePoint):
+        assert c1.curve == c2.curve, "points must belong to the same curve"
+        self.c1 = c1
+        self.c2 = c2
+
+    def __add__(self, other):
+        if not isinstance(other, ExpElGamalCiphertext):
+            raise NotImplementedError(f"Addition is undefined for types: {type(self)}, {type(other)}")
+        return ExpElGamalCiphertext(self.c1 + other.c1, self.c2 + other.c2)
+
+    def __radd__(self, other):
+        # sum() starts with 0
+        if isinstance(other, int) and other == 0:
+            return self
+        return self + other
+
+    def __neg__(self):
+        return ExpElGamalCiphertext(-self.c1, -self.c2)
+
+    def __sub__(self, other):
+        return self + -other
+
+    def __mul__(self, k: int):
+        if not isinstance(k, int):
+            raise NotImplementedError(f"Multiplication is undefined for types: {type(self)}, {type(k)}")
+        curve = self.curve
+        return ExpElGamalCiphertext(curve.multiply(self.c1, k), curve.multiply(self.c2, k))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return isinstance(other, ExpElGamalCiphertext) and self.c1 == other.c1 and self.c2 == other.c2
+
+    def __iter__(self):
+        return iter((self.c1, self.c2))
+
+    def __str__(self):
+        return f"<ExpElGamal: {self.c1}, {self.c2}>"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def curve(self) -> EllipticCurve:
+        return self.c1.curve
+
+
+def exp_elgamal_encrypt(message: int,
+                        alpha: EllipticCurvePoint,
+                        beta: EllipticCurvePoint,
+                        r: int = None) -> ExpElGamalCiphertext:
+    """
+    Encrypts an integer message with the public key (alpha, beta) from elgamal_genkey.
+    Messages and their totals must be smaller than the order of alpha.
+
+    :param r: randomness of the encryption, by default it's drawn from the operating system CSPRNG
+    """
+    curve = alpha.curve
+    assert isinstance(message, int), "message must be an integer"
+    assert curve == beta.curve, "points must belong to the same curve"
+
+    if r is None:
+        r = secrets.randbelow(curve.p - 1) + 1
+    return ExpElGamalCiphertext(curve.multiply(alpha, r), curve.multi_multiply((alpha, beta), (message, r)))
+
+
+def aggregate(ciphertexts: Iterable[ExpElGamalCiphertext]) -> ExpElGamalCiphertext | None:
+    """
+    Returns the sum of all ciphertexts (None if there are none) which is a ciphertext of the sum of messages.
+    Ciphertexts are consumed in chunks, each chunk is summed with batched point additions (EllipticCurve.sum_points).
+    """
+    iterator = iter(ciphertexts)
+    ans = None
+    while chunk := list(islice(iterator, AGGREGATE_CHUNK_SIZE)):
+        curve = chunk[0].curve
+        if ans is not None:
+            chunk.append(ans)
+        ans = ExpElGamalCiphertext(curve.sum_points(c.c1 for c in chunk), curve.sum_points(c.c2 for c in chunk))
+    return ans
+
+
+class DiscreteLogTable:
+    """
+    Baby-step giant-step table solving m * alpha = Q for 0 <= m <= max_value.
+    Baby steps j * alpha for |j| <= size are stored by x coordinate only (j and -j share it),
+    so every giant step covers 2 * size + 1 values. Building the table takes size additions
+    (or a load from the precomputation cache of the curve), every lookup at most max_value / (2 * size + 1) additions. The table is reusable for any number of lookups.
+    """
+
+    def __init__(self, alpha: EllipticCurvePoint, max_value: int, size: int = None):
+        """
+        :param size: number of baby steps, sqrt(max_value) / 2 by default which balances the table and lookup costs
+        """
+        assert isinstance(max_value, int) and max_value >= 0, "max_value must be a non-negative integer"
+        self.alpha = alpha
+        self.max_value = max_value
+        self.size = size or isqrt(max_value) // 2 + 1
+        curve = alpha.curve
+
+        self.__baby_steps__ = {}
+        for j, (x, y) in enumerate(self.__multiples__(), 1):
+            self.__baby_steps__.setdefault(x, (j, y))
+        self.__giant_step__ = -curve.multiply(alpha, 2 * self.size + 1)
+        self.__offset__ = -curve.multiply(alpha, self.size)
+
+    def __multiples__(self) -> list[tuple[int, int]]:
+        """
+        Coordinates of j * alpha for 1 <= j <= size. They are loaded from the precomputation cache of the curve
+        if a table at least that long was stored for alpha (and its last needed entry is right), otherwise computed and stored.
+        """
+        alpha, curve = self.alpha, self.alpha.curve
+        cache = curve.precomputation_cache
+        name = "baby_steps_" + hashlib.sha256(f"{alpha.x.value}:{alpha.y.value}".encode()).hexdigest()[:32]
+        table = cache.load_table(curve, name) if cache is not None else None
+        if table is not None and len(table) >= 2 * self.size:
+            values = table[:2 * self.size]
+            multiples = list(zip(values[0::2], values[1::2]))
+            last = curve.multiply(alpha, self.size)
+            if multiples[0] == (alpha.x.value, alpha.y.value) and not last.is_identity and multiples[-1] == (last.x.value, last.y.value):
+                return multiples
+
+        multiples = []
+        point = alpha
+        for j in range(1, self.size + 1):
+            if point.is_identity:
+                raise AttributeError(f"order of {alpha} is too small for the table")
+            multiples.append((point.x.value, point.y.value))
+            point = point + alpha
+        if cache is not None:
+            cache.store_table(curve, name, [value for xy in multiples for value in xy])
+        return multiples
+
+    def log(self, point: EllipticCurvePoint) -> int | None:
+        """Returns m from [0, max_value] such that m * alpha = point or None if there's no such m"""
+        point = point + self.__offset__  # now m - size is looked for, which is in [-size, size] at the first step
+        for i in range(self.max_value // (2 * self.size + 1) + 1):
+            base = self.size + i * (2 * self.size + 1)
+            if point.is_identity:
+                t = 0
+            elif point.x.value in self.__baby_steps__:
+                j, y = self.__baby_steps__[point.x.value]
+                t = j if point.y.value == y else -j
+            else:
+                point = point + self.__giant_step__
+                continue
+            return base + t if 0 <= base + t <= self.max_value else None
+        return None
+
+
+def exp_elgamal_decrypt(ciphertext: ExpElGamalCiphertext, pk: int, table: DiscreteLogTable) -> int | None:
+    """Decrypts the ciphertext with the private key, returns None if the message exceeds the table range"""
+    c1, c2 = ciphertext
+    curve = c1.curve
+    return table.log(c2 - curve.multiply(c1, pk, "ladder"))
@@ -0,0 +1,161 @@
+"""
+Pool of ElGamal key pairs pregenerated in the background, so bursts of key requests don't wait for elgamal_genkey.
+
+Usage:
+    with KeyPool(2 ** 127 - 1, high_water=1024, low_water=256) as pool:
+        alpha, beta, pk = pool.get()
+        pool.stats()  # hit rate and refill latency
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.elgamal import *
+
+KEYPOOL_HIGH_WATER = 256  # default number of keys the pool is filled up to
+KEYPOOL_LOW_WATER = 64  # default number of keys below which a refill starts
+KEYPOOL_CHUNK_SIZE = 16  # number of keys generated by a single background task
+
+
+def _generate_keys(p: int, count: int, search: bool) -> list[tuple[EllipticCurvePoint, EllipticCurvePoint, int]]:
+    return [elgamal_genkey(p, search) for _ in range(count)]
+
+
+class KeyPool:
+    """
+    Key pairs of elgamal_genkey generated by background workers. The pool is filled up to the high water mark
+    and refilled again when the number of ready and requested keys drops below the low water mark.
+    get hands out a ready key in O(1) or, when the pool is empty, generates one on the caller's thread (a miss).
+
+    Workers are a thread pool by default; pass a ProcessPoolExecutor to generate keys in parallel
+    (keys are picklable). The pool can be shared between threads.
+    """
+
+    def __init__(self,
+                 p: int,
+                 high_water: int = KEYPOOL_HIGH_WATER,
+                 low_water: int = KEYPOOL_LOW_WATER,
+                 search: bool = False,
+                 *,
+                 executor: Executor | None = None,
+                 max_workers: int | None = 1,
+                 chunk_size: int = KEYPOOL_CHUNK_SIZE):
+        """
+        :param search: generate keys on curves of prime order, see elgamal_genkey
+        :param executor: executor running the refills, a new thread pool with max_workers threads by default
+        """
+        assert 0 < low_water < high_water, "low water mark must be positive and less than the high water mark"
+        assert chunk_size > 0, "chunk size must be positive"
+        self.p, self.high_water, self.low_water, self.search = p, high_water, low_water, search
+        self.chunk_size = chunk_size
+        self.__own_executor__ = executor is None
+        self.__executor__ = executor or ThreadPoolExecutor(max_workers)
+        self.__keys__ = deque()
+        self.__requested__ = 0  # keys being generated by the workers
+        self.__lock__ = threading.Lock()
+        self.__closed__ = False
+        self.__hits__ = self.__misses__ = 0
+        self.__refills__ = 0  # finished background tasks
+        self.__refill_seconds__ = 0.0  # total time from the request of a chunk to its arrival
+        self.__max_refill_seconds__ = 0.0
+        self.__failures__ = 0  # failed background tasks
+        self.__error__ = None  # exception of the last failed task not reported by get yet
+        self.__refill__()
+
+    def __refill__(self) -> None:
+        """Requests keys up to the high water mark if the pool is below the low water mark"""
+        with self.__lock__:
+            available = len(self.__keys__) + self.__requested__
+            if self.__closed__ or available >= self.low_water:
+                return
+            missing = self.high_water - available
+            self.__requested__ += missing
+        for start in range(0, missing, self.chunk_size):
+            count, started = min(self.chunk_size, missing - start), time.perf_counter()
+            future = self.__executor__.submit(_generate_keys, self.p, count, self.search)
+            future.add_done_callback(lambda done, count=count, started=started: self.__arrived__(done, count, started))
+
+    def __arrived__(self, future: Future, count: int, started: float) -> None:
+        """Stores a finished chunk, failed ones are dropped (and requested again) and their error is kept for get"""
+        elapsed = time.perf_counter() - started
+        error = None if future.cancelled() else future.exception()
+        keys = [] if future.cancelled() or error is not None else future.result()
+        with self.__lock__:
+            if error is not None:
+                self.__failures__ += 1
+                self.__error__ = error
+            self.__keys__.extend(keys)
+            self.__requested__ -= count
+            self.__refills__ += 1
+            self.__refill_seconds__ += elapsed
+            self.__max_refill_seconds__ = max(self.__max_refill_seconds__, elapsed)
+
+    def get(self) -> tuple[EllipticCurvePoint, EllipticCurvePoint, int]:
+        """
+        Returns a key pair (alpha, beta, pk), each one is handed out once.
+        If a background task failed since the last call, RuntimeError caused by its exception is raised instead
+        (once per failure, the pool keeps refilling).
+        """
+        with self.__lock__:
+            error, self.__error__ = self.__error__, None
+        if error is not None:
+            raise RuntimeError("background key generation failed") from error
+        try:
+            key = self.__keys__.popleft()
+        except IndexError:
+            key = None
+        with self.__lock__:
+            if key is None:
+                self.__misses__ += 1
+            else:
+                self.__hits__ += 1
+        self.__refill__()
+        return key if key is not None else elgamal_genkey(self.p, self.search)
+
+    def __len__(self) -> int:
+        """Number of ready keys"""
+        return len(self.__keys__)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns hits and misses of get, the hit rate (0 before the first request), number of finished
+        and failed refill tasks and their mean and maximal latency in seconds (from the request of a chunk of keys
+        to its arrival)
+        """
+        with self.__lock__:
+            requests = self.__hits__ + self.__misses__
+            return {
+                "hits": self.__hits__,
+                "misses": self.__misses__,
+                "hit_rate": self.__hits__ / requests if requests else 0.0,
+                "ready": len(self.__keys__),
+                "requested": self.__requested__,
+                "refills": self.__refills__,
+                "failures": self.__failures__,
+                "mean_refill_seconds": self.__refill_seconds__ / self.__refills__ if self.__refills__ else 0.0,
+                "max_refill_seconds": self.__max_refill_seconds__,
+            }
+
+    def close(self) -> None:
+        """Stops refilling, pending chunks of the own executor are cancelled"""
+        with self.__lock__:
+            self.__closed__ = True
+        if self.__own_executor__:
+            self.__executor__.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> KeyPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self):
+        return f"KeyPool(F_{self.p}, {len(self)}/{self.high_water} keys)"
+
+    def __repr__(self):
+        return str(self)
@@ -0,0 +1,211 @@
+"""
+Lazy arithmetic in Fp.
+
+Operators on lazy elements don't compute anything, they build an expression DAG which is evaluated on demand:
+    lazy = LazyField(Fp(p))
+    x, y = lazy(3), lazy(5)
+    slope = (3 * x ** 2 + a) / (2 * y)
+    slope.evaluate()  # <F_p: ...>
+
+Evaluation avoids most of the per-operator costs of eager FieldElement arithmetic:
+    - no intermediate FieldElement objects are created;
+    - additions, subtractions and negations are not reduced modulo p, only products are;
+    - structurally equal subexpressions are the same node (hash-consing), so they are computed once;
+    - every node is evaluated as a fraction, thus sums of quotients share a single inversion at the end,
+      and LazyField.evaluate shares that inversion between any number of expressions (Montgomery's trick).
+"""
+from __future__ import annotations
+
+import weakref
+
+from abstractAlgebra.structures import *
+
+COMMUTATIVE_OPERATIONS = ("add", "mul")
+
+
+class LazyElement:
+    """
+    Node of the expression DAG. Must be created only by LazyField which guarantees uniqueness of the nodes.
+    """
+    __slots__ = ("lazy_field", "operation", "args", "operands", "fraction", "__weakref__")
+
+    def __init__(self, lazy_field: LazyField, operation: str, args: tuple):
+        self.lazy_field = lazy_field
+        self.operation = operation
+        self.args = args
+        self.operands = tuple(arg for arg in args if isinstance(arg, LazyElement))
+        self.fraction = (args[0], 1) if operation == "value" else None  # (numerator, denominator) once evaluated
+
+    def __add__(self, other):
+        return self.lazy_field.node("add", self, other)
+
+    def __radd__(self, other):
+        return self.lazy_field.node("add", other, self)
+
+    def __sub__(self, other):
+        return self.lazy_field.node("sub", self, other)
+
+    def __rsub__(self, other):
+        return self.lazy_field.node("sub", other, self)
+
+    def __mul__(self, other):
+        return self.lazy_field.node("mul", self, other)
+
+    def __rmul__(self, other):
+        return self.lazy_field.node("mul", other, self)
+
+    def __truediv__(self, other):
+        return self.lazy_field.node("div", self, other)
+
+    def __rtruediv__(self, other):
+        return self.lazy_field.node("div", other, self)
+
+    def __pow__(self, power, modulo=None):
+        assert modulo is None, "modulo isn't supported by lazy elements"
+        if not isinstance(power, int):
+            raise NotImplementedError(f"Unknown type of power: {type(power)}")
+        return self.lazy_field.node("pow", self, power)
+
+    def __neg__(self):
+        return self.lazy_field.node("neg", self)
+
+    def __str__(self):
+        if self.operation == "value":
+            return str(self.args[0])
+        if self.operation == "neg":
+            return f"-{self.args[0]}"
+        symbol = {"add": "+", "sub": "-", "mul": "*", "div": "/", "pow": "**"}[self.operation]
+        return f"({self.args[0]} {symbol} {self.args[1]})"
+
+    def __repr__(self):
+        return f"<lazy {self.lazy_field.field.name}: {self}>"
+
+    @property
+    def inverse(self) -> LazyElement:
+        return self.lazy_field.node("pow", self, -1)
+
+    def evaluate(self) -> FieldElement:
+        """Computes the value of the expression, raises ZeroDivisionError when dividing by zero"""
+        return self.lazy_field.evaluate(self)[0]
+
+
+class LazyField:
+    """
+    Factory of lazy elements of the given Fp.
+    All nodes ever created by it are kept in a weak table, so equal expressions built in different places
+    are a single node while unused ones are freed.
+    """
+
+    def __init__(self, field: Fp):
+        assert isinstance(field, Fp), "lazy evaluation is supported only for Fp fields"
+        self.field = field
+        self.__nodes__ = weakref.WeakValueDictionary()
+
+    def __call__(self, value: int | FieldElement | LazyElement) -> LazyElement:
+        if isinstance(value, LazyElement):
+            if value.lazy_field is not self:
+                raise AttributeError(f"cannot use lazy element of another field: {value.lazy_field.field.name}")
+            return value
+        return self.__intern__("value", self.field(value).value)
+
+    def __intern__(self, operation: str, a: Any, b: Any = None) -> LazyElement:
+        key = (operation, id(a) if operation != "value" else a, b if operation == "pow" else id(b))
+        node = self.__nodes__.get(key)
+        if node is None:
+            node = LazyElement(self, operation, (a,) if b is None else (a, b))
+            self.__nodes__[key] = node
+        return node
+
+    def node(self, operation: str, a: Any, b: Any = None) -> LazyElement:
+        """Returns the unique node of the given operation over the arguments, folding operations on constants"""
+        if a.__class__ is not LazyElement or a.lazy_field is not self:
+            a = self(a)
+        if operation != "pow" and b is not None and (b.__class__ is not LazyElement or b.lazy_field is not self):
+            b = self(b)
+        if operation in COMMUTATIVE_OPERATIONS and id(b) < id(a):
+            a, b = b, a
+
+        # constants are folded unless an inversion is required
+        if a.operation == "value" and (b is None or operation == "pow" or b.operation == "value"):
+            p, x = self.field.p, a.args[0]
+            if operation == "add":
+                return self.__intern__("value", (x + b.args[0]) % p)
+            if operation == "sub":
+                return self.__intern__("value", (x - b.args[0]) % p)
+            if operation == "mul":
+                return self.__intern__("value", x * b.args[0] % p)
+            if operation == "neg":
+                return self.__intern__("value", -x % p)
+            if operation == "pow" and b >= 0:
+                return self.__intern__("value", pow(x, b, p))
+        return self.__intern__(operation, a, b)
+
+    def evaluate(self, *expressions: LazyElement | FieldElement | int) -> list[FieldElement]:
+        """
+        Computes values of all expressions. Common subexpressions are computed once
+        and all the expressions share a single modular inversion.
+        """
+        field, p = self.field, self.field.p
+        roots = [self(expression) for expression in expressions]
+        self.__fill__(roots)
+
+        # Montgomery's trick: inverting all denominators at once
+        denominators = [root.fraction[1] % p for root in roots]
+        if 0 in denominators:
+            raise ZeroDivisionError("division by zero in the lazy expression")
+        prefix = [1]
+        for den in denominators:
+            prefix.append(prefix[-1] * den % p)
+        inv = pow(prefix[-1], -1, p)
+        ans = [None] * len(roots)
+        for i in range(len(roots) - 1, -1, -1):
+            ans[i] = field(roots[i].fraction[0] * prefix[i] * inv)
+            inv = inv * denominators[i] % p
+        return ans
+
+    def __fill__(self, roots: list[LazyElement]) -> None:
+        """
+        Evaluates every not yet evaluated node reachable from the roots as a (numerator, denominator) pair.
+        Values are remembered by the nodes, which are immutable, so shared subexpressions are never recomputed.
+        Sums with equal denominators neither multiply nor reduce, numerators are reduced only after multiplications.
+        """
+        p = self.field.p
+        stack = [root for root in roots if root.fraction is None]
+        while stack:  # iterative post-order traversal, long chains of operations would exceed the recursion limit
+            node = stack[-1]
+            if node.fraction is not None:
+                stack.pop()
+                continue
+            pending = [operand for operand in node.operands if operand.fraction is None]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+
+            # zero denominators are carried by sums and products, but they would be lost by inversions and x^0,
+            # so an undefined operand or a zero divisor is reported right away
+            operation, args = node.operation, node.args
+            a, b = args[0].fraction
+            if operation == "neg":
+                node.fraction = (-a, b)
+            elif operation == "pow":
+                k = args[1]
+                if b % p == 0 or (k < 0 and a % p == 0):
+                    raise ZeroDivisionError("division by zero in the lazy expression")
+                if k < 0:
+                    a, b, k = b, a, -k
+                node.fraction = (pow(a, k, p), pow(b, k, p))
+            else:
+                c, d = args[1].fraction
+                if operation == "add":
+                    node.fraction = (a + c, b) if b == d else ((a * d + c * b) % p, b * d % p)
+                elif operation == "sub":
+                    node.fraction = (a - c, b) if b == d else ((a * d - c * b) % p, b * d % p)
+                elif operation == "mul":
+                    node.fraction = (a * c % p, b * d % p)
+                elif operation == "div":
+                    if c % p == 0 or d % p == 0:
+                        raise ZeroDivisionError("division by zero in the lazy expression")
+                    node.fraction = (a * d % p, b * c % p)
+                else:
+                    raise NotImplementedError(f"Unknown lazy operation: {operation}")
@@ -0,0 +1,460 @@
+"""
+Dense linear algebra over finite Fp fields.
+Matrices are stored as NumPy arrays of integers: int64 for small primes and object arrays of python integers otherwise.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from abstractAlgebra.structures import *
+
+INT64_MAX_P = 2 ** 31  # primes below this bound are stored in int64 arrays, so a product of 2 entries fits in int64
+FLOAT_EXACT = 2 ** 53  # every integer below this bound is represented exactly by float64
+LIMB_BITS = 16  # entries are split into limbs of this size when a float64 product could lose precision
+LIMB_MASK = (1 << LIMB_BITS) - 1
+BLOCK_SIZE = 256  # width of the column panels eliminated before each trailing matrix update
+PANEL_BASE_SIZE = 16  # panels are split recursively down to this width, then eliminated with row operations
+STRASSEN_THRESHOLD = 1024  # int64 products are split with Strassen's algorithm above this size
+STRASSEN_OBJECT_THRESHOLD = 64  # same for object arrays where every multiply-add is a python operation
+
+
+def _float_matmul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Exact product of 2 int64 matrices, provided that every entry of the result stays below FLOAT_EXACT.
+    Goes through float64 so that the product is computed by BLAS.
+    """
+    return (a.astype(np.float64) @ b.astype(np.float64)).astype(np.int64)
+
+
+def _matmul(a: np.ndarray, b: np.ndarray, p: int) -> np.ndarray:
+    """
+    Returns a @ b (mod p) for matrices with entries in [0, p).
+    Reduction is delayed until the end of every block of the inner dimension that fits in the exact float64 range.
+    """
+    if a.dtype == object:
+        return a.dot(b) % p
+
+    k = a.shape[1]
+    if not k:
+        return np.zeros((a.shape[0], b.shape[1]), dtype=np.int64)
+
+    # small primes - the whole dot product fits in the exact float range
+    if k * (p - 1) ** 2 < FLOAT_EXACT:
+        return _float_matmul(a, b) % p
+
+    # splitting both matrices into 2 limbs and multiplying them with Karatsuba's trick:
+    # a*b = hi*2^(2L) + (mid - hi - lo)*2^L + lo, where mid = (a_hi + a_lo)(b_hi + b_lo)
+    a_hi, a_lo = a >> LIMB_BITS, a & LIMB_MASK
+    b_hi, b_lo = b >> LIMB_BITS, b & LIMB_MASK
+    a_sum, b_sum = a_hi + a_lo, b_hi + b_lo
+    step = max(1, FLOAT_EXACT // (2 * LIMB_MASK + 1) ** 2)
+    hi = lo = mid = 0
+    for s in range(0, k, step):
+        chunk = slice(s, s + step)
+        hi = (hi + _float_matmul(a_hi[:, chunk], b_hi[chunk])) % p
+        lo = (lo + _float_matmul(a_lo[:, chunk], b_lo[chunk])) % p
+        mid = (mid + _float_matmul(a_sum[:, chunk], b_sum[chunk])) % p
+
+    mid = (mid - hi - lo) % p
+    hi = hi * pow(2, 2 * LIMB_BITS, p) % p
+    mid = mid * pow(2, LIMB_BITS, p) % p
+    return (hi + mid + lo) % p
+
+
+def _pad(a: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """Pads the matrix with zeros up to the given shape (np.pad would put numpy integers into object arrays)"""
+    padded = np.zeros((rows, cols), dtype=a.dtype)
+    padded[:a.shape[0], :a.shape[1]] = a
+    return padded
+
+
+def _strassen(a: np.ndarray, b: np.ndarray, p: int, threshold: int) -> np.ndarray:
+    """
+    Returns a @ b (mod p) using Strassen's algorithm for every block larger than the threshold.
+    """
+    m, k = a.shape
+    n = b.shape[1]
+    if min(m, k, n) <= threshold:
+        return _matmul(a, b, p)
+
+    # padding every dimension to an even size
+    m2, k2, n2 = m + m % 2, k + k % 2, n + n % 2
+    if (m2, k2, n2) != (m, k, n):
+        a, b = _pad(a, m2, k2), _pad(b, k2, n2)
+    hm, hk, hn = m2 // 2, k2 // 2, n2 // 2
+    a11, a12, a21, a22 = a[:hm, :hk], a[:hm, hk:], a[hm:, :hk], a[hm:, hk:]
+    b11, b12, b21, b22 = b[:hk, :hn], b[:hk, hn:], b[hk:, :hn], b[hk:, hn:]
+
+    m1 = _strassen((a11 + a22) % p, (b11 + b22) % p, p, threshold)
+    m2_ = _strassen((a21 + a22) % p, b11, p, threshold)
+    m3 = _strassen(a11, (b12 - b22) % p, p, threshold)
+    m4 = _strassen(a22, (b21 - b11) % p, p, threshold)
+    m5 = _strassen((a11 + a12) % p, b22, p, threshold)
+    m6 = _strassen((a21 - a11) % p, (b11 + b12) % p, p, threshold)
+    m7 = _strassen((a12 - a22) % p, (b21 + b22) % p, p, threshold)
+
+    c = np.empty((m2, n2), dtype=a.dtype)
+    c[:hm, :hn] = (m1 + m4 - m5 + m7) % p
+    c[:hm, hn:] = (m3 + m5) % p
+    c[hm:, :hn] = (m2_ + m4) % p
+    c[hm:, hn:] = (m1 - m2_ + m3 + m6) % p
+    return c[:m, :n]
+
+
+def _lower_unit_inverse(lower: np.ndarray, p: int) -> np.ndarray:
+    """Inverse of a unit lower triangular matrix (mod p) by forward substitution"""
+    k = lower.shape[0]
+    inverse = np.zeros_like(lower)
+    for i in range(k):
+        inverse[i, i] = 1
+        if i:
+            inverse[i, :i] = -_matmul(lower[i:i + 1, :i], inverse[:i, :i], p)[0] % p
+    return inverse
+
+
+def _upper_inverse(upper: np.ndarray, p: int) -> np.ndarray:
+    """Inverse of an invertible upper triangular matrix (mod p): U^-1 = J * (J*D^-1*U*J)^-1 * J * D^-1"""
+    k = upper.shape[0]
+    diagonal = np.array([pow(int(upper[i, i]), -1, p) for i in range(k)], dtype=upper.dtype).reshape(k, 1)
+    unit = upper * diagonal % p
+    return _lower_unit_inverse(unit[::-1, ::-1].copy(), p)[::-1, ::-1] * diagonal.T % p
+
+
+def _panel_lu(panel: np.ndarray, p: int) -> tuple[np.ndarray, list[int], int]:
+    """
+    LU factorization of the panel with row pivoting, in place: the rows are permuted, U is left in the pivot rows
+    and the multipliers of L are stored below the pivots.
+    Panel is split into 2 halves recursively, so most of the work is done by matrix products,
+    and only panels of at most PANEL_BASE_SIZE columns are factorized with row operations.
+
+    :return: row permutation, list of pivot columns and the parity of the number of row swaps
+    """
+    rows, width = panel.shape
+    perm = np.arange(rows)
+    swaps = 0
+    if width > PANEL_BASE_SIZE:
+        half = width // 2
+        left, right = panel[:, :half], panel[:, half:]
+        perm, local, swaps = _panel_lu(left, p)
+        right[:] = right[perm]
+        k = len(local)
+        if k:
+            # U12 = L11^-1 * A12, A22 -= L21 * U12
+            lower = np.zeros((k, k), dtype=panel.dtype)
+            for t, j in enumerate(local):
+                lower[t + 1:, t] = left[t + 1:k, j]
+            right[:k] = _matmul(_lower_unit_inverse(lower, p), right[:k], p)
+            right[k:] = (right[k:] - _matmul(left[k:, local], right[:k], p)) % p
+        if k < rows:
+            perm2, local2, swaps2 = _panel_lu(right[k:], p)
+            left[k:] = left[k:][perm2]
+            perm[k:] = perm[k:][perm2]
+            local += [half + j for j in local2]
+            swaps ^= swaps2
+        return perm, local, swaps
+
+    local = []
+    k = 0
+    for j in range(width):
+        if k == rows:
+            break
+        nonzero = np.flatnonzero(panel[k:, j])
+        if not nonzero.size:
+            continue
+        i = k + int(nonzero[0])
+        if i != k:
+            panel[[k, i]] = panel[[i, k]]
+            perm[[k, i]] = perm[[i, k]]
+            swaps ^= 1
+        multipliers = panel[k + 1:, j] * pow(int(panel[k, j]), -1, p) % p
+        panel[k + 1:, j + 1:] = (panel[k + 1:, j + 1:] - multipliers[:, None] * panel[k, j + 1:]) % p
+        panel[k + 1:, j] = multipliers
+        local.append(j)
+        k += 1
+    return perm, local, swaps
+
+
+def _echelon(w: np.ndarray, p: int, ncols: int) -> tuple[list[int], int]:
+    """
+    Brings w into row echelon form in place, looking for pivots in the first ncols columns only.
+    Columns are eliminated in panels of BLOCK_SIZE: every panel is factorized by _panel_lu,
+    and then the rest of the matrix is updated by a single matrix product.
+
+    :return: list of pivot columns and the parity of the number of row swaps
+    """
+    m = w.shape[0]
+    r = 0
+    pivots = []
+    swaps = 0
+
+    for c0 in range(0, ncols, BLOCK_SIZE):
+        if r == m:
+            break
+        c1 = min(c0 + BLOCK_SIZE, ncols)
+        panel = w[r:, c0:c1]
+        perm, local, panel_swaps = _panel_lu(panel, p)
+        swaps ^= panel_swaps
+        k = len(local)
+
+        if k:
+            # updating the trailing matrix: U12 = L11^-1 * A12, A22 -= L21 * U12
+            rest = w[r:, c1:][perm]
+            lower = np.zeros((k, k), dtype=w.dtype)
+            for t, j in enumerate(local):
+                lower[t + 1:, t] = panel[t + 1:k, j]
+            upper = _matmul(_lower_unit_inverse(lower, p), rest[:k], p)
+            multipliers = panel[k:, local]
+            rest[k:] = (rest[k:] - _matmul(multipliers, upper, p)) % p
+            rest[:k] = upper
+            w[r:, c1:] = rest
+
+            # only U is left in the panel
+            for t, j in enumerate(local):
+                panel[t + 1:, j] = 0
+            pivots += [c0 + j for j in local]
+            r += k
+
+    return pivots, swaps
+
+
+def _reduced_echelon(w: np.ndarray, p: int, pivots: list[int], columns: Iterable[int]) -> np.ndarray:
+    """
+    Takes w in row echelon form with given pivot columns and returns the given columns of its reduced row echelon form
+    (only the pivot rows).
+
+    Let U be the echelon form and P its square upper triangular submatrix made of pivot columns.
+    Then the reduced form is P^-1 * U, which is found by block back substitution over the rows of U:
+    X_i = P_ii^-1 * (U_i - P_i,>i * X_>i) for the diagonal blocks P_ii of BLOCK_SIZE rows, from the bottom up.
+    """
+    k = len(pivots)
+    upper = w[:k][:, pivots]
+    x = w[:k][:, list(columns)]
+    for b1 in range(k, 0, -BLOCK_SIZE):
+        b0 = max(0, b1 - BLOCK_SIZE)
+        if b1 < k:
+            x[b0:b1] = (x[b0:b1] - _matmul(upper[b0:b1, b1:], x[b1:], p)) % p
+        x[b0:b1] = _matmul(_upper_inverse(upper[b0:b1, b0:b1], p), x[b0:b1], p)
+    return x
+
+
+class MatrixFp:
+    """
+    Dense matrix over a finite Fp field.
+    """
+
+    def __init__(self, field: Fp | int, rows: Any):
+        """
+        :param field: Fp field or its modulus
+        :param rows: 2-dimensional iterable of integers or elements of the field, or a NumPy array
+        """
+        if isinstance(field, int):
+            field = Fp(field)
+        assert isinstance(field, Fp), "field must be an Fp instance or a prime number"
+        self.field = field
+
+        p = self.p
+        if isinstance(rows, np.ndarray):
+            array = np.array(rows % p, dtype=self.dtype)
+        else:
+            array = np.array([[(x.value if isinstance(x, StructureElement) else x) % p for x in row] for row in rows],
+                             dtype=self.dtype)
+        assert array.ndim == 2, "matrix must be 2-dimensional"
+        self.array = array
+
+    @classmethod
+    def zeros(cls, field: Fp | int, rows: int, cols: int) -> MatrixFp:
+        matrix = cls(field, [[]])
+        matrix.array = np.zeros((rows, cols), dtype=matrix.dtype)
+        return matrix
+
+    @classmethod
+    def identity(cls, field: Fp | int, n: int) -> MatrixFp:
+        matrix = cls.zeros(field, n, n)
+        np.fill_diagonal(matrix.array, 1)
+        return matrix
+
+    @classmethod
+    def random(cls, field: Fp | int, rows: int, cols: int) -> MatrixFp:
+        """Returns a matrix of uniformly distributed random elements"""
+        matrix = cls.zeros(field, rows, cols)
+        matrix.array = np.array([[random.randrange(matrix.p) for _ in range(cols)] for _ in range(rows)],
+                                dtype=matrix.dtype).reshape(rows, cols)
+        return matrix
+
+    def _new(self, array: np.ndarray) -> MatrixFp:
+        """Wraps an already reduced array into a matrix over the same field"""
+        matrix = MatrixFp.__new__(MatrixFp)
+        matrix.field = self.field
+        matrix.array = array
+        return matrix
+
+    def _other_array(self, other: Any) -> np.ndarray:
+        if isinstance(other, MatrixFp):
+            if other.field != self.field:
+                raise AttributeError(f"cannot operate on matrices over different fields: {self.field} and {other.field}")
+            if other.shape != self.shape:
+                raise AttributeError(f"shapes {self.shape} and {other.shape} do not match")
+            return other.array
+        raise NotImplementedError(f"Operation is undefined for types: {type(self)}, {type(other)}")
+
+    def __add__(self, other):
+        return self._new((self.array + self._other_array(other)) % self.p)
+
+    def __sub__(self, other):
+        return self._new((self.array - self._other_array(other)) % self.p)
+
+    def __neg__(self):
+        return self._new(-self.array % self.p)
+
+    def __mul__(self, other):
+        """Multiplication by a scalar"""
+        if isinstance(other, StructureElement):
+            other = self.field(other).value
+        if isinstance(other, int):
+            return self._new(self.array * (other % self.p) % self.p)
+        raise NotImplementedError(f"Multiplication is undefined for types: {type(self)}, {type(other)}. "
+                                  f"Use @ for the matrix product")
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __matmul__(self, other):
+        if not isinstance(other, MatrixFp):
+            other = MatrixFp(self.field, other)
+        if other.field != self.field:
+            raise AttributeError(f"cannot multiply matrices over different fields: {self.field} and {other.field}")
+        if self.shape[1] != other.shape[0]:
+            raise AttributeError(f"shapes {self.shape} and {other.shape} are not aligned")
+
+        threshold = STRASSEN_OBJECT_THRESHOLD if self.dtype == object else STRASSEN_THRESHOLD
+        return self._new(_strassen(self.array, other.array, self.p, threshold))
+
+    def __pow__(self, power: int, modulo=None):
+        assert isinstance(power, int), "power must be an integer"
+        assert self.is_square, "only square matrices can be powered"
+
+        base = self
+        if power < 0:
+            base = self.inverse
+            if base is None:
+                raise ZeroDivisionError("singular matrix cannot be raised to a negative power")
+            power = -power
+
+        ans = MatrixFp.identity(self.field, self.shape[0])
+        while power:
+            if power % 2:
+                ans = ans @ base
+            base = base @ base
+            power //= 2
+        return ans
+
+    def __eq__(self, other):
+        if isinstance(other, MatrixFp):
+            return other.field == self.field and other.shape == self.shape and bool(np.all(other.array == self.array))
+        return False
+
+    def __getitem__(self, item):
+        i, j = item
+        return self.field(int(self.array[i, j]))
+
+    def __str__(self):
+        return f"<{self.__class__.__name__} over {self.field.name}: {self.array.tolist()}>"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def tolist(self) -> list[list[FieldElement]]:
+        """Returns the matrix as a list of rows made of field elements"""
+        return [[self.field(int(x)) for x in row] for row in self.array]
+
+    def rank(self) -> int:
+        return len(_echelon(self.array.copy(), self.p, self.shape[1])[0])
+
+    def determinant(self) -> FieldElement:
+        assert self.is_square, "determinant is defined only for square matrices"
+
+        n = self.shape[0]
+        w = self.array.copy()
+        pivots, swaps = _echelon(w, self.p, n)
+        if len(pivots) < n:
+            return self.field.aneutral
+
+        det = -1 if swaps else 1
+        for i in range(n):
+            det = det * int(w[i, i]) % self.p
+        return self.field(det)
+
+    def solve(self, b: Any) -> MatrixFp | None:
+        """
+        Returns some solution x of the system self @ x == b, or None if the system is inconsistent.
+        b could be either a vector (then it's considered a column) or a matrix of several right-hand sides.
+        When the system is underdetermined, all free variables are set to zero.
+        """
+        if not isinstance(b, MatrixFp):
+            b = list(b)
+            if b and not isinstance(b[0], Iterable):  # a single right-hand side vector
+                b = [[x] for x in b]
+            b = MatrixFp(self.field, b)
+        if b.shape[0] != self.shape[0]:
+            raise AttributeError(f"shapes {self.shape} and {b.shape} are not aligned")
+
+        n = self.shape[1]
+        w = np.concatenate([self.array, b.array], axis=1)
+        pivots, _ = _echelon(w, self.p, n)
+
+        # rows without a pivot must not have anything on the right side
+        if np.any(w[len(pivots):, n:]):
+            return None
+
+        x = np.zeros((n, b.shape[1]), dtype=self.dtype)
+        x[pivots] = _reduced_echelon(w, self.p, pivots, range(n, w.shape[1]))
+        return self._new(x)
+
+    def nullspace(self) -> MatrixFp:
+        """Returns a matrix whose columns form a basis of the right kernel (self @ nullspace == 0)"""
+        n = self.shape[1]
+        w = self.array.copy()
+        pivots, _ = _echelon(w, self.p, n)
+        free = sorted(set(range(n)) - set(pivots))
+        basis = np.zeros((n, len(free)), dtype=self.dtype)
+        basis[pivots] = -_reduced_echelon(w, self.p, pivots, free) % self.p
+        basis[free, range(len(free))] = 1
+        return self._new(basis)
+
+    @property
+    def inverse(self) -> MatrixFp | None:
+        """Returns the inverse matrix or None if the matrix is singular"""
+        assert self.is_square, "only square matrices can be inverted"
+
+        n = self.shape[0]
+        w = np.concatenate([self.array, np.eye(n, dtype=self.dtype)], axis=1)
+        pivots, _ = _echelon(w, self.p, n)
+        if len(pivots) < n:
+            return None
+        return self._new(_reduced_echelon(w, self.p, pivots, range(n, 2 * n)))
+
+    @property
+    def T(self) -> MatrixFp:
+        """Transposed matrix"""
+        return self._new(self.array.T.copy())
+
+    @property
+    def det(self) -> FieldElement:
+        """Alias for self.determinant()"""
+        return self.determinant()
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.array.shape
+
+    @property
+    def is_square(self) -> bool:
+        return self.shape[0] == self.shape[1]
+
+    @property
+    def dtype(self):
+        return np.int64 if self.p < INT64_MAX_P else object
+
+    @property
+    def p(self) -> int:
+        return self.field.p
@@ -0,0 +1,118 @@
+"""
+Opt-in memoization of expensive operations of a single field or curve: Fp.sqrt, Fp.element_multiplicative_inverse
+and EllipticCurve.elements_mul. Results are keyed by the operand values (not the objects), kept in LRU order
+and evicted when their estimated size exceeds the byte budget, so the memo can't grow without bounds.
+
+Usage:
+    memo.enable(curve, max_bytes=1 << 20)  # repeated pk * k now returns the stored point
+    curve.memo.stats()  # hits, misses and the memory in use
+    memo.disable(curve)
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+
+MEMO_MAX_BYTES = 1 << 24  # default byte budget of a memo
+MEMO_ENTRY_BYTES = 160  # estimated overhead of an entry besides its key and result: the dictionary node and the key tuple
+MEMO_OPERATIONS = ("sqrt", "inverse", "mul")  # names of the memoized operations
+
+
+def _size(value: Any) -> int:
+    """Estimated number of bytes held by the result or the key (shared singletons are counted too)"""
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_size(item) for item in value)
+    if isinstance(value, StructureElement):
+        return sys.getsizeof(value) + sys.getsizeof(value.__dict__) + _size(value.value)
+    return sys.getsizeof(value)
+
+
+class Memo:
+    """
+    LRU map from (operation, operand values) to the results of a structure's operations with a byte budget.
+    Results are computed outside the lock, so concurrent misses on the same key may compute it twice.
+    """
+
+    def __init__(self, max_bytes: int = MEMO_MAX_BYTES):
+        assert max_bytes > 0, "byte budget must be positive"
+        self.max_bytes = max_bytes
+        self.__entries__ = OrderedDict()  # (operation, key) -> (result, size)
+        self.__bytes__ = 0
+        self.__lock__ = threading.Lock()
+        self.__hits__ = self.__misses__ = self.__evictions__ = 0
+
+    def lookup(self, operation: str, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Returns the stored result of the operation on the operands given by the key or computes and stores it"""
+        entry_key = (operation, key)
+        with self.__lock__:
+            entry = self.__entries__.get(entry_key)
+            if entry is not None:
+                self.__entries__.move_to_end(entry_key)
+                self.__hits__ += 1
+                return entry[0]
+            self.__misses__ += 1
+
+        result = compute()
+        size = MEMO_ENTRY_BYTES + _size(key) + _size(result)
+        if size > self.max_bytes:
+            return result
+        with self.__lock__:
+            previous = self.__entries__.pop(entry_key, None)
+            if previous is not None:
+                self.__bytes__ -= previous[1]
+            self.__entries__[entry_key] = (result, size)
+            self.__bytes__ += size
+            while self.__bytes__ > self.max_bytes:
+                self.__bytes__ -= self.__entries__.popitem(last=False)[1][1]
+                self.__evictions__ += 1
+        return result
+
+    def invalidate(self, operation: str | None = None) -> int:
+        """Drops the stored results of the operation (all of them by default), returns the number of dropped ones"""
+        if operation is not None and operation not in MEMO_OPERATIONS:
+            raise AttributeError(f"unknown operation: {operation}, expected one of {MEMO_OPERATIONS}")
+        with self.__lock__:
+            keys = [key for key in self.__entries__ if operation is None or key[0] == operation]
+            for key in keys:
+                self.__bytes__ -= self.__entries__.pop(key)[1]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self.__entries__)
+
+    def stats(self) -> dict[str, float]:
+        """Returns hits and misses of lookups, the hit rate, number of evictions, stored entries and their bytes"""
+        with self.__lock__:
+            lookups = self.__hits__ + self.__misses__
+            return {
+                "hits": self.__hits__,
+                "misses": self.__misses__,
+                "hit_rate": self.__hits__ / lookups if lookups else 0.0,
+                "evictions": self.__evictions__,
+                "entries": len(self.__entries__),
+                "bytes": self.__bytes__,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __str__(self):
+        return f"Memo({len(self)} entries, {self.__bytes__}/{self.max_bytes} bytes)"
+
+    def __repr__(self):
+        return str(self)
+
+
+def enable(structure: Fp | EllipticCurve, max_bytes: int = MEMO_MAX_BYTES) -> Memo:
+    """Makes the field or curve memoize its expensive operations in a new memo"""
+    assert isinstance(structure, (Fp, EllipticCurve)), "only fields and curves can memoize their operations"
+    structure.memo = Memo(max_bytes)
+    return structure.memo
+
+
+def disable(structure: Fp | EllipticCurve) -> None:
+    """Stops memoization of the structure and frees the stored results"""
+    structure.memo = None
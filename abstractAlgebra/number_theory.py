@@ -0,0 +1,339 @@
+"""
+Integer number theory used by the structures: primality testing, factorization (Pollard's rho and Lenstra's ECM)
+and residue number systems.
+"""
+from __future__ import annotations
+
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from itertools import compress
+from math import gcd, isqrt, prod
+from typing import Iterable, Sequence
+
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)  # deterministic for n < 3.3 * 10^24
+MILLER_RABIN_RANDOM_ROUNDS = 16  # extra random bases for bigger numbers, error probability <= 4^-rounds
+TRIAL_DIVISION_BOUND = 1000
+SIEVE_SEGMENT_SIZE = 1 << 16
+ECM_BOUNDS = ((2000, 25), (11000, 90), (50000, 300), (250000, 700), (1000000, 1800), (3000000, 5100))  # (B1, curves) finding 15, 20, ..., 40 digit factors with high probability
+ECM_STAGE2_FACTOR = 100  # default B2 = 100 * B1
+ECM_STAGE2_STEP = 2310  # giant step D of stage 2, 2 * 3 * 5 * 7 * 11 leaves 240 baby steps coprime to it
+ECM_MIN_BITS = 100  # composites above it are split by ECM instead of Pollard's rho
+
+
+def is_probable_prime(n: int) -> bool:
+    """Miller-Rabin test, it's deterministic for n < 3.3 * 10^24 and probabilistic above that"""
+    if n < 2:
+        return False
+    for q in MILLER_RABIN_BASES:
+        if n % q == 0:
+            return n == q
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    bases = list(MILLER_RABIN_BASES)
+    if n >= 3317044064679887385961981:
+        bases += [random.randrange(2, n - 1) for _ in range(MILLER_RABIN_RANDOM_ROUNDS)]
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def integer_root(n: int, k: int) -> int:
+    """Floor of the k-th root of a non-negative n (Newton's method on integers)"""
+    assert n >= 0 and k > 0, "root is defined for non-negative n and positive k"
+    if n < 2 or k == 1:
+        return n
+    x = 1 << -(-n.bit_length() // k)  # initial guess above the root
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def perfect_power(n: int) -> tuple[int, int]:
+    """Returns (root, k) with root^k = n and the largest such k (k = 1 if n isn't a perfect power)"""
+    for k in range(n.bit_length(), 1, -1):
+        root = integer_root(n, k)
+        if root > 1 and root ** k == n:
+            return root, k
+    return n, 1
+
+
+def pollard_rho(n: int) -> int:
+    """
+    Returns a non-trivial divisor of the composite n with Brent's variant of Pollard's rho algorithm.
+    Products of differences are accumulated, so one gcd is computed per hundred steps.
+    """
+    if n % 2 == 0:
+        return 2
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:  # accumulated product skipped the divisor, going step by step from the last checkpoint
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def primes_between(low: int, high: int) -> Iterable[int]:
+    """Primes in [low, high] in increasing order, found by a segmented sieve of Eratosthenes"""
+    low = max(low, 2)
+    if high < low:
+        return
+    base = list(primes_between(2, isqrt(high)))
+    for start in range(low, high + 1, SIEVE_SEGMENT_SIZE):
+        stop = min(start + SIEVE_SEGMENT_SIZE, high + 1)
+        sieve = bytearray([1]) * (stop - start)
+        for q in base:
+            first = max(q * q, -(-start // q) * q)
+            sieve[first - start::q] = bytes(len(range(first - start, stop - start, q)))
+        yield from compress(range(start, stop), sieve)
+
+
+def _montgomery_double(x: int, z: int, a24: int, n: int) -> tuple[int, int]:
+    """2P for P = (x : z) on By^2 = x^3 + Ax^2 + x, a24 = (A + 2) / 4"""
+    u, v = (x + z) ** 2 % n, (x - z) ** 2 % n
+    t = u - v  # 4xz
+    return u * v % n, t * (v + a24 * t) % n
+
+
+def _montgomery_add(x1: int, z1: int, x2: int, z2: int, x0: int, z0: int, n: int) -> tuple[int, int]:
+    """P + Q for P = (x1 : z1), Q = (x2 : z2) given P - Q = (x0 : z0)"""
+    u, v = (x1 - z1) * (x2 + z2), (x1 + z1) * (x2 - z2)
+    return z0 * (u + v) ** 2 % n, x0 * (u - v) ** 2 % n
+
+
+def _montgomery_ladder(k: int, x: int, z: int, a24: int, n: int) -> tuple[int, int]:
+    """kP for positive k, only x : z coordinates are tracked"""
+    x0, z0, x1, z1 = x, z, *_montgomery_double(x, z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            x0, z0 = _montgomery_add(x1, z1, x0, z0, x, z, n)
+            x1, z1 = _montgomery_double(x1, z1, a24, n)
+        else:
+            x1, z1 = _montgomery_add(x0, z0, x1, z1, x, z, n)
+            x0, z0 = _montgomery_double(x0, z0, a24, n)
+    return x0, z0
+
+
+def ecm_curve(n: int, sigma: int, b1: int, b2: int) -> int:
+    """
+    Runs a single curve of Lenstra's elliptic curve method on n (Suyama's parametrization by sigma).
+    The curve is By^2 = x^3 + Ax^2 + x over Z/nZ, it breaks down modulo p | n when the order of the starting point
+    modulo p is B1-smooth apart from one prime below B2 - then z coordinate is not invertible modulo n.
+    Returns gcd(z, n) - a non-trivial divisor when the curve succeeds, 1 or n otherwise.
+    """
+    u, v = (sigma * sigma - 5) % n, 4 * sigma % n
+    x, z = pow(u, 3, n), pow(v, 3, n)
+    denominator = 16 * x * v % n
+    g = gcd(denominator, n)
+    if g != 1:
+        return g  # the curve can't be built modulo one of the factors, which is a factor found as well
+    a24 = pow(v - u, 3, n) * (3 * u + v) * pow(denominator, -1, n) % n
+
+    # stage 1: multiplying by all prime powers up to B1 (and primes up to D / 2 for stage 2 to start above them)
+    for q in primes_between(2, max(b1, ECM_STAGE2_STEP // 2)):
+        qk = q
+        while qk * q <= b1:
+            qk *= q
+        x, z = _montgomery_ladder(qk, x, z, a24, n)
+    g = gcd(z, n)
+    if g != 1 or b2 <= b1:
+        return g
+
+    # stage 2: a single prime q in (B1, B2] with q * Q = O modulo p means (x_mD * z_d - x_d * z_mD) = 0 modulo p,
+    # where q = mD +- d, so differences for all of them are accumulated and checked by one gcd
+    d_step = ECM_STAGE2_STEP
+    baby = {1: (x, z)}
+    x2, z2 = _montgomery_double(x, z, a24, n)
+    previous, current = (x, z), _montgomery_add(x2, z2, x, z, x, z, n)
+    for d in range(3, d_step // 2 + 1, 2):
+        baby[d] = current
+        previous, current = current, _montgomery_add(*current, x2, z2, *previous, n)
+    baby = {d: point for d, point in baby.items() if gcd(d, d_step) == 1}
+
+    xd, zd = _montgomery_ladder(d_step, x, z, a24, n)
+    m = None
+    product = 1
+    for q in primes_between(max(b1, d_step // 2) + 1, b2):
+        if m is None:
+            m = (q + d_step // 2) // d_step
+            xm, zm = _montgomery_ladder(m * d_step, x, z, a24, n)
+            xp, zp = _montgomery_ladder((m - 1) * d_step, x, z, a24, n) if m > 1 else (None, None)
+        while q > m * d_step + d_step // 2:
+            if xp is None:
+                (xp, zp), (xm, zm) = (xm, zm), _montgomery_double(xm, zm, a24, n)
+            else:
+                (xp, zp), (xm, zm) = (xm, zm), _montgomery_add(xm, zm, xd, zd, xp, zp, n)
+            m += 1
+        xb, zb = baby[abs(q - m * d_step)]
+        product = product * (xm * zb - xb * zm) % n
+    return gcd(product, n)
+
+
+def ecm(n: int,
+        b1: int = 11000,
+        b2: int | None = None,
+        curves: int = 90,
+        *,
+        executor: Executor | None = None,
+        max_workers: int | None = 1) -> int | None:
+    """
+    Looks for a non-trivial divisor of the composite n with Lenstra's elliptic curve method, running up to `curves`
+    random curves with stage 1 bound B1 and stage 2 bound B2 (ECM_STAGE2_FACTOR * B1 by default).
+    Curves are independent: with max_workers > 1 (or None for the number of CPUs) or a given executor
+    they run on a process pool and the first divisor found cancels the rest.
+    Returns None if no curve succeeded.
+    """
+    assert isinstance(n, int) and n > 3, "ECM is run on composite numbers greater than 3"
+    if n % 2 == 0:
+        return 2
+    b2 = ECM_STAGE2_FACTOR * b1 if b2 is None else b2
+    sigmas = [random.randrange(6, n - 1) for _ in range(curves)]
+
+    if executor is None and max_workers == 1:
+        for sigma in sigmas:
+            g = ecm_curve(n, sigma, b1, b2)
+            if 1 < g < n:
+                return g
+        return None
+
+    pool = executor or ProcessPoolExecutor(max_workers)
+    futures = [pool.submit(ecm_curve, n, sigma, b1, b2) for sigma in sigmas]
+    try:
+        for future in as_completed(futures):
+            g = future.result()
+            if 1 < g < n:
+                return g
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+
+
+def ecm_divisor(n: int, *, executor: Executor | None = None, max_workers: int | None = 1) -> int:
+    """
+    Returns a non-trivial divisor of the composite n, raising ECM bounds level by level (see ECM_BOUNDS),
+    so small factors are found by cheap curves first. Falls back to Pollard's rho if all levels fail.
+    """
+    for b1, curves in ECM_BOUNDS:
+        d = ecm(n, b1, curves=curves, executor=executor, max_workers=max_workers)
+        if d is not None:
+            return d
+    return pollard_rho(n)
+
+
+def factorize(n: int) -> dict[int, int]:
+    """Returns the factorization of n as {prime: exponent}"""
+    assert isinstance(n, int) and n > 0, "only positive integers can be factorized"
+    factors = {}
+    for q in range(2, TRIAL_DIVISION_BOUND):
+        while n % q == 0:
+            factors[q] = factors.get(q, 0) + 1
+            n //= q
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        root, k = perfect_power(m)  # rho needs distinct prime factors to find a collision quickly
+        if k > 1:
+            stack += [root] * k
+        else:
+            d = pollard_rho(m) if m.bit_length() <= ECM_MIN_BITS else ecm_divisor(m)
+            stack += [d, m // d]
+    return dict(sorted(factors.items()))
+
+
+def multiplicative_order(a: int, n: int, group_order: int, group_order_factors: dict[int, int] = None) -> int:
+    """
+    Order of a unit a modulo n, given a multiple of it (e.g. the order of the unit group).
+    Prime factors are removed from the group order while a^order stays 1.
+    """
+    order = group_order
+    for q in (group_order_factors or factorize(group_order)):
+        while order % q == 0 and pow(a, order // q, n) == 1:
+            order //= q
+    return order
+
+
+class ResidueNumberSystem:
+    """
+    Representation of integers modulo M = m_1 * ... * m_k by the tuples of residues modulo pairwise coprime m_i.
+    Arithmetic works component-wise on small residues, reconstruction is x = sum r_i * c_i mod M
+    with constants c_i = (M / m_i) * ((M / m_i)^-1 mod m_i) precomputed once.
+    """
+
+    def __init__(self, moduli: Sequence[int]):
+        moduli = tuple(moduli)
+        assert moduli and all(isinstance(m, int) and m > 0 for m in moduli), "moduli must be positive integers"
+        assert all(gcd(a, b) == 1 for i, a in enumerate(moduli) for b in moduli[i + 1:]), "moduli must be pairwise coprime"
+        self.moduli = moduli
+        self.modulus = prod(moduli)
+        self.__coefficients__ = tuple(self.modulus // m * pow(self.modulus // m, -1, m) % self.modulus if m > 1 else 0
+                                      for m in moduli)
+
+    def decompose(self, x: int) -> tuple[int, ...]:
+        return tuple(x % m for m in self.moduli)
+
+    def compose(self, residues: Iterable[int]) -> int:
+        """Chinese remainder theorem"""
+        return sum(r * c for r, c in zip(residues, self.__coefficients__)) % self.modulus
+
+    def add(self, a: Sequence[int], b: Sequence[int]) -> tuple[int, ...]:
+        return tuple((x + y) % m for x, y, m in zip(a, b, self.moduli))
+
+    def sub(self, a: Sequence[int], b: Sequence[int]) -> tuple[int, ...]:
+        return tuple((x - y) % m for x, y, m in zip(a, b, self.moduli))
+
+    def neg(self, a: Sequence[int]) -> tuple[int, ...]:
+        return tuple(-x % m for x, m in zip(a, self.moduli))
+
+    def mul(self, a: Sequence[int], b: Sequence[int]) -> tuple[int, ...]:
+        return tuple(x * y % m for x, y, m in zip(a, b, self.moduli))
+
+    def power(self, a: Sequence[int], e: int) -> tuple[int, ...]:
+        assert e >= 0, "power must be non-negative integer"
+        return tuple(pow(x, e, m) for x, m in zip(a, self.moduli))
+
+    def inverse(self, a: Sequence[int]) -> tuple[int, ...] | None:
+        """Multiplicative inverse or None if some residue isn't invertible"""
+        if any(gcd(x, m) != 1 for x, m in zip(a, self.moduli)):
+            return None
+        return tuple(pow(x, -1, m) if m > 1 else 0 for x, m in zip(a, self.moduli))
+
+    def __str__(self):
+        return f"<RNS: {self.moduli}>"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,87 @@
+"""
+Batch entry points running independent elliptic curve operations on a thread pool.
+Structures and their elements are immutable (all lazily computed constants are guarded by locks),
+so they are shared between threads without copying. On free-threaded CPython builds batches scale with the number
+of threads, with GIL they at least don't block the caller's thread.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import islice
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.elgamal import *
+
+BATCH_CHUNK_SIZE = 64  # number of items processed by a single task, amortizes the cost of scheduling
+
+
+def _chunks(items: Iterable, size: int) -> Iterable[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _run(function, items: Iterable, executor: Executor | None, max_workers: int | None, chunk_size: int) -> list:
+    """Applies the function to every item on the executor (or a new thread pool) keeping the order of results"""
+
+    def task(chunk: list) -> list:
+        return [function(*item) for item in chunk]
+
+    if executor is not None:
+        return [ans for chunk in executor.map(task, _chunks(items, chunk_size)) for ans in chunk]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return [ans for chunk in pool.map(task, _chunks(items, chunk_size)) for ans in chunk]
+
+
+def batch_multiply(points: Iterable[EllipticCurvePoint],
+                   scalars: Iterable[int],
+                   method: str = None,
+                   *,
+                   executor: Executor | None = None,
+                   max_workers: int | None = None,
+                   chunk_size: int = BATCH_CHUNK_SIZE) -> list[EllipticCurvePoint]:
+    """
+    Returns [k * point for point, k in zip(points, scalars)] computed in parallel.
+    If no executor is given, a new thread pool with max_workers threads is used.
+
+    :param method: algorithm of EllipticCurve.multiply, chosen per curve by default
+    """
+    def multiply(point: EllipticCurvePoint, k: int) -> EllipticCurvePoint:
+        return point.curve.multiply(point, k, method)
+
+    return _run(multiply, zip(points, scalars), executor, max_workers, chunk_size)
+
+
+def batch_elgamal_encrypt(messages: Iterable[FieldElement | int],
+                          alpha: EllipticCurvePoint,
+                          beta: EllipticCurvePoint,
+                          parameter: int,
+                          encoding: str = "increment",
+                          *,
+                          executor: Executor | None = None,
+                          max_workers: int | None = None,
+                          chunk_size: int = BATCH_CHUNK_SIZE) -> list[tuple[EllipticCurvePoint, EllipticCurvePoint]]:
+    """Encrypts every message with elgamal_encrypt in parallel, see batch_multiply for the meaning of arguments"""
+    field = alpha.field
+
+    def encrypt(message: FieldElement | int) -> tuple[EllipticCurvePoint, EllipticCurvePoint]:
+        return elgamal_encrypt(field(message), alpha, beta, parameter, encoding)
+
+    return _run(encrypt, ((message,) for message in messages), executor, max_workers, chunk_size)
+
+
+def batch_elgamal_decrypt(ciphertexts: Iterable[tuple[EllipticCurvePoint, EllipticCurvePoint]],
+                          parameter: int,
+                          pk: int,
+                          encoding: str = "increment",
+                          *,
+                          executor: Executor | None = None,
+                          max_workers: int | None = None,
+                          chunk_size: int = BATCH_CHUNK_SIZE) -> list[FieldElement]:
+    """Decrypts every (c1, c2) pair with elgamal_decrypt in parallel, see batch_multiply for the meaning of arguments"""
+
+    def decrypt(c1: EllipticCurvePoint, c2: EllipticCurvePoint) -> FieldElement:
+        return elgamal_decrypt(c1, c2, parameter, pk, encoding)
+
+    return _run(decrypt, ciphertexts, executor, max_workers, chunk_size)
@@ -0,0 +1,116 @@
+"""
+Bulk random sampling of field elements, scalars and elliptic curve points.
+"""
+from __future__ import annotations
+
+import secrets
+import threading
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+
+SAMPLER_BUFFER_SIZE = 1 << 16  # number of random bytes requested from the source at once
+
+
+class RandomSampler:
+    """
+    Source of uniformly distributed random values generated in batches.
+    Random bytes are taken from the underlying source in big chunks and then cut into values,
+    so the per-value cost is a slice and an int.from_bytes call instead of a full random.randint call.
+
+    Either seedable pseudo-random generator (reproducible streams for tests and benchmarks)
+    or cryptographically secure one based on the secrets module can be used.
+    Sampler can be shared between threads.
+    """
+
+    def __init__(self, seed: Any = None, secure: bool = False):
+        """
+        :param seed: seed of the pseudo-random generator, streams of samplers with equal seeds are equal
+        :param secure: use operating system CSPRNG instead of the pseudo-random generator
+        """
+        assert not (secure and seed is not None), "cryptographically secure sampler cannot be seeded"
+        self.secure = secure
+        self.__random__ = None if secure else random.Random(seed)
+        self.__buffer__ = b""
+        self.__offset__ = 0
+        self.__lock__ = threading.Lock()
+
+    def random_bytes(self, n: int) -> bytes:
+        """Returns n random bytes"""
+        with self.__lock__:
+            if self.__offset__ + n > len(self.__buffer__):
+                size = max(n, SAMPLER_BUFFER_SIZE)
+                fresh = secrets.token_bytes(size) if self.secure else self.__random__.randbytes(size)
+                self.__buffer__ = self.__buffer__[self.__offset__:] + fresh
+                self.__offset__ = 0
+            start = self.__offset__
+            self.__offset__ += n
+            return self.__buffer__[start:self.__offset__]
+
+    def integers(self, upper: int, count: int) -> list[int]:
+        """
+        Returns count integers uniformly distributed in [0, upper).
+        Values of the bit length of upper are rejected when they don't fit, so there's no modulo bias.
+        """
+        assert isinstance(upper, int) and upper > 0, "upper bound must be a positive integer"
+        bits = (upper - 1).bit_length()
+        width = max(1, (bits + 7) // 8)
+        mask = (1 << bits) - 1
+
+        ans = []
+        while len(ans) < count:
+            need = count - len(ans)
+            data = memoryview(self.random_bytes(width * need))
+            for i in range(0, width * need, width):
+                value = int.from_bytes(data[i:i + width], "little") & mask
+                if value < upper:
+                    ans.append(value)
+        return ans
+
+    def field_elements(self, field: Fp, count: int) -> list[FieldElement]:
+        """Returns count random elements of the field"""
+        return [field(value) for value in self.integers(field.p, count)]
+
+    def scalars(self, n: int, count: int) -> list[int]:
+        """Returns count random integers in [1, n-1], suitable as private keys or ephemeral scalars modulo n"""
+        assert n > 2, "n must be greater than 2"
+        return [value + 1 for value in self.integers(n - 1, count)]
+
+    def points(self, curve: EllipticCurve, count: int) -> list[EllipticCurvePoint]:
+        """
+        Returns count random points of the curve (never the point at infinity).
+        Candidate x coordinates are generated in batches and x^3 + ax + b is computed for the whole batch
+        by bulk operations of the field backend. For p = 3 (mod 4) residuosity test and square root are
+        a single shared exponentiation pass y = v^((p+1)/4) over the batch, followed by the check y^2 = v.
+        Other fields filter the batch by Legendre symbol and square root the remaining values one by one.
+        Sign of y is chosen at random.
+        """
+        field = curve.field
+        backend = field.backend
+        p, a, b = field.p, curve.a.value, curve.b.value
+
+        ans = []
+        for _ in range(MAX_RANDOM_CURVE_ITERS):
+            need = count - len(ans)
+            if need <= 0:
+                return ans
+            size = 2 * need  # about half of x values have a point
+            xs = self.integers(p, size)
+            signs = self.integers(2, size)
+            values = backend.add_many(backend.mul_many(backend.add_many(backend.mul_many(xs, xs, p), [a] * size, p),
+                                                       xs, p), [b] * size, p)
+            if p % 4 == 3:
+                roots = backend.power_many(values, [(p + 1) // 4] * size, p)
+                squares = backend.mul_many(roots, roots, p)
+                roots = [y if y_squared == value else None for y, y_squared, value in zip(roots, squares, values)]
+            else:
+                roots = [None if field.legendre_symbol(value) < 0 else field.sqrt(field(value)).value
+                         for value in values]
+
+            for x, y, sign in zip(xs, roots, signs):
+                if y is not None:
+                    ans.append(curve._point(x, p - y if sign and y else y))
+                    if len(ans) == count:
+                        return ans
+        raise RuntimeError(f"Cannot generate random points of the {curve}. If you sure they exist,"
+                           " try increasing the MAX_RANDOM_CURVE_ITERS parameter.")
@@ -0,0 +1,157 @@
+"""
+ECDSA and Schnorr signatures over the curves of this package.
+
+Signatures work in a cyclic subgroup of prime order n generated by a public generator point,
+n must be known (e.g. curve.order for curves of prime order). Private keys are integers in [1, n-1],
+public keys are the points private_key * generator.
+
+Schnorr signatures can be verified in batches: n signatures are checked by a single randomized
+multi-scalar multiplication which is several times cheaper than n separate verifications.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+
+SIGNATURE_HASH = "sha256"
+BATCH_RANDOMIZER_BITS = 128  # soundness of batch verification, forged batch passes with probability 2^-bits
+
+
+def _bits_to_int(data: bytes, n: int) -> int:
+    """Leftmost bits of the data (as many as n has) as an integer - bits2int of RFC 6979"""
+    return int.from_bytes(data, "big") >> max(0, 8 * len(data) - n.bit_length())
+
+
+def _hash_to_scalar(data: bytes, n: int) -> int:
+    """Leftmost bits of the digest of the data as an integer, like in ECDSA standard"""
+    return _bits_to_int(hashlib.new(SIGNATURE_HASH, data).digest(), n)
+
+
+def _nonce(private_key: int, data: bytes, n: int) -> int:
+    """
+    Deterministic per-message nonce in [1, n-1] derived from the private key and the digest of the data
+    with HMAC_DRBG as in RFC 6979, so signing doesn't depend on the quality of a random generator
+    and the same nonce is never reused for different messages.
+    The generator output is expanded to the full bit length of n, so nonces are uniform even for n
+    wider than the digest.
+    """
+    size = (n.bit_length() + 7) // 8
+    h = _hash_to_scalar(data, n) % n
+    seed = private_key.to_bytes(size, "big") + h.to_bytes(size, "big")
+
+    def mac(key: bytes, message: bytes) -> bytes:
+        return hmac.new(key, message, SIGNATURE_HASH).digest()
+
+    v = b"\x01" * hashlib.new(SIGNATURE_HASH).digest_size
+    k = b"\x00" * len(v)
+    k = mac(k, v + b"\x00" + seed)
+    v = mac(k, v)
+    k = mac(k, v + b"\x01" + seed)
+    v = mac(k, v)
+    while True:
+        t = b""
+        while 8 * len(t) < n.bit_length():
+            v = mac(k, v)
+            t += v
+        nonce = _bits_to_int(t, n)
+        if 0 < nonce < n:
+            return nonce
+        k = mac(k, v + b"\x00")
+        v = mac(k, v)
+
+
+def _schnorr_challenge(r: EllipticCurvePoint, public_key: EllipticCurvePoint, message: bytes, n: int) -> int:
+    return _hash_to_scalar(r.to_bytes() + public_key.to_bytes() + message, n) % n
+
+
+def signature_genkey(generator: EllipticCurvePoint, n: int) -> tuple[int, EllipticCurvePoint]:
+    """Returns a random private key and the corresponding public key"""
+    private_key = secrets.randbelow(n - 1) + 1
+    return private_key, generator.curve.multiply(generator, private_key)
+
+
+def ecdsa_sign(message: bytes, generator: EllipticCurvePoint, n: int, private_key: int) -> tuple[int, int]:
+    """Returns the ECDSA signature (r, s) of the message"""
+    assert 0 < private_key < n, "private key must be in [1, n-1]"
+    curve = generator.curve
+    e = _hash_to_scalar(message, n)
+
+    data = message
+    while True:
+        k = _nonce(private_key, data, n)
+        r = curve.multiply(generator, k).x.value % n
+        s = pow(k, -1, n) * (e + r * private_key) % n
+        if r and s:
+            return r, s
+        data += b"\0"  # negligible probability, trying another nonce
+
+
+def ecdsa_verify(message: bytes,
+                 signature: tuple[int, int],
+                 generator: EllipticCurvePoint,
+                 n: int,
+                 public_key: EllipticCurvePoint) -> bool:
+    r, s = signature
+    if not (0 < r < n and 0 < s < n) or public_key.is_identity:
+        return False
+    curve = generator.curve
+    w = pow(s, -1, n)
+    e = _hash_to_scalar(message, n)
+    point = curve.multi_multiply((generator, public_key), (e * w % n, r * w % n))
+    return not point.is_identity and point.x.value % n == r
+
+
+def schnorr_sign(message: bytes,
+                 generator: EllipticCurvePoint,
+                 n: int,
+                 private_key: int) -> tuple[EllipticCurvePoint, int]:
+    """Returns the Schnorr signature (R, s) of the message, where s*G = R + H(R, P, message)*P"""
+    assert 0 < private_key < n, "private key must be in [1, n-1]"
+    curve = generator.curve
+    public_key = curve.multiply(generator, private_key)
+    k = _nonce(private_key, public_key.to_bytes() + message, n)
+    r = curve.multiply(generator, k)
+    e = _schnorr_challenge(r, public_key, message, n)
+    return r, (k + e * private_key) % n
+
+
+def schnorr_verify(message: bytes,
+                   signature: tuple[EllipticCurvePoint, int],
+                   generator: EllipticCurvePoint,
+                   n: int,
+                   public_key: EllipticCurvePoint) -> bool:
+    r, s = signature
+    if not 0 <= s < n:
+        return False
+    e = _schnorr_challenge(r, public_key, message, n)
+    return generator.curve.multi_multiply((generator, r, public_key), (s, -1, -e)).is_identity
+
+
+def schnorr_batch_verify(items: Iterable[tuple[bytes, tuple[EllipticCurvePoint, int], EllipticCurvePoint]],
+                         generator: EllipticCurvePoint,
+                         n: int) -> bool:
+    """
+    Verifies many (message, signature, public_key) triples at once. Returns True only if all signatures are valid
+    (up to the 2^-BATCH_RANDOMIZER_BITS probability of accepting an invalid batch).
+
+    Every equation s_i*G = R_i + e_i*P_i is multiplied by a random a_i (a_1 = 1) and they are all summed up:
+        (sum a_i*s_i)*G - sum a_i*R_i - sum (a_i*e_i)*P_i = O
+    which is a single multi-scalar multiplication of 2n + 1 points.
+    R_i and P_i are assumed to lie in the subgroup generated by the generator.
+    """
+    curve = generator.curve
+    points, scalars = [generator], [0]
+    for index, (message, (r, s), public_key) in enumerate(items):
+        if not 0 <= s < n:
+            return False
+        a = 1 if index == 0 else secrets.randbits(BATCH_RANDOMIZER_BITS) | 1
+        e = _schnorr_challenge(r, public_key, message, n)
+        scalars[0] += a * s
+        points += [r, public_key]
+        scalars += [-a, -(a * e % n)]
+    scalars[0] %= n
+    return curve.multi_multiply(points, scalars).is_identity
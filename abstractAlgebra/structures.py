@@ -5,11 +5,58 @@ Abstract algebra shit it 2 words
 from __future__ import annotations
 
 import random
+import threading
+import weakref
 from abc import ABCMeta, abstractmethod
-from typing import Iterable, override, Any
-from math import ceil, floor
+from typing import Callable, Iterable, override, Any
+from math import ceil, floor, gcd, lcm, prod
+import operator
+
+from abstractAlgebra.backends import BACKENDS, ArithmeticBackend, get_backend
+from abstractAlgebra.number_theory import ResidueNumberSystem, factorize, is_probable_prime, multiplicative_order
 
 MAX_STR_ELEMENTS = 7  # defines how many elements can be shown via Structure.__str__
+PRECOMPUTATION_LOCK = threading.RLock()  # guards lazy computation of constants shared between threads
+_INTERNED_STRUCTURES = weakref.WeakValueDictionary()  # unpickled structures by their parameters, see interned_structure
+FIELD_REDUCTIONS = ("auto", "special", "generic")  # reductions of Fp products, see Fp.__init__
+ZN_REPRESENTATIONS = ("integer", "rns")  # how elements of Zn store their values, see Zn.__init__
+SPECIAL_REDUCTION_MIN_BITS = 448  # "auto" reduces modulo smaller special-form primes with %, shift-and-add isn't faster there
+
+
+def special_form(p: int) -> tuple[int, int] | None:
+    """
+    Returns (k, c) if p = 2^k - c with c < 2^(k/2 - 1): Mersenne (c = 1), pseudo-Mersenne (small c, e.g. 2^255 - 19)
+    and Solinas primes whose low terms are small enough (P-192, P-224, P-384, but not P-256). Products of such
+    reduced values are reduced by two folds x = (x mod 2^k) + c * (x >> k) and a single conditional subtraction.
+    """
+    k = p.bit_length()
+    c = (1 << k) - p
+    return (k, c) if 2 * c.bit_length() + 2 <= k else None
+
+
+def backend_reference(backend: ArithmeticBackend) -> str | ArithmeticBackend:
+    """Name of the backend if get_backend rebuilds it by the name (so it's pickled as a string), the backend otherwise"""
+    return backend.name if type(backend) is BACKENDS.get(backend.name) else backend
+
+
+def interned_structure(cls: type, *args: Any) -> AbstractStructure:
+    """
+    Unpickles a structure by its class and parameters. While a structure with the same parameters is alive
+    in the process, it's returned instead of a new one, so elements of all pickled batches share a single instance
+    together with its lazily computed constants and element class.
+    """
+    if not all(isinstance(arg, (int, str)) for arg in args):  # custom backend objects aren't interned
+        return cls(*args)
+    return intern_structure((cls, *args), lambda: cls(*args))
+
+
+def intern_structure(key: tuple, build: Callable[[], AbstractStructure]) -> AbstractStructure:
+    """Returns the living interned structure of the key or interns the one built by the given function"""
+    with PRECOMPUTATION_LOCK:
+        structure = _INTERNED_STRUCTURES.get(key)
+        if structure is None:
+            structure = _INTERNED_STRUCTURES[key] = build()
+    return structure
 
 
 class AbstractStructure(metaclass=ABCMeta):
@@ -18,6 +65,8 @@ class AbstractStructure(metaclass=ABCMeta):
 
     """
     __elements__: Iterable  # set of all structure elements
+    precomputation_cache = None  # persistent cache of expensive constants, see abstractAlgebra.cache
+    memo = None  # memoized results of expensive operations, see abstractAlgebra.memo
 
     def elements_add(self, element: StructureElement, other: Any) -> StructureElement:
         """
@@ -271,19 +320,117 @@ class Group(AbstractStructure, metaclass=ABCMeta):
         return self.neutral
 
 
+class ResidueElement(GroupElement):
+    """
+    Element of Zn in the residue number system representation (see Zn.__init__): the value is the tuple of residues
+    modulo prime power factors of n and every operation works on each residue separately.
+    Integers and elements of an equal Zn are converted to residues, int(element) reconstructs the integer.
+    """
+    __structure__: Zn
+
+    def __residues__(self, other: Any, operation: str) -> tuple[int, ...]:
+        group = self.__structure__
+        if isinstance(other, ResidueElement) and other.__structure__ is group:
+            return other.value
+        if isinstance(other, StructureElement):
+            if isinstance(other.structure, Zn) and other.structure == group:
+                return group.residues(other)
+            raise AttributeError(f"cannot {operation} elements from different groups: {group.name} and {other.structure.name}")
+        if isinstance(other, int):
+            return group.rns.decompose(other)
+        raise NotImplementedError(f"{operation.capitalize()} is undefined for types: {type(self)}, {type(other)}")
+
+    def __make__(self, residues: tuple[int, ...]) -> ResidueElement:
+        return ResidueElement(value=residues, structure=self.__structure__)
+
+    def __add__(self, other):
+        return self.__make__(self.__structure__.rns.add(self.value, self.__residues__(other, "add")))
+
+    def __sub__(self, other):
+        return self.__make__(self.__structure__.rns.sub(self.value, self.__residues__(other, "subtract")))
+
+    def __mul__(self, other):
+        return self.__make__(self.__structure__.rns.mul(self.value, self.__residues__(other, "multiply")))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __pow__(self, power, modulo=None):
+        assert isinstance(power, int) and modulo is None, "power must be an integer"
+        base = self if power >= 0 else self.minverse
+        if base is None:
+            return None
+        return self.__make__(self.__structure__.rns.power(base.value, abs(power)))
+
+    def __neg__(self):
+        return self.ainverse
+
+    def __eq__(self, other):
+        try:
+            return self.value == self.__residues__(other, "compare")
+        except (AttributeError, NotImplementedError):
+            return False
+
+    def __lt__(self, other):
+        return int(self) < int(self.__make__(self.__residues__(other, "compare")))
+
+    def __le__(self, other):
+        return int(self) <= int(self.__make__(self.__residues__(other, "compare")))
+
+    def __gt__(self, other):
+        return int(self) > int(self.__make__(self.__residues__(other, "compare")))
+
+    def __ge__(self, other):
+        return int(self) >= int(self.__make__(self.__residues__(other, "compare")))
+
+    def __bool__(self):
+        return any(self.value)
+
+    def __int__(self):
+        return self.__structure__.rns.compose(self.value)
+
+    @property
+    def ainverse(self) -> ResidueElement:
+        return self.__make__(self.__structure__.rns.neg(self.value))
+
+    @property
+    def minverse(self) -> ResidueElement | None:
+        """Multiplicative inverse modulo n or None if the element isn't a unit"""
+        inverse = self.__structure__.rns.inverse(self.value)
+        return None if inverse is None else self.__make__(inverse)
+
+
 class Zn(Group):
     """
     A cyclic group of integers modulo n with additive notation.
     """
 
-    def __init__(self, n: int):
+    def __init__(self, n: int, factorization: dict[int, int] = None, representation: str = "integer"):
+        """
+        :param factorization: {prime: exponent} factorization of n if it's known, otherwise n is factorized on demand
+        :param representation: one of ZN_REPRESENTATIONS. "integer" elements hold their value modulo n,
+            "rns" elements (see ResidueElement) hold the residues modulo prime power factors of n instead
+            and also support multiplication, powers and multiplicative inverses
+        """
         assert isinstance(n, int) and n > 0, "n must be non-negative integer"
+        if representation not in ZN_REPRESENTATIONS:
+            raise AttributeError(f"unknown representation: {representation}, expected one of {ZN_REPRESENTATIONS}")
+        if factorization is not None:
+            assert prod(q ** e for q, e in factorization.items()) == n, "factorization doesn't match n"
+            assert all(is_probable_prime(q) and e > 0 for q, e in factorization.items()), "factors must be primes"
+            factorization = dict(sorted(factorization.items()))
 
         self.__elements__ = range(n)
         self.n = n
+        self.__factorization__ = factorization
+        self.__rns__ = None
+        self.__unit_orders_cache__ = None
+        self.representation = representation
 
     def __call__(self, value: int) -> GroupElement:
         assert isinstance(value, int), "num must be integer"
+        if self.representation == "rns":
+            return ResidueElement(value=self.rns.decompose(value), structure=self)
         return GroupElement(value=value % self.n, structure=self)
 
     def __eq__(self, other):
@@ -372,6 +519,102 @@ class Zn(Group):
     def element_additive_inverse(self, element: GroupElement) -> GroupElement:
         return self(self.n - element.value)
 
+    @property
+    def factorization(self) -> dict[int, int]:
+        """{prime: exponent} factorization of n"""
+        if self.__factorization__ is None:
+            with PRECOMPUTATION_LOCK:
+                if self.__factorization__ is None and self.precomputation_cache is not None:
+                    self.precomputation_cache.load_group(self)
+                if self.__factorization__ is None:
+                    self.__factorization__ = factorize(self.n)
+                    if self.precomputation_cache is not None:
+                        self.precomputation_cache.store_group(self)
+        return self.__factorization__
+
+    @property
+    def rns(self) -> ResidueNumberSystem:
+        """Residue number system over the prime power factors of n, Z_n is isomorphic to their product"""
+        if self.__rns__ is None:
+            with PRECOMPUTATION_LOCK:
+                if self.__rns__ is None:
+                    self.__rns__ = ResidueNumberSystem([q ** e for q, e in self.factorization.items()] or [1])
+        return self.__rns__
+
+    def residues(self, element: GroupElement | int) -> tuple[int, ...]:
+        """Residues of the element modulo prime power factors of n"""
+        if isinstance(element, ResidueElement):
+            return element.value
+        value = element.value if isinstance(element, GroupElement) else element % self.n
+        return self.rns.decompose(value)
+
+    def from_residues(self, residues: Iterable[int]) -> GroupElement:
+        """Element with the given residues modulo prime power factors of n (Chinese remainder theorem)"""
+        if self.representation == "rns":
+            return ResidueElement(value=tuple(r % m for r, m in zip(residues, self.rns.moduli)), structure=self)
+        return self(self.rns.compose(residues))
+
+    def element_order(self, element: GroupElement | int) -> int:
+        """Additive order of the element - lcm of its orders in every Z_(q^e) component"""
+        return lcm(*(m // gcd(r, m) for r, m in zip(self.residues(element), self.rns.moduli)))
+
+    def is_generator(self, element: GroupElement | int) -> bool:
+        """Element generates Z_n iff it's a unit in every component"""
+        return all(r % q for r, q in zip(self.residues(element), self.factorization))
+
+    @property
+    def unit_group_order(self) -> int:
+        """Euler's totient of n"""
+        return prod(q ** (e - 1) * (q - 1) for q, e in self.factorization.items())
+
+    def multiplicative_order(self, element: GroupElement | int) -> int | None:
+        """
+        Order of the element in the multiplicative group of units (None if the element isn't a unit).
+        It's the lcm of orders modulo every q^e which divide the group orders q^(e-1) * (q-1).
+        """
+        orders = []
+        for r, (q, e), (order, factors) in zip(self.residues(element), self.factorization.items(), self.__unit_orders__()):
+            if r % q == 0:
+                return None
+            orders.append(multiplicative_order(r, q ** e, order, factors))
+        return lcm(*orders)
+
+    def __unit_orders__(self) -> list[tuple[int, dict[int, int]]]:
+        """Orders of the unit groups modulo every q^e together with their factorizations"""
+        if self.__unit_orders_cache__ is None:
+            with PRECOMPUTATION_LOCK:
+                if self.__unit_orders_cache__ is None and self.precomputation_cache is not None:
+                    self.precomputation_cache.load_group(self)
+                if self.__unit_orders_cache__ is None:
+                    orders = []
+                    for q, e in self.factorization.items():
+                        factors = factorize(q - 1)
+                        if e > 1:
+                            factors[q] = factors.get(q, 0) + e - 1
+                        orders.append((q ** (e - 1) * (q - 1), dict(sorted(factors.items()))))
+                    self.__unit_orders_cache__ = orders
+                    if self.precomputation_cache is not None:
+                        self.precomputation_cache.store_group(self)
+        return self.__unit_orders_cache__
+
+    def primitive_root(self) -> GroupElement | None:
+        """
+        Generator of the multiplicative group of units or None if that group isn't cyclic
+        (it's cyclic only for n = 1, 2, 4, q^e and 2q^e with an odd prime q).
+        """
+        factorization = self.factorization
+        if self.n in (1, 2, 4):
+            return self(self.n - 1)
+        if len([q for q in factorization if q != 2]) != 1 or factorization.get(2, 0) > 1:
+            return None
+
+        order = self.unit_group_order
+        factors = factorize(order)
+        for g in range(2, self.n):
+            if gcd(g, self.n) == 1 and all(pow(g, order // r, self.n) != 1 for r in factors):
+                return self(g)
+        return None
+
     @override
     @property
     def aneutral(self):
@@ -398,6 +641,10 @@ class FieldElement(GroupElement):
     def __bool__(self):
         return self != self.field.aneutral
 
+    def __reduce__(self):
+        """Elements are pickled as their field and value, so the specialized element classes don't need to be"""
+        return _field_element, (self.structure, self.value)
+
     @property
     def sqrt(self):
         return self.structure.sqrt(self)
@@ -413,6 +660,128 @@ class FieldElement(GroupElement):
         return self.structure
 
 
+def _field_element(field: Field, value: Any) -> FieldElement:
+    """Unpickles the field element"""
+    return field(value)
+
+
+def specialized_element_class(field: Fp) -> type[FieldElement]:
+    """
+    Creates a subclass of FieldElement bound to the given field.
+    Its operators work directly on integers when both operands are its instances or one of them is an int,
+    skipping the structure dispatch, type checks and structure comparisons of the generic path.
+    Any other operands are passed to the generic FieldElement operators.
+    """
+    p = field.p
+    new = object.__new__
+
+    def make(value: int) -> FieldElement:
+        """Creates an element from the already reduced integer"""
+        element = new(cls)
+        element.value = value
+        return element
+
+    # arithmetic of other backends isn't inlined, their elements use the generic path which calls the backend
+    if not field.backend.inline:
+        cls = type("BackendFieldElement", (FieldElement,), {"__structure__": field, "make": staticmethod(make)})
+        return cls
+
+    class SpecializedFieldElement(FieldElement):
+        __structure__ = field
+
+        # sums and differences of reduced values are off by at most p, a comparison is cheaper than a remainder
+        def __add__(self, other):
+            if other.__class__ is cls:
+                x = self.value + other.value
+                return make(x - p if x >= p else x)
+            if other.__class__ is int:
+                return make((self.value + other) % p)
+            return FieldElement.__add__(self, other)
+
+        __radd__ = __add__
+
+        def __sub__(self, other):
+            if other.__class__ is cls:
+                x = self.value - other.value
+                return make(x + p if x < 0 else x)
+            if other.__class__ is int:
+                return make((self.value - other) % p)
+            return FieldElement.__sub__(self, other)
+
+        def __rsub__(self, other):
+            if other.__class__ is int:
+                return make((other - self.value) % p)
+            return FieldElement.__rsub__(self, other)
+
+        def __mul__(self, other):
+            if other.__class__ is cls:
+                return make(self.value * other.value % p)
+            if other.__class__ is int:
+                return make(self.value * other % p)
+            return FieldElement.__mul__(self, other)
+
+        __rmul__ = __mul__
+
+        def __truediv__(self, other):
+            if other.__class__ is cls and other.value:
+                if field.memo is not None:  # memoized inverses, see abstractAlgebra.memo
+                    return make(self.value * field.element_multiplicative_inverse(other).value % p)
+                return make(self.value * pow(other.value, -1, p) % p)
+            return FieldElement.__truediv__(self, other)
+
+        def __pow__(self, power, modulo=None):
+            if power.__class__ is int and power >= 0 and modulo is None:
+                return make(pow(self.value, power, p))
+            return FieldElement.__pow__(self, power, modulo)
+
+        def __neg__(self):
+            return make(-self.value % p)
+
+        def __eq__(self, other):
+            if other.__class__ is cls:
+                return self.value == other.value
+            if other.__class__ is int:
+                return self.value == other % p
+            return FieldElement.__eq__(self, other)
+
+        def __bool__(self):
+            return self.value != 0
+
+    cls = SpecializedFieldElement
+    if field.special_form is not None:
+        cls = type("SpecialFormFieldElement", (cls,), special_form_operators(field, make, cls.__mul__))
+    cls.make = staticmethod(make)
+    return cls
+
+
+def special_form_operators(field: Fp, make: Callable[[int], FieldElement], fallback: Callable) -> dict[str, Callable]:
+    """
+    Multiplication of the specialized element class reducing products by shifts and additions (see special_form),
+    products with other operands are computed by the fallback
+    """
+    p = field.p
+    k, c = field.special_form
+    mask = (1 << k) - 1
+
+    if c == 1:
+        def __mul__(self, other):
+            if other.__class__ is self.__class__:
+                x = self.value * other.value
+                x = (x & mask) + (x >> k)
+                return make(x - p if x >= p else x)
+            return fallback(self, other)
+    else:
+        def __mul__(self, other):
+            if other.__class__ is self.__class__:
+                x = self.value * other.value
+                x = (x & mask) + (x >> k) * c
+                x = (x & mask) + (x >> k) * c
+                return make(x - p if x >= p else x)
+            return fallback(self, other)
+
+    return {"__mul__": __mul__, "__rmul__": __mul__}
+
+
 class Field(AbstractStructure, metaclass=ABCMeta):
     """
     Algebraic field - https://en.wikipedia.org/wiki/Field_(mathematics)
@@ -437,24 +806,50 @@ class Fp(Zn, Field):
     Field with addition and multiplication available of Z/pZ type where p is a prime number.
     """
 
-    def __init__(self, p: int):
+    def __init__(self, p: int, backend: str | ArithmeticBackend = None, reduction: str = "auto"):
         """
         :param p: assumed to be a prime number, otherwise will lead to unpredictable behavior
+        :param backend: arithmetic backend or its name (see abstractAlgebra.backends), pure Python one by default
+        :param reduction: one of FIELD_REDUCTIONS, how products of elements are reduced when the backend is inlined.
+            "special" reduces them by shifts and additions if p has a special form (see special_form),
+            "generic" always uses %, "auto" chooses the special reduction only for moduli big enough to gain from it
         """
         assert isinstance(p, int) and p > 1, "p must be a positive integer"
+        if reduction not in FIELD_REDUCTIONS:
+            raise AttributeError(f"unknown reduction: {reduction}, expected one of {FIELD_REDUCTIONS}")
         super().__init__(p)
+        self.__factorization__ = {p: 1}
         self.__nonresidue__ = None
+        self.__sqrt_constants__ = None
+        self.backend = get_backend(backend)
+        self.reduction = reduction
+        self.special_form = special_form(p) if reduction != "generic" else None
+        if reduction == "auto" and p.bit_length() < SPECIAL_REDUCTION_MIN_BITS:
+            self.special_form = None
+        assert reduction != "special" or self.special_form is not None, "p must be of the form 2^k - c with a small c"
+        self.element_class = specialized_element_class(self)
+
+    def __reduce__(self):
+        """Fields are pickled as p and the backend name, unpickled ones are interned (see interned_structure)"""
+        return interned_structure, (self.__class__, self.p, backend_reference(self.backend), self.reduction)
 
     def __call__(self, value: int | FieldElement) -> FieldElement:
 
-        # the member of equal field is given
-        if isinstance(value, FieldElement) and value.field == self:
-            value.__structure__ = self
+        # the most common case goes first
+        if value.__class__ is int:
+            return self.element_class.make(value % self.n)
+
+        # the member of this field is given (elements are immutable, so it's returned as it is)
+        if value.__class__ is self.element_class:
             return value
 
+        # the member of equal field is rewrapped, so it gets the fast operators of this field's elements
+        if isinstance(value, FieldElement) and value.field == self:
+            return self.element_class.make(value.value)
+
         # integer is given
         assert isinstance(value, int), "num must be integer or the member of the equal field"
-        return FieldElement(value=value % self.p, structure=self)
+        return self.element_class.make(value % self.n)
 
     def get_random_element(self) -> FieldElement:
         """Returns random element of this field"""
@@ -462,61 +857,149 @@ class Fp(Zn, Field):
 
     @override
     def is_quadratic_residue(self, element: FieldElement) -> bool:
-        # Euler’s criterion
-        return not element.value or element ** ((self.p-1)//2) == 1
+        return self.legendre_symbol(element) >= 0
+
+    def legendre_symbol(self, element: FieldElement | int) -> int:
+        """
+        Returns 1 for quadratic residues, -1 for non-residues and 0 for zero.
+        It's computed as Jacobi symbol using quadratic reciprocity, which needs only shifts and one remainder
+        per step and thus is several times faster than Euler's criterion a^((p-1)/2).
+        """
+        n = self.p
+        a = element.value if isinstance(element, StructureElement) else element % n
+
+        # every element of Z/2Z is a square
+        if n == 2:
+            return a
+
+        result = 1
+        while a:
+            while not a & 1:
+                a >>= 1
+                if n & 7 in (3, 5):
+                    result = -result
+            a, n = n, a
+            if a & 3 == 3 and n & 3 == 3:
+                result = -result
+            a %= n
+        return result if n == 1 else 0
 
     def get_nonresidue(self):
         """
         :return: first found quadratic non-residue or None if it doesn't exist (in Z/2Z only)
         """
-        if self.__nonresidue__ is None:
-            for candidate in self:
-                if not self.is_quadratic_residue(candidate):
-                    self.__nonresidue__ = candidate
-                    break
+        if self.__nonresidue__ is None and self.p > 2:
+            with PRECOMPUTATION_LOCK:
+                if self.__nonresidue__ is None and self.precomputation_cache is not None:
+                    self.precomputation_cache.load_field(self)
+                if self.__nonresidue__ is None:
+                    for candidate in self:
+                        if not self.is_quadratic_residue(candidate):
+                            self.__nonresidue__ = candidate
+                            break
+                    if self.precomputation_cache is not None:
+                        self.precomputation_cache.store_field(self)
         return self.__nonresidue__
 
+    @property
+    def sqrt_constants(self) -> tuple[int, int, int]:
+        """
+        Returns constants of Tonelli-Shanks algorithm: (q, s, c) such that p - 1 = q*2^s with q odd
+        and c = z^q for quadratic non-residue z.
+        """
+        if self.__sqrt_constants__ is not None:
+            return self.__sqrt_constants__
+        assert self.p > 2, "Tonelli-Shanks algorithm cannot be applied to Z/2Z"
+
+        with PRECOMPUTATION_LOCK:
+            if self.__sqrt_constants__ is None and self.precomputation_cache is not None:
+                self.precomputation_cache.load_field(self)
+            if self.__sqrt_constants__ is None:
+
+                # By factoring out powers of 2, find q and s such that p-1 = q*2^s with q odd
+                q, s = self.p - 1, 0
+                while not q % 2:
+                    s += 1
+                    q //= 2
+
+                z = self.get_nonresidue()
+                self.__sqrt_constants__ = (q, s, (z ** q).value)
+                if self.precomputation_cache is not None:
+                    self.precomputation_cache.store_field(self)
+        return self.__sqrt_constants__
+
     def sqrt(self, element: FieldElement) -> FieldElement | None:
+        if self.memo is not None:
+            return self.memo.lookup("sqrt", (element.value,), lambda: self.__sqrt__(element))
+        return self.__sqrt__(element)
+
+    def __sqrt__(self, element: FieldElement) -> FieldElement | None:
         # Tonelli–Shanks algorithm - https://en.wikipedia.org/wiki/Tonelli–Shanks_algorithm
-        MAX_ITTERATIONS = 512
 
         # trivial for Z/2Z (Tonelli-shanks cannot be applied here)
         if self.p == 2:
             return element
 
-        if not self.is_quadratic_residue(element):
-            return None
-
-        # By factoring out powers of 2, find q and s such that p-1 = q*2^s with q odd
         p = self.p
-        t = self(p - 1)
-        s = self(0)
-        while not t % 2:
-            s += 1
-            t.value //= 2
-        q = t
-
-        z = self.get_nonresidue()
-        m = s
-        c = z ** q
-        t = element ** q
-        r = element ** ((q + 1) / 2)
-
-        for _ in range(MAX_ITTERATIONS):
-            if t == 0:
-                return self(0)
-            if t == 1:
-                return r
-            i = self(1)
-            while t ** (2 ** i.value) != 1:
+        a = element.value
+        if not a:
+            return self(0)
+
+        # all the powers of the element are derived from a single exponentiation w = a^((q-1)/2):
+        # r = a^((q+1)/2) = a*w and t = a^q = r*w
+        q, m, c = self.sqrt_constants
+        w = pow(a, (q - 1) // 2, p)
+        r = a * w % p
+        t = r * w % p
+
+        while t != 1:
+            # the least i such that t^(2^i) = 1, reaching m means that a^((p-1)/2) != 1 (Euler's criterion)
+            i, t2 = 1, t * t % p
+            while t2 != 1:
+                t2 = t2 * t2 % p
                 i += 1
-            b = c ** (2 ** (m - i - 1))
+            if i == m:
+                return None
+            b = pow(c, 1 << (m - i - 1), p)
             m = i
-            c = b ** 2
-            t *= b ** 2
-            r *= b
-        else:
-            raise RuntimeError(f"Exceeded maximum number of iterations when finding sqrt of  {element}")
+            c = b * b % p
+            t = t * c % p
+            r = r * b % p
+
+        return self(r)
+
+    def multi_pow(self, a: FieldElement | int, x: int, b: FieldElement | int, y: int) -> FieldElement:
+        """
+        Returns a^x * b^y. Exponents may be negative as long as the corresponding base is not zero.
+        """
+        p = self.p
+        a = a.value if isinstance(a, StructureElement) else a % p
+        b = b.value if isinstance(b, StructureElement) else b % p
+        return self(pow(a, x, p) * pow(b, y, p))
+
+    @override
+    def elements_add(self, element: FieldElement, other: Any) -> FieldElement:
+        if isinstance(other, StructureElement):
+            if other.structure == self:
+                return self(self.backend.add(element.value, other.value, self.p))
+            raise AttributeError(f"cannot add elements from different groups: {element.structure} and {other.structure}")
+        if isinstance(other, int):
+            return self(self.backend.add(element.value, other % self.p, self.p))
+        raise NotImplementedError(f"Addition is undefined for types: {type(element)}, {type(other)}")
+
+    @override
+    def elements_sub(self, a: FieldElement, b: Any) -> FieldElement:
+        if isinstance(b, StructureElement):
+            if b.structure == self:
+                return self(self.backend.sub(a.value, b.value, self.p))
+            raise AttributeError(f"cannot subtract elements from different groups: {a.structure} and {b.structure}")
+        if isinstance(b, int):
+            return self(self.backend.sub(a.value, b % self.p, self.p))
+        raise NotImplementedError(f"Subtraction is undefined for types: {type(a)}, {type(b)}")
+
+    @override
+    def element_additive_inverse(self, element: FieldElement) -> FieldElement:
+        return self(self.backend.neg(element.value, self.p))
 
     @override
     def elements_mul(self, element: StructureElement, other: Any) -> FieldElement:
@@ -524,12 +1007,12 @@ class Fp(Zn, Field):
         # multiplication with the element of certain structure
         if isinstance(other, StructureElement):
             if other.structure == self:
-                return self((element.value * other.value) % self.p)
+                return self(self.backend.mul(element.value, other.value, self.p))
             raise AttributeError(f"cannot multiply elements from different groups: {element.structure} and {other.structure}")
 
         # with integer
         if isinstance(other, int):
-            return self((element.value * other) % self.p)
+            return self(self.backend.mul(element.value, other % self.p, self.p))
 
     @override
     def element_pow(self, base: FieldElement, power, modulo) -> FieldElement:
@@ -546,17 +1029,8 @@ class Fp(Zn, Field):
 
         assert b >= 0, "power must be non-negative integer"
 
-        # fast powering a^b modulo p
-        a = base.value
-        p = self.p
-        ans = self.mneutral.value
-        while b:
-            if b % 2:
-                ans = (ans * a) % p
-            a = a ** 2 % p
-            b //= 2
-
-        return self(ans)
+        # built-in pow does left-to-right sliding window exponentiation
+        return self(self.backend.power(base.value, b, self.p))
 
     @override
     def elements_div(self, element: FieldElement, b: Any) -> FieldElement:
@@ -607,14 +1081,50 @@ class Fp(Zn, Field):
         if element == self.aneutral:
             return None
 
-        a, b = element.value, self.p
-        inv, inv_prev = 0, 1
-        while b != 0:
-            q = a // b
-            a, b = b, a - q * b
-            inv, inv_prev = inv_prev - q * inv, inv
-
-        return self(inv_prev)
+        if self.memo is not None:
+            return self.memo.lookup("inverse", (element.value,), lambda: self(self.backend.inverse(element.value, self.p)))
+        return self(self.backend.inverse(element.value, self.p))
+
+    def add_many(self, a: Iterable[FieldElement | int], b: Iterable[FieldElement | int]) -> list[FieldElement]:
+        """Element-wise sums of two sequences computed by the bulk operation of the backend"""
+        return [self(value) for value in self.backend.add_many(self.__values__(a), self.__values__(b), self.p)]
+
+    def sub_many(self, a: Iterable[FieldElement | int], b: Iterable[FieldElement | int]) -> list[FieldElement]:
+        return [self(value) for value in self.backend.sub_many(self.__values__(a), self.__values__(b), self.p)]
+
+    def mul_many(self, a: Iterable[FieldElement | int], b: Iterable[FieldElement | int]) -> list[FieldElement]:
+        return [self(value) for value in self.backend.mul_many(self.__values__(a), self.__values__(b), self.p)]
+
+    def pow_many(self, a: Iterable[FieldElement | int], e: Iterable[int]) -> list[FieldElement]:
+        e = list(e)
+        assert all(k >= 0 for k in e), "powers must be non-negative integers"
+        return [self(value) for value in self.backend.power_many(self.__values__(a), e, self.p)]
+
+    def inverse_many(self, a: Iterable[FieldElement | int]) -> list[FieldElement | None]:
+        """Inverses of all the elements (None for zeros), computed with a single inversion by default"""
+        return [None if value is None else self(value) for value in self.backend.inverse_many(self.__values__(a), self.p)]
+
+    def reduce(self, x: int) -> int:
+        """x mod p, non-negative x are reduced by folds if the field uses its special form (see special_form)"""
+        if self.special_form is None or x < 0:
+            return x % self.p
+        k, c = self.special_form
+        mask = (1 << k) - 1
+        while x > mask:
+            x = (x & mask) + (x >> k) * c
+        return x - self.p if x >= self.p else x
+
+    def sum(self, elements: Iterable[FieldElement | int]) -> FieldElement:
+        """Sum of the elements, it's accumulated unreduced and reduced once"""
+        return self.element_class.make(self.reduce(sum(self.__values__(elements))))
+
+    def dot(self, a: Iterable[FieldElement | int], b: Iterable[FieldElement | int]) -> FieldElement:
+        """Sum of the products of corresponding elements, products are accumulated unreduced and reduced once"""
+        return self.element_class.make(self.reduce(sum(map(operator.mul, self.__values__(a), self.__values__(b)))))
+
+    def __values__(self, elements: Iterable[FieldElement | int]) -> list[int]:
+        cls = self.element_class
+        return [element.value if element.__class__ is cls else self(element).value for element in elements]
 
     def __contains__(self, item):
         from_equal_field = isinstance(item, FieldElement) and item.structure == self
@@ -0,0 +1,152 @@
+"""
+Batches of field elements and curve points placed in shared memory, so worker processes read them without copying.
+A batch is pickled as the name of its memory block, its length and the (interned) structure,
+elements are rebuilt only when a worker accesses them.
+
+Usage:
+    with SharedElements.from_elements(points) as batch, ProcessPoolExecutor() as executor:
+        results = executor.map(work, repeat(batch), range(0, len(batch), 1000))
+"""
+from __future__ import annotations
+
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from abstractAlgebra.structures import *
+from abstractAlgebra.elliptic_curves import *
+
+
+def _attach_elements(structure: Fp | EllipticCurve, name: str, length: int) -> SharedElements:
+    """Unpickles the batch by attaching to its memory block"""
+    return SharedElements(structure, length, name=name)
+
+
+class SharedElements:
+    """
+    Fixed size sequence of elements of a prime field or of points of a curve over it stored in shared memory.
+    Every coordinate takes the byte length of p (little endian), points take two of them
+    and the point at infinity is stored with x = p.
+
+    The creating process owns the memory block and unlinks it on exit of the context manager (or by unlink),
+    other processes attach to it by unpickling the batch and only close it.
+    """
+
+    def __init__(self, structure: Fp | EllipticCurve, length: int, *, name: str | None = None):
+        """
+        :param name: name of an existing memory block to attach to, a new zero-filled block is created by default
+        """
+        assert isinstance(structure, (Fp, EllipticCurve)), "only elements of prime fields and curve points can be shared"
+        assert length >= 0, "length must be non-negative"
+        self.structure = structure
+        self.__length__ = length
+        self.__width__ = (structure.p.bit_length() + 7) // 8
+        self.__coordinates__ = 2 if isinstance(structure, EllipticCurve) else 1
+        self.__owner__ = name is None
+        if self.__owner__:
+            size = max(1, length * self.__coordinates__ * self.__width__)
+            self.__memory__ = SharedMemory(create=True, size=size)
+        elif sys.version_info >= (3, 13):
+            self.__memory__ = SharedMemory(name, track=False)  # the owner is responsible for unlinking
+        else:
+            # older versions register attached blocks too, so the tracker of a worker would unlink them on its exit
+            self.__memory__ = SharedMemory(name)
+            resource_tracker.unregister(self.__memory__._name, "shared_memory")
+        self.__buffer__ = self.__memory__.buf
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[FieldElement | EllipticCurvePoint]) -> SharedElements:
+        """Copies non-empty sequence of elements of a single structure to a new memory block"""
+        elements = list(elements)
+        assert elements, "can't infer the structure of an empty batch"
+        batch = cls(elements[0].structure, len(elements))
+        for index, element in enumerate(elements):
+            batch[index] = element
+        return batch
+
+    @property
+    def name(self) -> str:
+        return self.__memory__.name
+
+    def __reduce__(self):
+        """Batches are pickled as the name of the memory block, not the elements"""
+        return _attach_elements, (self.structure, self.name, self.__length__)
+
+    def __len__(self) -> int:
+        return self.__length__
+
+    def __offset__(self, index: int) -> int:
+        if index < 0:
+            index += self.__length__
+        if not 0 <= index < self.__length__:
+            raise IndexError(f"index {index} out of range of the batch of {self.__length__} elements")
+        return index * self.__coordinates__ * self.__width__
+
+    def __read__(self, offset: int) -> int:
+        return int.from_bytes(self.__buffer__[offset:offset + self.__width__], "little")
+
+    def __write__(self, offset: int, value: int) -> None:
+        self.__buffer__[offset:offset + self.__width__] = value.to_bytes(self.__width__, "little")
+
+    def value(self, index: int) -> int | tuple[int, int] | None:
+        """
+        Raw value of the element without building it: the integer of a field element,
+        coordinates of a point or None for the point at infinity
+        """
+        offset = self.__offset__(index)
+        if self.__coordinates__ == 1:
+            return self.__read__(offset)
+        x = self.__read__(offset)
+        return None if x == self.structure.p else (x, self.__read__(offset + self.__width__))
+
+    def __getitem__(self, index: int | slice) -> FieldElement | EllipticCurvePoint | list:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__length__))]
+        value = self.value(index)
+        if self.__coordinates__ == 1:
+            return self.structure(value)
+        return self.structure.aneutral if value is None else self.structure._point(*value)
+
+    def __setitem__(self, index: int, element: FieldElement | EllipticCurvePoint) -> None:
+        assert element.structure == self.structure, f"{element} is not an element of {self.structure}"
+        offset = self.__offset__(index)
+        if self.__coordinates__ == 1:
+            self.__write__(offset, element.value)
+        elif element.is_identity:
+            self.__write__(offset, self.structure.p)
+            self.__write__(offset + self.__width__, 0)
+        else:
+            self.__write__(offset, element.x.value)
+            self.__write__(offset + self.__width__, element.y.value)
+
+    def __iter__(self) -> Iterable[FieldElement | EllipticCurvePoint]:
+        return (self[i] for i in range(self.__length__))
+
+    def close(self) -> None:
+        """Detaches from the memory block, the batch can't be accessed anymore"""
+        if self.__buffer__ is not None:
+            self.__buffer__.release()
+            self.__buffer__ = None
+            self.__memory__.close()
+
+    def unlink(self) -> None:
+        """Frees the memory block, processes attached to it keep their mappings until they close them"""
+        self.close()
+        if self.__owner__:
+            if sys.version_info < (3, 13):
+                # a worker sharing the tracker of this process (forked or this very process) unregistered the block
+                resource_tracker.register(self.__memory__._name, "shared_memory")
+            self.__memory__.unlink()
+            self.__owner__ = False
+
+    def __enter__(self) -> SharedElements:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.unlink()
+
+    def __str__(self):
+        return f"SharedElements({self.structure}, {self.__length__} elements)"
+
+    def __repr__(self):
+        return str(self)
@@ -1,5 +1,6 @@
+import pickle
 import unittest
-from abstractAlgebra.structures import Fp
+from abstractAlgebra.structures import Fp, FieldElement
 from hypothesis import given, assume, example, strategies as st
 
 small_primes = [
@@ -106,6 +107,106 @@ class FpTest(unittest.TestCase):
         assume(field.is_quadratic_residue(num))
         self.assertEqual(num.sqrt ** 2, a % p, f"Wrong sqrt for {a} (mod {p}")
 
+    @given(
+        a=st.integers(min_value=0, max_value=10 ** 6),
+        p=prime_numbers
+    )
+    def test_legendre_symbol(self, a, p):
+        """Legendre symbol must agree with Euler's criterion, sqrt must exist only for quadratic residues"""
+        assume(2 < p)
+        field = Fp(p)
+        euler = pow(a, (p - 1) // 2, p)
+        self.assertEqual(field.legendre_symbol(a) % p, euler, f"Wrong Legendre symbol of {a} (mod {p})")
+        self.assertEqual(field(a).sqrt is not None, euler != p - 1, f"Wrong sqrt existence for {a} (mod {p})")
+
+    @given(
+        a=st.integers(min_value=1, max_value=2000),
+        b=st.integers(min_value=1, max_value=2000),
+        x=st.integers(min_value=-100, max_value=100),
+        y=st.integers(min_value=-100, max_value=100),
+        p=prime_numbers
+    )
+    def test_multi_pow(self, a, b, x, y, p):
+        """Test that a^x * b^y computed at once equals to the product of separate powers"""
+        assume(a % p and b % p)
+        field = Fp(p)
+        expected = field(a) ** abs(x) * field(b) ** abs(y)
+        self.assertEqual(field.multi_pow(a, abs(x), b, abs(y)), expected)
+        self.assertEqual(field.multi_pow(a, x, b, y) * field.multi_pow(a, -x, b, -y), 1)
+
+    @given(
+        a=st.integers(min_value=-2000, max_value=2000),
+        b=st.integers(min_value=-2000, max_value=2000),
+        p=prime_numbers
+    )
+    def test_specialized_elements(self, a, b, p):
+        """Test that the fast operators agree with the generic ones, also with mixed operands"""
+        field = Fp(p)
+        x, y = field(a), field(b)
+        gx, gy = FieldElement(value=a % p, structure=field), FieldElement(value=b % p, structure=field)
+        self.assertIsInstance(x, field.element_class)
+
+        for fast, generic in ((x + y, gx + gy), (x - y, gx - gy), (x * y, gx * gy), (-x, -gx), (x ** 3, gx ** 3),
+                              (x + b, gx + b), (b - x, b - gx), (b * x, b * gx), (x * gy, gx * y)):
+            self.assertEqual(fast.value, generic.value)
+            self.assertEqual(fast, generic)
+        self.assertEqual(x == b, gx == b)
+        self.assertEqual(bool(x), bool(gx))
+        if b % p:
+            self.assertEqual((x / y).value, (gx / gy).value)
+        self.assertTrue(x == Fp(p)(a))  # equal fields have different element classes
+        self.assertIs(field(x), x)
+        other = Fp(p)
+        self.assertIs(other(x).__class__, other.element_class)  # rewrapped to keep the fast path for mixed operands
+        self.assertIs(field(gx).__class__, field.element_class)
+        self.assertEqual(other(x), x)
+
+    @given(a=st.integers(), p=st.sampled_from(small_primes + [2 ** 127 - 1]), backend=st.sampled_from(["python", "numpy"]))
+    def test_pickle(self, a, p, backend):
+        element = Fp(p, backend)(a)
+        copy = pickle.loads(pickle.dumps(element))
+        self.assertEqual(copy, element)
+        self.assertEqual(copy.field, element.field)
+        self.assertEqual(copy.field.backend.name, backend)
+        self.assertEqual((copy * 3).value, (element * 3).value)
+
+    @given(
+        p=st.sampled_from([2 ** 521 - 1, 2 ** 255 - 19, 2 ** 384 - 2 ** 128 - 2 ** 96 + 2 ** 32 - 1,
+                           2 ** 192 - 2 ** 64 - 1, 2 ** 127 - 1, 2 ** 61 - 1, 31]),
+        a=st.integers(min_value=-2 ** 600, max_value=2 ** 600),
+        b=st.integers(min_value=-2 ** 600, max_value=2 ** 600),
+        values=st.lists(st.integers(min_value=0, max_value=2 ** 600), max_size=20)
+    )
+    @example(p=2 ** 521 - 1, a=-1, b=-1, values=[2 ** 521 - 2] * 20)
+    @example(p=2 ** 255 - 19, a=-1, b=-1, values=[2 ** 255 - 20] * 20)
+    def test_special_form_reduction(self, p, a, b, values):
+        """Shift-and-add reduction must agree with the generic one, including the extreme products"""
+        special, generic = Fp(p, reduction="special"), Fp(p, reduction="generic")
+        self.assertIsNotNone(special.special_form)
+        self.assertIsNone(generic.special_form)
+        x, y = special(a), special(b)
+        self.assertEqual((x * y).value, (generic(a) * generic(b)).value)
+        self.assertEqual((x * x).value, a * a % p)
+        self.assertEqual((x * 7).value, a * 7 % p)
+        self.assertEqual((x + y).value, (a + b) % p)
+        self.assertEqual((x - y).value, (a - b) % p)
+        self.assertEqual(special.reduce(a * b), a * b % p)
+        for field in (special, generic):
+            self.assertEqual(field.sum(values).value, sum(values) % p)
+            self.assertEqual(field.dot(values, reversed(values)).value, sum(map(int.__mul__, values, values[::-1])) % p)
+
+    def test_reduction_choice(self):
+        self.assertEqual(Fp(2 ** 521 - 1).special_form, (521, 1))
+        self.assertIsNone(Fp(2 ** 255 - 19).special_form)  # % is as fast for smaller moduli
+        self.assertEqual(Fp(2 ** 255 - 19, reduction="special").special_form, (255, 19))
+        self.assertIsNone(Fp(2 ** 521 - 1, reduction="generic").special_form)
+        with self.assertRaises(AssertionError):
+            Fp(2 ** 256 - 2 ** 224 + 2 ** 192 + 2 ** 96 - 1, reduction="special")  # P-256 has too big low terms
+        with self.assertRaises(AttributeError):
+            Fp(31, reduction="barrett")
+        copy = pickle.loads(pickle.dumps(Fp(2 ** 255 - 19, reduction="special")(5)))
+        self.assertEqual(copy.field.special_form, (255, 19))
+
 
 if __name__ == '__main__':
     unittest.main()
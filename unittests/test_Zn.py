@@ -0,0 +1,126 @@
+import unittest
+from math import gcd, prod
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra.structures import Zn
+from abstractAlgebra.number_theory import *
+
+
+def brute_multiplicative_order(a, n):
+    if gcd(a, n) != 1:
+        return None
+    k, x = 1, a % n
+    while x != 1 % n:
+        x, k = x * a % n, k + 1
+    return k
+
+
+class ZnTest(unittest.TestCase):
+
+    @given(n=st.integers(1, 5000))
+    def test_primality(self, n):
+        self.assertEqual(is_probable_prime(n), n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1)))
+
+    @settings(max_examples=50, deadline=None)
+    @given(factors=st.lists(st.sampled_from([2, 3, 1009, 65537, 2 ** 31 - 1, 1000000007, 2 ** 61 - 1]), max_size=5))
+    def test_factorize(self, factors):
+        n = prod(factors)
+        expected = {}
+        for q in factors:
+            expected[q] = expected.get(q, 0) + 1
+        self.assertEqual(factorize(n), dict(sorted(expected.items())))
+
+    @given(
+        n=st.integers(1, 10 ** 12),
+        a=st.integers(),
+        b=st.integers()
+    )
+    def test_residues(self, n, a, b):
+        group = Zn(n)
+        rns = group.rns
+        ra, rb = group.residues(a), group.residues(b)
+        self.assertEqual(group.from_residues(ra), group(a))
+        self.assertEqual(rns.compose(rns.add(ra, rb)), (a + b) % n)
+        self.assertEqual(rns.compose(rns.sub(ra, rb)), (a - b) % n)
+        self.assertEqual(rns.compose(rns.mul(ra, rb)), a * b % n)
+        self.assertEqual(rns.compose(rns.power(ra, 5)), pow(a, 5, n))
+        inverse = rns.inverse(ra)
+        self.assertEqual(inverse is None, gcd(a, n) != 1)
+        if inverse is not None:
+            self.assertEqual(rns.compose(rns.mul(ra, inverse)), 1 % n)
+
+    @given(
+        n=st.integers(1, 10 ** 12),
+        a=st.integers(),
+        b=st.integers()
+    )
+    def test_rns_representation(self, n, a, b):
+        """Elements of the rns representation must hold residues and agree with the integer arithmetic modulo n"""
+        group = Zn(n, representation="rns")
+        x, y = group(a), group(b)
+        self.assertEqual(x.value, group.rns.decompose(a))
+        self.assertEqual(int(x + y), (a + b) % n)
+        self.assertEqual(int(x - y), (a - b) % n)
+        self.assertEqual(int(x * y), a * b % n)
+        self.assertEqual(int(b * x), a * b % n)
+        self.assertEqual(int(-x), -a % n)
+        self.assertEqual(int(x ** 5), pow(a, 5, n))
+        self.assertEqual(x.minverse is None, gcd(a, n) != 1)
+        if x.minverse is not None:
+            self.assertEqual(int(x ** -2), pow(a, -2, n))
+        self.assertEqual(x == y, (a - b) % n == 0)
+        self.assertEqual(x < y, a % n < b % n)
+        self.assertEqual(x, Zn(n)(a))
+        self.assertEqual(group.from_residues(x.value), x)
+        self.assertEqual(group.element_order(x), Zn(n).element_order(a))
+        self.assertEqual(group.multiplicative_order(x), Zn(n).multiplicative_order(a))
+
+    def test_rns_errors(self):
+        with self.assertRaises(AttributeError):
+            Zn(10, representation="montgomery")
+        with self.assertRaises(AttributeError):
+            Zn(10, representation="rns")(1) + Zn(11)(1)
+
+    @given(n=st.integers(1, 400), a=st.integers(0, 400))
+    def test_orders(self, n, a):
+        group = Zn(n)
+        self.assertEqual(group.element_order(a), n // gcd(a, n))
+        self.assertEqual(group.is_generator(a), gcd(a, n) == 1)
+        self.assertEqual(group.multiplicative_order(a), brute_multiplicative_order(a, n))
+
+        root = group.primitive_root()
+        orders = [brute_multiplicative_order(g, n) for g in range(n) if gcd(g, n) == 1]
+        cyclic = max(orders) == len(orders)
+        self.assertEqual(root is not None, cyclic)
+        if root is not None:
+            self.assertEqual(group.multiplicative_order(root), len(orders))
+
+    @settings(deadline=None)
+    @given(low=st.integers(0, 10 ** 6), length=st.integers(0, 3000))
+    def test_primes_between(self, low, length):
+        primes = list(primes_between(low, low + length))
+        self.assertEqual(primes, [q for q in range(low, low + length + 1) if is_probable_prime(q)])
+
+    def test_ecm(self):
+        p, q = 1099511627791, 2 ** 89 - 1  # a 40-bit factor of a 129-bit number
+        self.assertIn(ecm(p * q, 2000, curves=200), (p, q))
+        self.assertIn(ecm(p * q, 2000, curves=200, max_workers=2), (p, q))
+
+    @settings(max_examples=3, deadline=None)
+    @given(st.sampled_from([1099511627791, 2 ** 31 - 1, 10000000019]))
+    def test_factorize_ecm(self, p):
+        """Composites above ECM_MIN_BITS are split by ECM"""
+        q = 2 ** 89 - 1
+        self.assertEqual(factorize(p * q * q), {p: 1, q: 2})
+
+    def test_given_factorization(self):
+        n = (2 ** 61 - 1) * (2 ** 89 - 1) ** 2
+        group = Zn(n, factorization={2 ** 89 - 1: 2, 2 ** 61 - 1: 1})
+        self.assertEqual(group.rns.moduli, (2 ** 61 - 1, (2 ** 89 - 1) ** 2))
+        self.assertEqual(group.element_order(2 ** 89 - 1), n // (2 ** 89 - 1))
+        with self.assertRaises(AssertionError):
+            Zn(n, factorization={2 ** 61 - 1: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
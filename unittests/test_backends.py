@@ -0,0 +1,89 @@
+import unittest
+from hypothesis import given, strategies as st
+
+from abstractAlgebra.backends import *
+from abstractAlgebra.elliptic_curves import EllipticCurve, SCALAR_MUL_METHODS
+from abstractAlgebra.structures import Fp
+
+primes = st.sampled_from([2, 3, 97, 65537, 2 ** 31 - 1, 2 ** 61 - 1, 2 ** 127 - 1])
+
+
+class BrokenBackend(PythonBackend):
+    inline = False
+
+    def mul(self, a, b, p):
+        return (a * b + (a == 5)) % p
+
+
+class TestBackends(unittest.TestCase):
+
+    @given(p=primes, values=st.lists(st.tuples(st.integers(0), st.integers(0)), max_size=20))
+    def test_agree_with_reference(self, p, values):
+        reference = Fp(p)
+        a = [reference(x) for x, _ in values]
+        b = [reference(y) for _, y in values]
+        for name in available_backends():
+            field = Fp(p, backend=CrossCheckBackend(name))
+            x = [field(v.value) for v in a]
+            y = [field(v.value) for v in b]
+            self.assertEqual(field.add_many(x, y), [u + v for u, v in zip(a, b)])
+            self.assertEqual(field.sub_many(x, y), [u - v for u, v in zip(a, b)])
+            self.assertEqual(field.mul_many(x, y), [u * v for u, v in zip(a, b)])
+            self.assertEqual(field.pow_many(x, [v.value for v in b]), [u ** v.value for u, v in zip(a, b)])
+            self.assertEqual(field.inverse_many(x), [u.minverse for u in a])
+            for u, v, ru, rv in zip(x, y, a, b):
+                self.assertEqual((u * v + u - v) ** 3, (ru * rv + ru - rv) ** 3)
+                self.assertEqual(-u, -ru)
+                if v:
+                    self.assertEqual(u / v, ru / rv)
+
+    def test_cross_check(self):
+        strict = Fp(97, backend=CrossCheckBackend(BrokenBackend()))
+        self.assertEqual(strict(4) * strict(6), 24)
+        with self.assertRaises(RuntimeError):
+            strict(5) * strict(6)
+
+        lenient = CrossCheckBackend(BrokenBackend(), strict=False)
+        field = Fp(97, backend=lenient)
+        self.assertEqual(field(5) * field(6), 30)  # reference result is used
+        self.assertEqual(field.mul_many([5, 2], [7, 3]), [35, 6])
+        self.assertEqual(len(lenient.mismatches), 2)
+
+    def test_curve_arithmetic_is_checked(self):
+        """Point formulas of curves over cross-check backends must go through the backend"""
+        class OffByOneBackend(PythonBackend):
+            inline = False
+
+            def mul(self, a, b, p):
+                return (a * b + 1) % p
+
+        reference = EllipticCurve(2, 3, 1000003)
+        backend = CrossCheckBackend(OffByOneBackend(), strict=False)
+        curve = EllipticCurve(2, 3, 1000003, backend=backend)
+        point = curve(reference.get_random_point().xy)
+        self.assertEqual((point + point).xy, (reference(point.xy) * 2).xy)
+        self.assertTrue(backend.mismatches)
+
+        checked = EllipticCurve(2, 3, 1000003, backend=CrossCheckBackend("python"))
+        point, other = checked(point.xy), checked(reference.get_random_point().xy)
+        for method in SCALAR_MUL_METHODS:
+            self.assertEqual(checked.multiply(point, 12345, method).xy, reference.multiply(reference(point.xy), 12345).xy)
+        expected = reference.multiply(reference(point.xy), 3) + reference.multiply(reference(other.xy), 5)
+        self.assertEqual(checked.multi_multiply([point, other], [3, 5]).xy, expected.xy)
+        self.assertEqual(checked.sum_points([point, other, -point]).xy, other.xy)
+        with self.assertRaises(RuntimeError):  # already the discriminant is computed by the broken backend
+            EllipticCurve(2, 3, 1000003, backend=CrossCheckBackend(OffByOneBackend()))
+
+    def test_selection(self):
+        self.assertIs(Fp(7).backend, get_backend("python"))
+        self.assertIsInstance(Fp(7, backend="numpy").backend, NumpyBackend)
+        self.assertIsInstance(EllipticCurve(2, 3, 97, backend="numpy").field.backend, NumpyBackend)
+        with self.assertRaises(AttributeError):
+            Fp(7, backend="fortran")
+        if "gmpy2" not in available_backends():
+            with self.assertRaises(RuntimeError):
+                Fp(7, backend="gmpy2")
+
+
+if __name__ == '__main__':
+    unittest.main()
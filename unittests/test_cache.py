@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+
+from abstractAlgebra import cache
+from abstractAlgebra.structures import Fp, Zn
+from abstractAlgebra.elliptic_curves import *
+from abstractAlgebra.curve_search import count_points
+from abstractAlgebra.homomorphic import DiscreteLogTable
+
+
+class TestPrecomputationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = cache.enable(self.directory.name)
+
+    def tearDown(self):
+        cache.disable()
+        self.directory.cleanup()
+
+    def test_field_constants(self):
+        """Constants computed by one field must be loaded by a new one instead of being recomputed"""
+        field = Fp(1000033)
+        constants = field.sqrt_constants
+        nonresidue = field.get_nonresidue()
+
+        other_process = cache.PrecomputationCache(self.directory.name)
+        new_field = Fp(1000033)
+        self.assertTrue(other_process.load_field(new_field))
+        self.assertEqual(new_field.__sqrt_constants__, constants)
+        self.assertEqual(new_field.__nonresidue__, nonresidue)
+        self.assertFalse(other_process.load_field(Fp(1000037)))
+
+    def test_corrupted_field_constants(self):
+        """Invalid cached constants must be ignored and recomputed"""
+        field = Fp(1000033)
+        self.cache.update_metadata(field, nonresidue=4, sqrt_constants=[31251, 5, 4])
+        other_process = cache.PrecomputationCache(self.directory.name)
+        self.assertFalse(other_process.load_field(Fp(1000033)))
+        self.assertIn(Fp(1000033)(9).sqrt, (3, 1000033 - 3))
+
+        # constants that don't match the cached non-residue are dropped as well
+        z = Fp(1000033).get_nonresidue().value
+        self.cache.update_metadata(field, nonresidue=z, sqrt_constants=[31251, 5, 1])
+        new_field = Fp(1000033)
+        self.assertTrue(cache.PrecomputationCache(self.directory.name).load_field(new_field))
+        self.assertIsNone(new_field.__sqrt_constants__)
+        self.assertEqual(new_field(16).sqrt ** 2, 16)
+
+    def test_curve_constants(self):
+        curve = EllipticCurve(0, 7, 1000033)
+        order = curve.order
+
+        other_process = cache.PrecomputationCache(self.directory.name)
+        new_curve = EllipticCurve(0, 7, 1000033)
+        self.assertTrue(other_process.load_curve(new_curve))
+        self.assertEqual(new_curve.order, order)
+
+        # absence of GLV parameters is cached as well
+        curve = EllipticCurve(1, 7, 1000033)
+        self.assertIsNone(curve.glv_parameters)
+        self.assertTrue(other_process.load_curve(curve))
+
+    def test_tables(self):
+        curve = EllipticCurve(0, 7, 1000033)
+        values = [0, 1, 2 ** 70, 1000033, 255]
+        self.cache.store_table(curve, "multiples", values)
+        table = self.cache.load_table(curve, "multiples")
+        self.assertEqual(list(table), values)
+        self.assertEqual(table[2], 2 ** 70)
+        self.assertIsNone(self.cache.load_table(curve, "missing"))
+
+    def test_group_factorizations(self):
+        """Factorizations of n and of the unit group orders must be loaded instead of being recomputed"""
+        n = 1000003 * 999983 ** 2
+        group = Zn(n)
+        order = group.multiplicative_order(2)
+        new_group = Zn(n)
+        self.assertTrue(cache.PrecomputationCache(self.directory.name).load_group(new_group))
+        self.assertEqual(new_group.__factorization__, {999983: 2, 1000003: 1})
+        self.assertEqual(new_group.__unit_orders_cache__, group.__unit_orders__())
+        self.assertEqual(new_group.multiplicative_order(2), order)
+
+        # a factorization that doesn't multiply up to n is ignored
+        self.cache.store_table(group, "factorization", [3, 1, 5, 1])
+        self.assertFalse(cache.PrecomputationCache(self.directory.name).load_group(Zn(n)))
+        self.assertEqual(Zn(n).factorization, {999983: 2, 1000003: 1})
+
+    def test_curve_order(self):
+        curve = EllipticCurve(2, 3, 1000003)
+        order = count_points(curve)
+        self.assertEqual(self.cache.metadata(curve)["order"], order)
+        self.assertEqual(cache.PrecomputationCache(self.directory.name).load_order(EllipticCurve(2, 3, 1000003)), order)
+
+        self.cache.update_metadata(curve, order=order + 1)
+        other_process = cache.PrecomputationCache(self.directory.name)
+        self.assertIsNone(other_process.load_order(curve))
+        self.assertEqual(count_points(curve), order)
+
+    def test_discrete_log_tables(self):
+        """Baby steps of the generator must be loaded from the table stored by an equal one"""
+        curve = EllipticCurve(2, 3, 1000003)
+        alpha = curve.get_random_point()
+        table = DiscreteLogTable(alpha, 10000)
+        new_table = DiscreteLogTable(curve(alpha.x.value, alpha.y.value), 2500)  # a prefix of the stored steps
+        self.assertEqual(new_table.__baby_steps__, {x: step for x, step in table.__baby_steps__.items() if step[0] <= new_table.size})
+        self.assertEqual(new_table.log(curve.multiply(alpha, 2024)), 2024)
+        self.assertEqual(DiscreteLogTable(alpha, 40000).log(curve.multiply(alpha, 31337)), 31337)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from abstractAlgebra.__main__ import main
+
+
+class TestCLI(unittest.TestCase):
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = lambda name: os.path.join(directory, name)
+            self.assertEqual(main(["keygen", "--bits", "89", "--public", path("pub.json"), "--private", path("key.json")]), 0)
+
+            messages = [str(i * 7919) for i in range(100)]
+            with open(path("messages.txt"), "w") as file:
+                file.write("\n".join(messages) + "\n")
+
+            for jobs, batch_size in ((1, 256), (2, 7)):
+                args = ["--jobs", str(jobs), "--batch-size", str(batch_size)]
+                main(["encrypt", "--key", path("pub.json"), path("messages.txt"), path("encrypted.txt")] + args)
+                main(["decrypt", "--key", path("key.json"), path("encrypted.txt"), path("decrypted.txt")] + args)
+                with open(path("encrypted.txt")) as file:
+                    self.assertEqual(len(file.readlines()), len(messages))
+                with open(path("decrypted.txt")) as file:
+                    self.assertEqual(file.read().split(), messages)
+
+            # public key cannot decrypt
+            self.assertEqual(main(["decrypt", "--key", path("pub.json"), path("encrypted.txt"), path("decrypted.txt")]), 1)
+
+    def test_invalid_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = lambda name: os.path.join(directory, name)
+            keygen = ["keygen", "--bits", "61", "--public", path("pub.json"), "--private", path("key.json")]
+            with redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(main(keygen + ["--parameter", "100"]), 1)
+            self.assertIn("parameter", stderr.getvalue())
+            self.assertEqual(main(keygen), 0)
+            self.assertEqual(main(keygen + ["--search", "--jobs", "2"]), 0)
+
+            for jobs in ("1", "2"):
+                for content, line in (("1\n\n2\n" + str(2 ** 61) + "\n", 4), ("1\nabc\n", 2)):
+                    with open(path("messages.txt"), "w") as file:
+                        file.write(content)
+                    with redirect_stderr(io.StringIO()) as stderr:
+                        code = main(["encrypt", "--key", path("pub.json"), path("messages.txt"), path("encrypted.txt"),
+                                     "--jobs", jobs])
+                    self.assertEqual(code, 1)
+                    self.assertIn(f"line {line}", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from hypothesis import given, assume, settings, strategies as st
+
+from abstractAlgebra.curve_search import *
+from abstractAlgebra.number_theory import is_probable_prime
+
+
+def brute_count_points(a: int, b: int, p: int) -> int:
+    squares = {}
+    for y in range(p):
+        squares[y * y % p] = squares.get(y * y % p, 0) + 1
+    return 1 + sum(squares.get((x ** 3 + a * x + b) % p, 0) for x in range(p))
+
+
+class TestCurveSearch(unittest.TestCase):
+
+    @settings(deadline=None)
+    @given(
+        p=st.sampled_from([5, 7, 11, 13, 17, 101, 1009, 10007]),
+        a=st.integers(0, 10 ** 4),
+        b=st.integers(0, 10 ** 4)
+    )
+    def test_count_points(self, p, a, b):
+        assume((4 * a ** 3 + 27 * b * b) % p)
+        self.assertEqual(count_points(EllipticCurve(a, b, p)), brute_count_points(a, b, p))
+
+    @settings(max_examples=2, deadline=None)
+    @given(a=st.integers(1, 2 ** 89), b=st.integers(1, 2 ** 89))
+    def test_count_points_schoof(self, a, b):
+        """89-bit fields need Schoof's algorithm before BSGS"""
+        p = 2 ** 89 - 1
+        assume((4 * a ** 3 + 27 * b * b) % p)
+        curve = EllipticCurve(a, b, p)
+        order = count_points(curve)
+        self.assertLessEqual((p + 1 - order) ** 2, 4 * p, "order must lie in the Hasse interval")
+        for _ in range(3):
+            self.assertTrue(curve.multiply(curve.get_random_point(), order).is_identity)
+
+    def test_prime_subgroup_order(self):
+        p = 1000003
+        self.assertIsNone(prime_subgroup_order(p, p), "anomalous curves must be rejected")
+        self.assertEqual(prime_subgroup_order(1000082, 1000081, 2), None, "supersingular curves have embedding degree 2")
+        self.assertEqual(prime_subgroup_order(1000151, p), 1000151)
+        self.assertEqual(prime_subgroup_order(4 * 250007, p, 4), 250007)
+        self.assertIsNone(prime_subgroup_order(4 * 250007, p, 3))
+
+    def test_find_curves(self):
+        p = 1000003
+        for max_workers in (1, 2):
+            curves = find_curves(p, 2, max_cofactor=4, max_workers=max_workers)
+            self.assertEqual(len(curves), 2)
+            for curve, order in curves:
+                self.assertEqual(order, brute_count_points(curve.a.value, curve.b.value, p))
+                self.assertIsNotNone(prime_subgroup_order(order, p, 4))
+        with self.assertRaises(RuntimeError):
+            find_curves(p, max_candidates=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import unittest
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra.ecies import *
+from abstractAlgebra.elgamal import elgamal_genkey
+
+
+class TestECIES(unittest.TestCase):
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        data=st.binary(max_size=3000),
+        chunk_size=st.integers(1, 1000),
+        p=st.sampled_from([1000003, 2 ** 127 - 1])
+    )
+    def test_round_trip(self, data, chunk_size, p):
+        alpha, beta, pk = elgamal_genkey(p)
+        encrypted = io.BytesIO()
+        ecies_encrypt_stream(io.BytesIO(data), encrypted, alpha, beta, chunk_size)
+        decrypted = io.BytesIO()
+        ecies_decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, alpha.curve, pk, chunk_size)
+        self.assertEqual(decrypted.getvalue(), data)
+        self.assertEqual(ecies_decrypt(ecies_encrypt(data, alpha, beta), alpha.curve, pk), data)
+
+    def test_tampering(self):
+        alpha, beta, pk = elgamal_genkey(2 ** 127 - 1)
+        curve = alpha.curve
+        data = bytes(range(256)) * 20
+        encrypted = io.BytesIO()
+        ecies_encrypt_stream(io.BytesIO(data), encrypted, alpha, beta, 1000)
+        ciphertext = encrypted.getvalue()
+        record = 4 + 1000 + TAG_SIZE
+        header = len(ciphertext) - (len(data) // 1000 * record + 4 + len(data) % 1000 + TAG_SIZE)
+
+        flipped = bytearray(ciphertext)
+        flipped[header + 1500] ^= 1
+        truncated = ciphertext[:header + 2 * record]
+        reordered = ciphertext[:header] + ciphertext[header + record:header + 2 * record] \
+            + ciphertext[header:header + record] + ciphertext[header + 2 * record:]
+        for broken in (bytes(flipped), truncated, reordered, ciphertext[:-1], ciphertext + b"\x00"):
+            with self.assertRaises(ValueError):
+                ecies_decrypt(broken, curve, pk, 1000)
+        with self.assertRaises(ValueError):
+            ecies_decrypt(ciphertext, curve, pk + 1, 1000)
+        self.assertEqual(ecies_decrypt(ciphertext, curve, pk, 1000), data)
+
+        # records longer than the chunk size are rejected before they're read
+        forged = ciphertext[:header] + (FINAL_FLAG | 2 ** 30).to_bytes(4, "big")
+        with self.assertRaisesRegex(ValueError, "exceeds the chunk size"):
+            ecies_decrypt(forged, curve, pk, 1000)
+        with self.assertRaisesRegex(ValueError, "exceeds the chunk size"):
+            ecies_decrypt(ciphertext, curve, pk, 999)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra.elgamal import *
+from abstractAlgebra.curve_search import count_points
+from abstractAlgebra.number_theory import is_probable_prime
+
+
+class TestElGamal(unittest.TestCase):
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        p=st.sampled_from([1000003, 2 ** 61 - 1, 2 ** 127 - 1]),
+        message=st.integers(0, 2 ** 40),
+        encoding=st.sampled_from(ELGAMAL_ENCODINGS)
+    )
+    def test_round_trip(self, p, message, encoding):
+        alpha, beta, pk = elgamal_genkey(p)
+        message = alpha.field(message % (p // 256))
+        c1, c2 = elgamal_encrypt(message, alpha, beta, 256, encoding)
+        self.assertEqual(elgamal_decrypt(c1, c2, 256, pk, encoding), message)
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        parameter=st.sampled_from([16, 256, 1000]),
+        message=st.integers(0, 10 ** 6)
+    )
+    def test_embedding(self, parameter, message):
+        """Embedded messages must be extracted back from the points, including curves with a * b = 0"""
+        for curve in (EllipticCurve(2, 3, 2 ** 61 - 1), EllipticCurve(0, 7, 2 ** 61 - 1)):
+            point = embed_message(message, curve, parameter)
+            self.assertIn(point, curve)
+            self.assertEqual(extract_message(point, parameter), message)
+        self.assertIsNone(extract_message(curve.aneutral, parameter))
+
+    def test_default_encoding(self):
+        """Ciphertexts of the legacy encoding must still be decrypted by default"""
+        alpha, beta, pk = elgamal_genkey(1000003)
+        c1, c2 = elgamal_encrypt(alpha.field(1234), alpha, beta, 256)
+        self.assertEqual(elgamal_decrypt(c1, c2, 256, pk, "increment"), 1234)
+        c1, c2 = elgamal_encrypt(alpha.field(1234), alpha, beta, 256, "increment")
+        self.assertEqual(elgamal_decrypt(c1, c2, 256, pk), 1234)
+
+    def test_genkey_search(self):
+        alpha, beta, pk = elgamal_genkey(1000003, search=True)
+        curve = alpha.curve
+        order = count_points(curve)
+        self.assertTrue(is_probable_prime(order), "searched curves must have prime order")
+        self.assertTrue(0 < pk < order)
+        self.assertEqual(curve.multiply(alpha, pk), beta)
+
+    def test_unknown_encoding(self):
+        alpha, beta, pk = elgamal_genkey(1000003)
+        with self.assertRaises(AttributeError):
+            elgamal_encrypt(1, alpha, beta, 256, "base64")
+
+
+if __name__ == '__main__':
+    unittest.main()
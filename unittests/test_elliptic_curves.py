@@ -1,5 +1,6 @@
+import pickle
 import unittest
-from hypothesis import given, assume, example, strategies as st
+from hypothesis import given, assume, example, settings, strategies as st
 
 from abstractAlgebra.structures import Fp
 from abstractAlgebra.elliptic_curves import *
@@ -75,6 +76,119 @@ class TestElliptic(unittest.TestCase):
         correct_ans = sum([point for _ in range(curve.field(c).value)]) or curve.aneutral
         self.assertEqual(c*point, correct_ans, f"{c}*{point} must be equal {correct_ans} but it's not")
 
+    @given(p=prime_numbers)
+    def test_identity(self, p):
+        """The point at infinity must be a single object per curve, which is neutral for addition"""
+        curve = random_elliptic_curve(p)
+        point = curve.get_random_point()
+        identity = curve.aneutral
+        self.assertIs(identity, curve.aneutral)
+        self.assertIs(curve(0), identity)
+        self.assertIs(-identity, identity)
+        self.assertTrue(identity.is_identity)
+        self.assertFalse(point.is_identity)
+        self.assertFalse(identity)
+        self.assertEqual(point + identity, point)
+        self.assertEqual(identity + point, point)
+        self.assertTrue((point + (-point)).is_identity, f"{point} + {-point} must be the point at infinity")
+
+    @given(
+        p=prime_numbers,
+        k=st.integers(0, 10 ** 6)
+    )
+    def test_ladder_multiplication(self, p, k):
+        """Montgomery ladder must give the same result as double-and-add"""
+        curve = random_elliptic_curve(p)
+        point = curve.get_random_point()
+        expected = curve.elements_mul(point, k)
+        self.assertEqual(curve.elements_mul(point, k, method="ladder"), expected,
+                         f"ladder result for {k}*{point} differs from double-and-add {expected}")
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        p=st.sampled_from([1000003, 1000033, 998244353, 2 ** 61 - 1]),
+        c=st.integers(1, 1000),
+        k=st.integers(0, 2 ** 64)
+    )
+    def test_glv_multiplication(self, p, c, k):
+        """GLV multiplication on curves with j = 0 or j = 1728 must give the same result as double-and-add"""
+        curves = [EllipticCurve(0, c, p), EllipticCurve(c, 0, p)]
+        curves = [curve for curve in curves if curve.has_efficient_endomorphism]
+        assume(curves)
+        for curve in curves:
+            self.assertIsNotNone(curve.glv_parameters, f"GLV parameters of {curve} were not found")
+            point = curve.get_random_point()
+            self.assertEqual(curve.multiply(point, curve.order), curve.aneutral, f"wrong order of {curve}")
+            self.assertEqual(curve.multiply(point, k, method="glv"), curve.multiply(point, k, method="binary"))
+            self.assertEqual(curve.multiply(point, k), curve.multiply(point, k, method="glv"), "GLV must be chosen by default")
+
+    @given(p=st.sampled_from([7, 97, 1000003, 2 ** 61 - 1]))
+    def test_pickle(self, p):
+        curve = random_elliptic_curve(p)
+        point = curve.get_random_point()
+        for obj in (point, curve.aneutral, curve):
+            self.assertEqual(pickle.loads(pickle.dumps(obj)), obj)
+        copy = pickle.loads(pickle.dumps(point))
+        self.assertEqual(copy + copy, point + point)
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        p=st.sampled_from([101, 1000003, 998244353, 2 ** 127 - 1]),
+        a=st.integers(0, 3),
+        b=st.integers(1, 1000),
+        u=st.integers(0, 2 ** 128)
+    )
+    def test_map_to_curve(self, p, a, b, u):
+        """The map must land on the curve and u must be among the preimages of the point"""
+        assume((4 * a ** 3 + 27 * b ** 2) % p)
+        curve = EllipticCurve(a, b, p)
+        point = curve.map_to_curve(u)
+        self.assertIn(point, curve)
+        self.assertEqual(curve.map_to_curve_constants[0], "sswu" if a * b % p else "svdw")
+        self.assertIn(u % p, curve.map_to_curve_preimages(point))
+        self.assertEqual(curve.map_to_curve(u), point, "the map must be deterministic")
+
+    def test_map_to_curve_exhaustive(self):
+        """Preimages of every point of small curves must be exactly the elements mapped to it"""
+        for curve in (EllipticCurve(2, 3, 37), EllipticCurve(0, 5, 31), EllipticCurve(3, 0, 29)):
+            images = {}
+            for u in range(curve.p):
+                point = curve.map_to_curve(u)
+                images.setdefault((point.x.value, point.y.value), []).append(u)
+            for (x, y), preimages in images.items():
+                self.assertEqual(curve.map_to_curve_preimages(curve(x, y)), preimages, f"wrong preimages of ({x}, {y})")
+            self.assertEqual(curve.map_to_curve_preimages(curve.aneutral), [])
+
+    def test_embedding_exhaustive(self):
+        """Values embedded into every point of small curves must be found from the point and from each of them"""
+        for curve in (EllipticCurve(2, 3, 37), EllipticCurve(-3, 7, 1019), EllipticCurve(0, 7, 1009), EllipticCurve(5, 0, 1013)):
+            images = {}
+            for v in range(1, curve.p):
+                point = curve.embed_value(v)
+                self.assertIn(point, curve)
+                images.setdefault((point.x.value, point.y.value), []).append(v)
+            for (x, y), values in images.items():
+                self.assertLessEqual(len(values), 4)
+                self.assertEqual(curve.embedded_values(curve(x, y)), values, f"wrong values of ({x}, {y})")
+                for v in values:
+                    self.assertEqual(curve.embedding_class(v), values)
+            self.assertEqual(curve.embedded_values(curve.aneutral), [])
+            with self.assertRaises(AssertionError):
+                curve.embed_value(0)
+
+    def test_hash_to_curve(self):
+        curve = EllipticCurve(-3, 41058363725152142129326129780047268409114441015993725554835256314039467401291, 2 ** 256 - 2 ** 224 + 2 ** 192 + 2 ** 96 - 1)
+        points = [curve.hash_to_curve(data) for data in (b"", b"abc", b"abc" * 100)]
+        for point in points:
+            self.assertIn(point, curve)
+        self.assertEqual(len({point.x.value for point in points}), 3)
+        self.assertEqual(curve.hash_to_curve(b"abc"), points[1])
+        self.assertNotEqual(curve.hash_to_curve(b"abc", b"another domain"), points[1])
+
+    def test_order_unknown(self):
+        """Curves without efficient endomorphism have no known order"""
+        self.assertIsNone(EllipticCurve(1, 7, 1000033).order)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from hypothesis import given, settings, strategies as st
+
+import abstractAlgebra.homomorphic as homomorphic
+from abstractAlgebra.homomorphic import *
+
+
+class TestHomomorphic(unittest.TestCase):
+
+    @settings(max_examples=10, deadline=None)
+    @given(
+        votes=st.lists(st.integers(0, 5), max_size=60),
+        p=st.sampled_from([2 ** 61 - 1, 2 ** 89 - 1])
+    )
+    def test_tally(self, votes, p):
+        alpha, beta, pk = elgamal_genkey(p)
+        table = DiscreteLogTable(alpha, 3 * 5 * 60)  # big enough for 3 * total
+        ciphertexts = [exp_elgamal_encrypt(vote, alpha, beta) for vote in votes]
+
+        total = aggregate(ciphertexts)
+        if not votes:
+            self.assertIsNone(total)
+            return
+        self.assertEqual(total, sum(ciphertexts))
+        self.assertEqual(exp_elgamal_decrypt(total, pk, table), sum(votes))
+        self.assertEqual(exp_elgamal_decrypt(3 * total - ciphertexts[0], pk, table), 3 * sum(votes) - votes[0])
+
+    def test_aggregate_chunks(self):
+        alpha, beta, pk = elgamal_genkey(2 ** 61 - 1)
+        ciphertexts = [exp_elgamal_encrypt(i % 3, alpha, beta) for i in range(100)]
+        chunk_size = homomorphic.AGGREGATE_CHUNK_SIZE
+        homomorphic.AGGREGATE_CHUNK_SIZE = 7
+        try:
+            total = aggregate(iter(ciphertexts))
+        finally:
+            homomorphic.AGGREGATE_CHUNK_SIZE = chunk_size
+        self.assertEqual(total, aggregate(ciphertexts))
+        self.assertEqual(exp_elgamal_decrypt(total, pk, DiscreteLogTable(alpha, 1000)), 99)
+
+    def test_discrete_log_table(self):
+        alpha, beta, pk = elgamal_genkey(2 ** 61 - 1)
+        curve = alpha.curve
+        for size in (None, 1, 3, 50):
+            table = DiscreteLogTable(alpha, 500, size)
+            for m in (0, 1, 2, 3, 7, 8, 250, 499, 500):
+                self.assertEqual(table.log(curve.multiply(alpha, m)), m)
+            self.assertIsNone(table.log(curve.multiply(alpha, 501)))
+            self.assertIsNone(table.log(curve.multiply(alpha, -1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
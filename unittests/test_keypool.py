@@ -0,0 +1,61 @@
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from abstractAlgebra.keypool import *
+
+
+def wait_for(condition, timeout: float = 30) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestKeyPool(unittest.TestCase):
+
+    def test_refill(self):
+        with KeyPool(1000003, high_water=20, low_water=5, chunk_size=3) as pool:
+            self.assertTrue(wait_for(lambda: len(pool) == 20), "pool must be filled up to the high water mark")
+            keys = [pool.get() for _ in range(16)]
+            for alpha, beta, pk in keys:
+                self.assertEqual(alpha * pk, beta)
+            self.assertEqual(len({pk for _, _, pk in keys}), 16, "keys must not be handed out twice")
+            self.assertTrue(wait_for(lambda: len(pool) == 20), "pool must be refilled below the low water mark")
+            stats = pool.stats()
+            self.assertEqual(stats["hits"], 16)
+            self.assertEqual(stats["hit_rate"], 1.0)
+            self.assertGreater(stats["refills"], 7, "7 chunks fill the pool at first, then it must be refilled")
+            self.assertGreater(stats["max_refill_seconds"], 0)
+
+    def test_misses(self):
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(time.sleep, 0.5)  # workers are busy, so the burst can't be served from the pool
+            pool = KeyPool(1000003, high_water=4, low_water=2, executor=executor)
+            keys = [pool.get() for _ in range(10)]
+            self.assertEqual(len(keys), 10)
+            self.assertEqual(pool.stats()["misses"], 10)
+            self.assertEqual(pool.stats()["hit_rate"], 0.0)
+            pool.close()
+
+    def test_failures(self):
+        """Errors of the background tasks must be reported by get instead of being swallowed"""
+        with KeyPool(1, high_water=4, low_water=2) as pool:  # Fp(1) can't be built, so every chunk fails
+            self.assertEqual(pool.stats()["hit_rate"], 0.0)
+            self.assertTrue(wait_for(lambda: pool.stats()["failures"] > 0))
+            with self.assertRaises(RuntimeError) as context:
+                pool.get()
+            self.assertIsInstance(context.exception.__cause__, AssertionError)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            with KeyPool(2 ** 61 - 1, high_water=8, low_water=2, executor=executor, chunk_size=2) as pool:
+                self.assertTrue(wait_for(lambda: len(pool) == 8))
+                alpha, beta, pk = pool.get()
+                self.assertEqual(alpha.curve.multiply(alpha, pk), beta)
+
+
+if __name__ == '__main__':
+    unittest.main()
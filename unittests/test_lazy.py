@@ -0,0 +1,64 @@
+import unittest
+from hypothesis import given, strategies as st
+
+from abstractAlgebra.lazy import *
+
+
+class TestLazy(unittest.TestCase):
+
+    @given(
+        p=st.sampled_from([7, 97, 1000003, 2 ** 127 - 1]),
+        values=st.lists(st.integers(), min_size=4, max_size=4)
+    )
+    def test_matches_eager(self, p, values):
+        field = Fp(p)
+        lazy = LazyField(field)
+        x, y, z, w = (field(value) for value in values)
+        lx, ly, lz, lw = (lazy(value) for value in values)
+
+        self.assertEqual((lx * ly + lz - lw * 3).evaluate(), x * y + z - w * 3)
+        self.assertEqual((-lx + 5 - ly ** 3).evaluate(), -x + 5 - y ** 3)
+        if z and w:
+            self.assertEqual((lx / lz + ly / lw).evaluate(), x / z + y / w)
+            self.assertEqual((1 / lz - lx / (lz * lw)).evaluate(), z.inverse - x / (z * w))
+            self.assertEqual((lw ** -2).evaluate(), (w * w).inverse)
+
+    @given(
+        p=st.sampled_from([97, 1000003]),
+        values=st.lists(st.integers(1, 95), min_size=1, max_size=30)
+    )
+    def test_shared_inversion(self, p, values):
+        field = Fp(p)
+        lazy = LazyField(field)
+        expressions = [lazy(value) / (lazy(value) + 1) for value in values]
+        expected = [field(value) / field(value + 1) for value in values]
+        self.assertEqual(lazy.evaluate(*expressions), expected)
+
+    def test_common_subexpressions(self):
+        lazy = LazyField(Fp(1000003))
+        x, y = lazy(12345), lazy(678)
+        self.assertIs(x * y + 1, 1 + y * x)
+        self.assertIs(lazy(5) * lazy(7), lazy(35))  # constants are folded
+
+        expression = x
+        for _ in range(5000):  # deep graphs must not hit the recursion limit
+            expression = expression * expression + y
+        self.assertEqual(expression.evaluate(), expression.evaluate())
+
+    def test_division_by_zero(self):
+        lazy = LazyField(Fp(97))
+        with self.assertRaises(ZeroDivisionError):
+            (lazy(3) / (lazy(5) - 5)).evaluate()
+
+        # undefined divisors and bases must not be turned into zeros
+        x, zero = lazy(7), lazy(5) - 5
+        for expression in (lazy(1) / (lazy(1) / zero), x / (x / zero), (x / zero) ** 0, (x / zero) ** -1,
+                           x * (x / zero), zero ** -2):
+            with self.assertRaises(ZeroDivisionError):
+                expression.evaluate()
+        with self.assertRaises(AttributeError):
+            lazy(1) + LazyField(Fp(7))(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
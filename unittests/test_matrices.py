@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+from hypothesis import given, assume, settings, strategies as st
+
+from abstractAlgebra.matrices import *
+from abstractAlgebra.matrices import _strassen, _matmul
+
+small_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 97, 101, 997, 65537, 2 ** 31 - 1]
+prime_numbers = st.sampled_from(small_primes + [2 ** 61 - 1, 2 ** 127 - 1])
+
+
+def square_matrices(p, n):
+    return st.lists(st.lists(st.integers(0, p - 1), min_size=n, max_size=n), min_size=n, max_size=n)
+
+
+class TestMatrixFp(unittest.TestCase):
+
+    @given(p=prime_numbers, n=st.integers(1, 6), data=st.data())
+    def test_inverse(self, p, n, data):
+        """A @ A.inverse must be an identity matrix, singular matrices have no inverse"""
+        matrix = MatrixFp(p, data.draw(square_matrices(p, n)))
+        inverse = matrix.inverse
+        if matrix.det == 0:
+            self.assertIsNone(inverse, f"singular {matrix} has an inverse {inverse}")
+        else:
+            self.assertEqual(matrix @ inverse, MatrixFp.identity(p, n))
+            self.assertEqual(inverse @ matrix, MatrixFp.identity(p, n))
+
+    @given(p=prime_numbers, data=st.data())
+    def test_determinant(self, p, data):
+        """Determinant of a 3x3 matrix must be equal to the one computed by the rule of Sarrus"""
+        rows = data.draw(square_matrices(p, 3))
+        (a, b, c), (d, e, f), (g, h, i) = rows
+        expected = (a * e * i + b * f * g + c * d * h - c * e * g - b * d * i - a * f * h) % p
+        self.assertEqual(MatrixFp(p, rows).det, expected)
+
+    @given(p=prime_numbers, rows=st.integers(1, 7), cols=st.integers(1, 7))
+    def test_nullspace(self, p, rows, cols):
+        """A @ A.nullspace() must be zero and rank + nullity must be equal to the number of columns"""
+        matrix = MatrixFp.random(p, rows, cols)
+        if rows > 1:
+            matrix.array[-1] = matrix.array[0] * 2 % p  # making the matrix rank deficient
+        nullspace = matrix.nullspace()
+        self.assertEqual(matrix @ nullspace, MatrixFp.zeros(p, rows, nullspace.shape[1]))
+        self.assertEqual(matrix.rank() + nullspace.shape[1], cols)
+        self.assertEqual(nullspace.rank(), nullspace.shape[1], "nullspace basis must be linearly independent")
+
+    @given(p=prime_numbers, rows=st.integers(1, 7), cols=st.integers(1, 7))
+    def test_solve(self, p, rows, cols):
+        """Solution of a consistent system must satisfy it"""
+        matrix = MatrixFp.random(p, rows, cols)
+        b = matrix @ MatrixFp.random(p, cols, 2)
+        x = matrix.solve(b)
+        self.assertIsNotNone(x, f"{matrix} @ x == {b} has a solution, but it was not found")
+        self.assertEqual(matrix @ x, b)
+
+    def test_inconsistent_system(self):
+        matrix = MatrixFp(7, [[1, 2], [2, 4]])
+        self.assertIsNone(matrix.solve([1, 1]))
+        self.assertEqual(matrix.solve([1, 2]), MatrixFp(7, [[1], [0]]))
+
+    @settings(max_examples=20, deadline=None)
+    @given(p=prime_numbers, m=st.integers(1, 40), k=st.integers(1, 40), n=st.integers(1, 40))
+    def test_strassen(self, p, m, k, n):
+        """Strassen's product must be equal to the naive product of python integers"""
+        a, b = MatrixFp.random(p, m, k), MatrixFp.random(p, k, n)
+        expected = np.array(a.array.astype(object).dot(b.array.astype(object)) % p, dtype=a.dtype)
+        self.assertTrue(np.all(_strassen(a.array, b.array, p, 4) == expected))
+        self.assertTrue(np.all(_matmul(a.array, b.array, p) == expected))
+
+    def test_large_system(self):
+        """Blocked elimination must work across several panels"""
+        p = 2 ** 31 - 1
+        n = 2 * BLOCK_SIZE + 17
+        matrix = MatrixFp.random(p, n, n)
+        x = MatrixFp.random(p, n, 1)
+        self.assertEqual(matrix.solve(matrix @ x), x)
+
+    @settings(max_examples=10, deadline=None)
+    @given(p=prime_numbers, rank=st.integers(0, 40))
+    def test_recursive_panels(self, p, rank):
+        """Rank deficient panels wider than PANEL_BASE_SIZE must be factorized correctly"""
+        matrix = MatrixFp.random(p, 60, rank) @ MatrixFp.random(p, rank, 70) if rank else MatrixFp.zeros(p, 60, 70)
+        nullspace = matrix.nullspace()
+        self.assertEqual(matrix @ nullspace, MatrixFp.zeros(p, 60, nullspace.shape[1]))
+        self.assertEqual(matrix.rank() + nullspace.shape[1], 70)
+        self.assertLessEqual(matrix.rank(), rank)
+
+        a, b = MatrixFp.random(p, 40, 40), MatrixFp.random(p, 40, 40)
+        self.assertEqual((a @ b).det, a.det * b.det)
+
+
+if __name__ == '__main__':
+    unittest.main()
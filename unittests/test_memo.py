@@ -0,0 +1,95 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra import memo
+from abstractAlgebra.structures import Fp
+from abstractAlgebra.elliptic_curves import *
+
+
+class TestMemo(unittest.TestCase):
+
+    @settings(max_examples=20, deadline=None)
+    @given(p=st.sampled_from([97, 1000003, 2 ** 127 - 1]), values=st.lists(st.integers(0, 2 ** 130), max_size=30))
+    def test_field_operations(self, p, values):
+        """Memoized results must match the computed ones, repeated operands must hit the memo"""
+        field, plain = Fp(p), Fp(p)
+        memo.enable(field)
+        for _ in range(2):
+            for value in values:
+                self.assertEqual(field.sqrt(field(value)), plain.sqrt(plain(value)))
+                self.assertEqual(field(value).minverse, plain(value).minverse)
+        stats = field.memo.stats()
+        nonzero = len({value % p for value in values if value % p})
+        self.assertEqual(stats["misses"], len({value % p for value in values}) + nonzero)
+        self.assertEqual(stats["hits"] + stats["misses"], 2 * len(values) + 2 * len([v for v in values if v % p]))
+        self.assertEqual(stats["entries"], stats["misses"])
+
+    def test_scalar_multiplication(self):
+        curve = EllipticCurve(2, 3, 2 ** 127 - 1)
+        cache = memo.enable(curve)
+        point, k = curve.get_random_point(), 2 ** 100 + 12345
+        first = point * k
+        self.assertIs(point * k, first)
+        self.assertIs(curve(point.x.value, point.y.value) * k, first)  # keyed by values, not objects
+        self.assertEqual(first, EllipticCurve(2, 3, 2 ** 127 - 1).multiply(point, k))
+        self.assertEqual(curve.aneutral * k, curve.aneutral)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        self.assertIs(curve.multiply(point, k), first)  # direct calls of the algorithms share the memo
+        self.assertIs(curve.multiply(point, k, "ladder"), first)
+        with self.assertRaises(AttributeError):
+            curve.multiply(point, k, "window")
+        self.assertEqual(cache.stats()["hits"], 4)
+        self.assertEqual(cache.invalidate("sqrt"), 0)
+        self.assertEqual(cache.invalidate("mul"), 1)
+        self.assertEqual(cache.stats()["bytes"], 0)
+        self.assertIsNot(point * k, first)
+        with self.assertRaises(AttributeError):
+            cache.invalidate("add")
+        memo.disable(curve)
+        self.assertIsNone(curve.memo)
+
+    def test_division(self):
+        """Division of elements must use the memoized inverses"""
+        field = Fp(2 ** 127 - 1)
+        cache = memo.enable(field)
+        x, y = field(12345), field(678)
+        self.assertEqual(x / y * y, x)
+        self.assertEqual(field(1) / y, y.minverse)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_byte_budget(self):
+        """The memo must stay within its budget evicting the least recently used results"""
+        field = Fp(2 ** 127 - 1)
+        cache = memo.enable(field, max_bytes=4096)
+        for value in range(1, 1000):
+            field(value).minverse
+            self.assertLessEqual(cache.stats()["bytes"], 4096)
+        stats = cache.stats()
+        self.assertGreater(stats["evictions"], 900)
+        self.assertEqual(stats["entries"] + stats["evictions"], 999)
+        field(999).minverse  # the most recent entry survives
+        self.assertEqual(cache.stats()["hits"], 1)
+        field(1).minverse
+        self.assertEqual(cache.stats()["misses"], 1000)
+
+        memo.enable(field, max_bytes=1)  # results bigger than the budget aren't stored
+        field(5).minverse
+        self.assertEqual(len(field.memo), 0)
+
+    def test_threads(self):
+        field = Fp(1000003)
+        cache = memo.enable(field, max_bytes=1 << 14)
+        with ThreadPoolExecutor(8) as executor:
+            roots = list(executor.map(lambda a: field((a % 50) ** 2).sqrt ** 2, range(1, 4000)))
+        self.assertEqual(roots, [field((a % 50) ** 2) for a in range(1, 4000)])
+        stats = cache.stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 3999)
+        self.assertLessEqual(stats["bytes"], 1 << 14)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra.parallel import *
+
+
+class TestParallel(unittest.TestCase):
+
+    @settings(max_examples=10, deadline=None)
+    @given(
+        p=st.sampled_from([97, 1000003, 2 ** 61 - 1]),
+        scalars=st.lists(st.integers(0, 2 ** 64), max_size=200)
+    )
+    def test_batch_multiply(self, p, scalars):
+        """Batch results must match sequential ones and keep the order"""
+        curve = random_elliptic_curve(p)
+        points = [curve.get_random_point() for _ in scalars]
+        expected = [curve.multiply(point, k) for point, k in zip(points, scalars)]
+        self.assertEqual(batch_multiply(points, scalars, max_workers=4, chunk_size=7), expected)
+        self.assertEqual(batch_multiply(points, scalars, "ladder", max_workers=2), expected)
+
+    def test_batch_elgamal(self):
+        alpha, beta, pk = elgamal_genkey(1000003)
+        messages = list(range(300))
+        with ThreadPoolExecutor(4) as executor:
+            ciphertexts = batch_elgamal_encrypt(messages, alpha, beta, 100, executor=executor)
+            decrypted = batch_elgamal_decrypt(ciphertexts, 100, pk, executor=executor, chunk_size=16)
+        self.assertEqual(decrypted, messages)
+
+    def test_shared_lazy_constants(self):
+        """Threads racing for lazily computed constants must all see the same values"""
+        field = Fp(998244353)
+        with ThreadPoolExecutor(8) as executor:
+            roots = list(executor.map(lambda a: field(a * a).sqrt ** 2, range(1, 200)))
+        self.assertEqual(roots, [a * a for a in range(1, 200)])
+        self.assertEqual(len({field.sqrt_constants}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
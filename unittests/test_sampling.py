@@ -0,0 +1,48 @@
+import unittest
+from hypothesis import given, strategies as st
+
+from abstractAlgebra.sampling import *
+from abstractAlgebra.elliptic_curves import *
+
+
+class TestRandomSampler(unittest.TestCase):
+
+    @given(seed=st.integers(), upper=st.integers(1, 2 ** 130), count=st.integers(0, 50))
+    def test_integers(self, seed, upper, count):
+        """Samples must lie in the range and be reproducible for equal seeds"""
+        values = RandomSampler(seed).integers(upper, count)
+        self.assertEqual(len(values), count)
+        self.assertTrue(all(0 <= value < upper for value in values))
+        self.assertEqual(values, RandomSampler(seed).integers(upper, count))
+
+    def test_uniformity(self):
+        """Every residue must be hit roughly equally often (no modulo bias towards small values)"""
+        counts = [0] * 5
+        for value in RandomSampler(0).integers(5, 50000):
+            counts[value] += 1
+        self.assertTrue(all(9000 < c < 11000 for c in counts), f"distribution {counts} is not uniform")
+
+    def test_secure(self):
+        sampler = RandomSampler(secure=True)
+        scalars = sampler.scalars(1000003, 100)
+        self.assertTrue(all(1 <= k < 1000003 for k in scalars))
+        self.assertRaises(AssertionError, RandomSampler, 1, True)
+
+    @given(p=st.sampled_from([5, 7, 11, 97, 997, 1000003, 2 ** 61 - 1]), seed=st.integers())
+    def test_points(self, p, seed):
+        curve = random_elliptic_curve(p)
+        sampler = RandomSampler(seed)
+        points = sampler.points(curve, 20)
+        self.assertEqual(len(points), 20)
+        for point in points:
+            self.assertTrue(curve.polynom(point.x) == point.y ** 2, f"{point} does not belong to {curve}")
+        self.assertEqual(points, RandomSampler(seed).points(curve, 20))
+
+        # bulk operations of other backends must give the same points
+        numpy_curve = EllipticCurve(curve.a.value, curve.b.value, p, backend="numpy")
+        self.assertEqual([point.xy for point in RandomSampler(seed).points(numpy_curve, 20)],
+                         [point.xy for point in points])
+
+
+if __name__ == '__main__':
+    unittest.main()
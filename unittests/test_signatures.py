@@ -0,0 +1,88 @@
+import unittest
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra.signatures import *
+from abstractAlgebra.signatures import _nonce
+
+# secp256k1, a curve of prime order
+SECP256K1 = EllipticCurve(0, 7, 2 ** 256 - 2 ** 32 - 977)
+G = SECP256K1(0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+              0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# P-521, its group order is wider than the digest
+P521 = EllipticCurve(-3, 0x0051953EB9618E1C9A1F929A21A0B68540EEA2DA725B99B315F3B8B489918EF109E156193951EC7E937B1652C0BD3BB1BF073573DF883D2C34F1EF451FD46B503F00,
+                     2 ** 521 - 1)
+G521 = P521(0x00C6858E06B70404E9CD9E3ECB662395B4429C648139053FB521F828AF606B4D3DBAA14B5E77EFE75928FE1DC127A2FFA8DE3348B3C1856A429BF97E7E31C2E5BD66,
+            0x011839296A789A3BC0045C8A5FB42C7D1BD998F54449579B446817AFBD17273E662C97EE72995EF42640C550B9013FAD0761353C7086A272C24088BE94769FD16650)
+N521 = 0x1FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFA51868783BF2F966B7FCC0148F709A5D03BB5C9B8899C47AEBB6FB71E91386409
+
+
+class TestSignatures(unittest.TestCase):
+
+    @settings(max_examples=10, deadline=None)
+    @given(message=st.binary(max_size=100), other=st.binary(max_size=100))
+    def test_ecdsa(self, message, other):
+        private_key, public_key = signature_genkey(G, N)
+        signature = ecdsa_sign(message, G, N, private_key)
+        self.assertTrue(ecdsa_verify(message, signature, G, N, public_key))
+        self.assertEqual(ecdsa_verify(other, signature, G, N, public_key), message == other)
+        self.assertFalse(ecdsa_verify(message, (signature[0], N - signature[1] + 1), G, N, public_key))
+
+    @settings(max_examples=10, deadline=None)
+    @given(message=st.binary(max_size=100), other=st.binary(max_size=100))
+    def test_schnorr(self, message, other):
+        private_key, public_key = signature_genkey(G, N)
+        signature = schnorr_sign(message, G, N, private_key)
+        self.assertTrue(schnorr_verify(message, signature, G, N, public_key))
+        self.assertEqual(schnorr_verify(other, signature, G, N, public_key), message == other)
+        self.assertFalse(schnorr_verify(message, signature, G, N, public_key + G))
+
+    def test_nonce(self):
+        """Nonces must follow RFC 6979 and cover the whole bit length of the group order"""
+        p256_order = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+        self.assertEqual(_nonce(0xC9AFA9D845BA75166B5C215767B1D6934E50C3DB36E89B127B8A622B120F6721, b"sample", p256_order),
+                         0xA6E3C57DD01ABE90086538398355DD4C3B17AA873382B0F24D6129493D8AAD60)  # RFC 6979 A.2.5
+
+        nonces = [_nonce(12345, bytes([i]), N521) for i in range(64)]
+        self.assertTrue(all(0 < k < N521 for k in nonces))
+        self.assertGreater(max(k.bit_length() for k in nonces), 512)
+
+    def test_wide_order(self):
+        private_key, public_key = signature_genkey(G521, N521)
+        signature = ecdsa_sign(b"message", G521, N521, private_key)
+        self.assertTrue(ecdsa_verify(b"message", signature, G521, N521, public_key))
+        self.assertFalse(ecdsa_verify(b"other", signature, G521, N521, public_key))
+        signature = schnorr_sign(b"message", G521, N521, private_key)
+        self.assertTrue(schnorr_verify(b"message", signature, G521, N521, public_key))
+        self.assertFalse(schnorr_verify(b"other", signature, G521, N521, public_key))
+
+    def test_multi_multiply(self):
+        points = [SECP256K1.multiply(G, k) for k in range(1, 40)]
+        scalars = [(-1) ** k * k ** 40 for k in range(1, 40)]
+        expected = SECP256K1.aneutral
+        for point, k in zip(points, scalars):
+            expected += SECP256K1.multiply(point, k)
+        self.assertEqual(SECP256K1.multi_multiply(points, scalars), expected)
+        self.assertEqual(SECP256K1.multi_multiply([G, G, -G], [2, 3, 5]), SECP256K1.aneutral)
+        self.assertEqual(SECP256K1.multi_multiply([], []), SECP256K1.aneutral)
+
+    def test_schnorr_batch(self):
+        items = []
+        for i in range(20):
+            private_key, public_key = signature_genkey(G, N)
+            message = f"log record {i}".encode()
+            items.append((message, schnorr_sign(message, G, N, private_key), public_key))
+        self.assertTrue(schnorr_batch_verify(items, G, N))
+        self.assertTrue(schnorr_batch_verify([], G, N))
+
+        # a single broken signature spoils the whole batch
+        message, (r, s), public_key = items[7]
+        broken = items[:7] + [(message, (r, (s + 1) % N), public_key)] + items[8:]
+        self.assertFalse(schnorr_batch_verify(broken, G, N))
+        swapped = items[:1] + [(items[2][0], items[1][1], items[1][2]), (items[1][0], items[2][1], items[2][2])] + items[3:]
+        self.assertFalse(schnorr_batch_verify(swapped, G, N))
+
+
+if __name__ == '__main__':
+    unittest.main()
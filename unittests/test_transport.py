@@ -0,0 +1,74 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from hypothesis import given, settings, strategies as st
+
+from abstractAlgebra.transport import *
+
+
+def _multiply_slice(batch: SharedElements, start: int, stop: int, k: int) -> list[tuple[int, int] | None]:
+    return [None if point.is_identity else point.xy for point in (point * k for point in batch[start:stop])]
+
+
+class TestTransport(unittest.TestCase):
+
+    def test_interned_pickling(self):
+        """Elements are pickled as integers and a reference to the structure shared by all unpickled elements"""
+        curve = EllipticCurve(2, 3, 2 ** 127 - 1)
+        point = curve.get_random_point()
+        self.assertLess(len(pickle.dumps(point)), 256)
+        points = [curve.get_random_point() for _ in range(100)]
+        self.assertLess(len(pickle.dumps(points)), len(pickle.dumps(point)) + 100 * 48)  # two 16 byte coordinates
+
+        first, second = pickle.loads(pickle.dumps(point)), pickle.loads(pickle.dumps((point, curve.aneutral)))
+        self.assertEqual(first, point)
+        self.assertIs(first.curve, second[0].curve)
+        self.assertIs(first.field, second[0].field)
+        self.assertIs(second[1], first.curve.aneutral)
+        self.assertIs(pickle.loads(pickle.dumps(curve.field(5))).field, first.field)
+
+    @settings(max_examples=20, deadline=None)
+    @given(p=st.sampled_from([2, 97, 65537, 2 ** 127 - 1]), values=st.lists(st.integers(0, 2 ** 130), max_size=50))
+    def test_shared_field_elements(self, p, values):
+        field = Fp(p)
+        elements = [field(value) for value in values]
+        batch = SharedElements(field, len(elements))
+        with batch:
+            for index, element in enumerate(elements):
+                batch[index] = element
+            self.assertEqual(list(batch), elements)
+            self.assertEqual(batch[1:-1:2], elements[1:-1:2])
+            self.assertEqual([batch.value(i) for i in range(len(batch))], [element.value for element in elements])
+            copy = pickle.loads(pickle.dumps(batch))
+            self.assertEqual(list(copy), elements)
+            copy.close()
+
+    @settings(max_examples=10, deadline=None)
+    @given(p=st.sampled_from([97, 1000003, 2 ** 61 - 1]), length=st.integers(1, 40))
+    def test_shared_points(self, p, length):
+        curve = random_elliptic_curve(p)
+        points = [curve.get_random_point() for _ in range(length)] + [curve.aneutral]
+        with SharedElements.from_elements(points) as batch:
+            self.assertEqual(len(batch), length + 1)
+            self.assertEqual(list(batch), points)
+            self.assertIsNone(batch.value(-1))
+            self.assertIs(batch[-1], curve.aneutral)
+            with self.assertRaises(IndexError):
+                batch[length + 1]
+            with self.assertRaises(AssertionError):
+                batch[0] = Fp(p)(1)
+
+    def test_workers(self):
+        """Workers attach to the memory block and get the same results as the parent"""
+        curve = EllipticCurve(2, 3, 1000003)
+        points = [curve.get_random_point() for _ in range(200)] + [curve.aneutral]
+        expected = [None if point.is_identity else point.xy for point in (point * 12345 for point in points)]
+        starts = range(0, len(points), 50)
+        with SharedElements.from_elements(points) as batch, ProcessPoolExecutor(2) as executor:
+            chunks = executor.map(_multiply_slice, repeat(batch), starts, [start + 50 for start in starts], repeat(12345))
+            self.assertEqual([xy for chunk in chunks for xy in chunk], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()